@@ -0,0 +1,143 @@
+"""Benchmark the streaming Atom parser against the previous ET.fromstring parser.
+
+Writes an arXiv-style Atom fixture of the requested size (50 MB by default)
+and parses it with each parser in a fresh subprocess, so the reported peak
+RSS belongs to that parser alone:
+  - legacy: read the whole body into a string, ET.fromstring, find/findall
+    with namespaced strings per entry (the old ArxivFetcher._parse_response);
+  - streaming: feed 64 KB chunks to iter_atom_entries.
+
+Usage:
+    python benchmarks/bench_atom_parsing.py [size_mb]
+"""
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+import xml.etree.ElementTree as ET
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.atom_parser import iter_atom_entries
+
+CHUNK_SIZE = 64 * 1024
+
+ENTRY = """<entry>
+    <id>http://arxiv.org/abs/2401.{i:05d}v1</id>
+    <updated>2024-01-02T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>A Study of Scalable Methods for Problem {i}</title>
+    <summary>{summary}</summary>
+    <author><name>Author One</name></author>
+    <author><name>Author Two</name></author>
+    <author><name>Author Three</name></author>
+    <link href="http://arxiv.org/abs/2401.{i:05d}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{i:05d}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.AI" scheme="http://arxiv.org/schemas/atom"/>
+</entry>
+"""
+SUMMARY = "We propose a method for learning representations that scale with data and compute. " * 12
+
+
+def write_fixture(path, size_mb):
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">\n')
+        i = 0
+        while written < target:
+            entry = ENTRY.format(i=i, summary=SUMMARY)
+            f.write(entry)
+            written += len(entry)
+            i += 1
+        f.write('</feed>\n')
+    return i
+
+
+def legacy_parse(response):
+    root = ET.fromstring(response)
+    papers = []
+    for entry in root.findall("{http://www.w3.org/2005/Atom}entry"):
+        title = entry.find("{http://www.w3.org/2005/Atom}title").text
+        summary = entry.find("{http://www.w3.org/2005/Atom}summary").text
+        paper_id = None
+        url = None
+        id_element = entry.find("{http://www.w3.org/2005/Atom}id")
+        if id_element is not None and id_element.text:
+            id_text = id_element.text
+            if "arxiv.org/abs/" in id_text:
+                paper_id = id_text.split("arxiv.org/abs/")[-1]
+                url = f"https://arxiv.org/abs/{paper_id}"
+        for link in entry.findall("{http://www.w3.org/2005/Atom}link"):
+            if link.get("rel") == "alternate" or link.get("title") == "pdf":
+                url = link.get("href")
+                break
+        published = entry.find("{http://www.w3.org/2005/Atom}published")
+        papers.append({
+            "title": title,
+            "summary": summary,
+            "id": paper_id,
+            "url": url,
+            "published": published.text if published is not None else None
+        })
+    return papers
+
+
+def iter_chunks(path):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def run_parser(name, path):
+    """Parse the fixture in this process and print entries, seconds and peak RSS as JSON."""
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if name == 'legacy':
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = len(legacy_parse(f.read()))
+    else:
+        # Consumed one entry at a time, as the fetcher's paging loop does
+        entries = sum(1 for _ in iter_atom_entries(iter_chunks(path)))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'entries': entries, 'seconds': elapsed, 'peak_rss_kb': peak_kb,
+                      'baseline_rss_kb': baseline_kb}))
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.xml")
+        count = write_fixture(path, size_mb)
+        actual_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Fixture: {count} entries, {actual_mb:.1f} MB")
+
+        for name in ('legacy', 'streaming'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--run', name, path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output)
+            growth_mb = (result['peak_rss_kb'] - result['baseline_rss_kb']) / 1024
+            print(f"{name:>9}: {result['seconds']:.2f}s ({actual_mb / result['seconds']:.1f} MB/s), "
+                  f"{result['entries']} entries, peak RSS {result['peak_rss_kb'] / 1024:.0f} MB "
+                  f"(+{growth_mb:.0f} MB while parsing)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        run_parser(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,76 @@
+"""Wall-clock benchmark for GitHubFetcher.fetch_trending_repos.
+
+Uses a fake GitHub client with fixed per-call latency, so no network or
+token is needed. The fixed 2s per-repo sleep of the sequential path is
+disabled; it would add another 2s per repo on top of the numbers below.
+
+Usage:
+    python benchmarks/bench_github_fetch.py
+"""
+import os
+import sys
+import time
+from time import sleep as simulate_latency
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.nodes.fetchers import GitHubFetcher
+from src.utils.rate_limiter import GitHubRateLimiter
+
+SEARCH_LATENCY = 0.05
+TOPICS_LATENCY = 0.02
+KEYWORD_COUNTS = [1, 2, 4, 8, 16, 32]
+
+
+class FakeRepo:
+    def __init__(self, index):
+        self.name = f"repo-{index}"
+        self.full_name = f"bench/repo-{index}"
+        self.description = "Benchmark repository"
+        self.stargazers_count = 1000 - index
+        self.created_at = None
+        self.updated_at = None
+        self.html_url = f"https://github.com/bench/repo-{index}"
+        self.language = "Python"
+
+    def get_topics(self):
+        simulate_latency(TOPICS_LATENCY)
+        return ["ai"]
+
+
+class FakeGithubClient:
+    def get_rate_limit(self):
+        quota = SimpleNamespace(remaining=5000, reset=None)
+        return SimpleNamespace(core=quota, search=SimpleNamespace(remaining=30, reset=None))
+
+    def search_repositories(self, query, sort, order):
+        simulate_latency(SEARCH_LATENCY)
+        # Overlapping windows so dedup has work to do
+        offset = int(query.split()[0].rsplit('-', 1)[-1]) * 7 % 50
+        return [FakeRepo(offset + i) for i in range(10)]
+
+
+def run(keyword_count, concurrent):
+    keywords = [f"keyword-{i}" for i in range(keyword_count)]
+    limiter = GitHubRateLimiter(search_per_minute=6000, core_per_hour=1_000_000)
+    fetcher = GitHubFetcher(FakeGithubClient(), rate_limiter=limiter, max_workers=8)
+    start = time.perf_counter()
+    with patch('src.nodes.fetchers.time.sleep'):
+        repos = fetcher.fetch_trending_repos(keywords, concurrent=concurrent)
+    return time.perf_counter() - start, len(repos)
+
+
+def main():
+    print(f"{'keywords':>8} {'repos':>6} {'sequential_s':>13} {'concurrent_s':>13} {'speedup':>8}")
+    for count in KEYWORD_COUNTS:
+        sequential, repos = run(count, concurrent=False)
+        concurrent, _ = run(count, concurrent=True)
+        print(f"{count:>8} {repos:>6} {sequential:>13.3f} {concurrent:>13.3f} {sequential / concurrent:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
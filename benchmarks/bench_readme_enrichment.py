@@ -0,0 +1,112 @@
+"""Benchmark README cleaning and the blob-SHA cache of ReadmeEnricher.
+
+Builds a corpus of large synthetic READMEs (badges, HTML, code fences,
+tables, links) and compares:
+  - the single-pass cleaner (markdown_to_text) against a chain of
+    per-construct regex substitutions;
+  - a cold enrichment pass against a warm pass served by the SHA cache.
+
+Usage:
+    python benchmarks/bench_readme_enrichment.py [num_readmes] [sections_per_readme]
+"""
+import os
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.nodes.readme_enricher import ReadmeEnricher, markdown_to_text
+
+SECTION = """
+## Section {i}
+
+<p align="center"><img src="https://img.shields.io/badge/build-passing-green.svg" /></p>
+
+This **library** provides _fast_ inference for [large models](https://example.com/docs/{i}).
+See `config.yaml` and the ![diagram](docs/arch-{i}.png) for details &amp; caveats.
+
+```python
+from library import Model
+model = Model.from_pretrained("org/model-{i}")
+print(model.generate("hello"))
+```
+
+| Model | Params | Score |
+|-------|--------|-------|
+| small | 1B     | 71.2  |
+| large | 70B    | 84.9  |
+
+- item one
+- item two with a link https://example.com/{i}
+> Note: quoted text
+<!-- hidden comment -->
+"""
+
+CHAINED_PATTERNS = [
+    (re.compile(r"```.*?```", re.DOTALL), " "),
+    (re.compile(r"<!--.*?-->", re.DOTALL), " "),
+    (re.compile(r"!\[[^\]]*\]\([^)]*\)"), ""),
+    (re.compile(r"\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"</?[A-Za-z][^>]*>"), " "),
+    (re.compile(r"`([^`\n]*)`"), r"\1"),
+    (re.compile(r"^[ \t]*#{1,6}[ \t]*", re.MULTILINE), " "),
+    (re.compile(r"^[ \t]*(?:>[ \t]?|[-*+][ \t]+|\d+\.[ \t]+)", re.MULTILINE), " "),
+    (re.compile(r"https?://\S+"), ""),
+    (re.compile(r"&amp;"), "&"),
+    (re.compile(r"[*_~]{1,3}"), ""),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def chained_clean(text):
+    for pattern, replacement in CHAINED_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def build_corpus(count, sections):
+    return ["\n".join(SECTION.format(i=i * sections + j) for j in range(sections)) for i in range(count)]
+
+
+def timed(func, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sections = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    corpus = build_corpus(count, sections)
+    total_mb = sum(len(text) for text in corpus) / 1e6
+    print(f"Corpus: {count} READMEs, {total_mb:.1f} MB")
+
+    single = timed(markdown_to_text, corpus)
+    chained = timed(chained_clean, corpus)
+    print(f"single-pass cleaner:  {single:.3f}s ({total_mb / single:.1f} MB/s)")
+    print(f"chained regex cleaner: {chained:.3f}s ({total_mb / chained:.1f} MB/s)")
+
+    # Cap matches production: only the first 64 KB of each README is cleaned
+    enricher = ReadmeEnricher(max_bytes=64 * 1024)
+    repos = [SimpleNamespace(full_name=f"bench/{i}", readme=text, readme_sha=f"sha-{i}")
+             for i, text in enumerate(corpus)]
+    start = time.perf_counter()
+    enricher.enrich(repos)
+    cold = time.perf_counter() - start
+
+    repos = [SimpleNamespace(full_name=f"bench/{i}", readme="", readme_sha=f"sha-{i}")
+             for i in range(count)]
+    start = time.perf_counter()
+    enricher.enrich(repos)
+    warm = time.perf_counter() - start
+    print(f"enrich cold (capped, cleaned): {cold:.3f}s")
+    print(f"enrich warm (SHA cache hits):  {warm:.3f}s  stats={enricher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
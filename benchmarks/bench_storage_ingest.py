@@ -0,0 +1,83 @@
+"""Benchmark per-item against batched summary ingest on a MongoDB server.
+
+Writes the same summaries twice into a scratch database, first with one
+Storage.store_summary call each and then with Storage.store_summaries_many,
+and repeats the batched run against the now-populated collection to time
+the upsert-as-update path. The scratch database is dropped afterwards.
+
+Needs a reachable mongod; BENCH_MONGODB_URI defaults to a local one. Add
+artificial latency (e.g. with tc netem) to see the effect of round trips
+against a remote cluster such as Atlas.
+
+Usage:
+    python benchmarks/bench_storage_ingest.py [count] [chunk_size]
+"""
+import os
+import sys
+import time
+
+from pymongo import MongoClient
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.nodes.storage import Storage, content_hash, summary_key
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+DB_NAME = 'aidigest_ingest_bench'
+
+
+def make_summaries(count, run):
+    summaries = []
+    for i in range(count):
+        content = f"Summary {i} of a repository about scalable training. " * 4
+        summaries.append({
+            'title': f"repo-{i}",
+            'content': content,
+            'source': 'github',
+            'category': 'research',
+            'tags': ['llm', 'training'],
+            'url': f"https://github.com/bench/repo-{i}",
+            'metadata': {'stars': i},
+            'natural_key': summary_key('github', f"bench-{run}/repo-{i}"),
+            'content_hash': content_hash({'content': content}),
+            'metrics': {'stars': i}
+        })
+    return summaries
+
+
+def timed(label, count, write):
+    start = time.perf_counter()
+    stored = write()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {elapsed:.2f}s ({count / elapsed:,.0f} docs/s), {stored}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=5000)
+    client.drop_database(DB_NAME)
+    try:
+        storage = Storage(client[DB_NAME], bulk_chunk_size=chunk_size)
+
+        per_item = make_summaries(count, 'per-item')
+        timed('per-item store_summary', count,
+              lambda: f"{sum(1 for summary in per_item if storage.store_summary(summary))} stored")
+
+        def batched_write(run):
+            report = storage.store_summaries_many(make_summaries(count, run))
+            return (f"{len(report.inserted_ids)} inserted, {len(report.updated_ids)} updated, "
+                    f"{len(report.failures)} failed")
+
+        timed(f"batched ({chunk_size}/chunk)", count, lambda: batched_write('batched'))
+        timed("batched, all updates", count, lambda: batched_write('batched'))
+    finally:
+        client.drop_database(DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
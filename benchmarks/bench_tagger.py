@@ -0,0 +1,128 @@
+"""Benchmark Tagger.tag_content against the previous substring-scanning tagger.
+
+Tags the same README-sized documents (about 12 KB of text each by default)
+with each implementation:
+  - legacy: `keyword in text` for every category keyword, again for every
+    common tag, and a third time for the relevance scores (the old
+    _determine_primary_category/_generate_tags/_calculate_relevance_scores);
+  - matcher: one KeywordMatcher pass that feeds all three.
+
+Also counts documents whose category or tags differ; the legacy scan's
+substring hits ('rl' in "world", 'agent' in "management") account for those.
+
+Usage:
+    python benchmarks/bench_tagger.py [documents] [readme_kb]
+"""
+import os
+import sys
+import time
+import random
+from collections import defaultdict
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.nodes.tagger import Tagger
+
+# Everyday README words; keywords are mixed in at about 2% of words
+FILLER = (
+    "the a of and to in for with on by this that is are be can you your it use using run install "
+    "configuration file files command line python code example examples library support supports version "
+    "release build test tests docs documentation api server client request response user users project "
+    "open source license contributing issue issues pull github repository dataset datasets train training "
+    "evaluate evaluation results benchmark model models inference checkpoint weights gpu cuda memory batch "
+    "world management framework"
+).split()
+KEYWORD_RATE = 0.02
+
+
+def extend_taxonomy(tagger, extra):
+    """Add ``extra`` made-up keywords per category, as a larger taxonomy would have."""
+    for category, keywords in tagger.category_keywords.items():
+        keywords.update(f"{category[:4]}term{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(extra))
+
+
+def make_documents(count, readme_kb, keywords):
+    rng = random.Random(42)
+    keywords = sorted(keywords)
+    documents = []
+    for i in range(count):
+        words = []
+        size = 0
+        while size < readme_kb * 1024:
+            word = rng.choice(keywords) if rng.random() < KEYWORD_RATE else rng.choice(FILLER)
+            words.append(word)
+            size += len(word) + 1
+        documents.append({
+            'id': f"org/repo-{i}",
+            'title': f"repo-{i}",
+            'description': "A toolkit for training and serving models",
+            'readme': ' '.join(words),
+            'metadata': {'topics': ['llm'], 'language': 'Python'}
+        })
+    return documents
+
+
+def legacy_tag_content(tagger, content):
+    text = tagger._extract_text_content(content)
+    category_scores = defaultdict(int)
+    for category, keywords in tagger.category_keywords.items():
+        for keyword in keywords:
+            if keyword in text:
+                category_scores[category] += 1
+    primary = max(category_scores.items(), key=lambda x: x[1])[0] if category_scores else 'uncategorized'
+
+    tags = set()
+    for category, keywords in tagger.common_tags.items():
+        for keyword in keywords:
+            if keyword in text:
+                tags.add(keyword)
+    metadata = content.get('metadata', {})
+    if 'topics' in metadata:
+        tags.update(set(metadata['topics']))
+    if 'language' in metadata:
+        tags.add(f"lang:{metadata['language']}")
+
+    scores = {}
+    total_words = len(text.split())
+    for category, keywords in tagger.category_keywords.items():
+        category_matches = sum(1 for keyword in keywords if keyword in text)
+        scores[category] = min(1.0, category_matches / len(keywords))
+    scores['content_quality'] = min(1.0, total_words / 1000)
+    return primary, tags, scores
+
+
+def timed(label, documents, tag):
+    start = time.perf_counter()
+    results = [tag(document) for document in documents]
+    elapsed = time.perf_counter() - start
+    print(f"{label:>8}: {elapsed:.3f}s ({len(documents) / elapsed:,.0f} docs/s)")
+    return results
+
+
+def compare(tagger, documents):
+    tagger.tag_content(documents[0])  # compile the matcher outside the timing
+    legacy = timed('legacy', documents, lambda document: legacy_tag_content(tagger, document))
+    current = timed('matcher', documents, tagger.tag_content)
+    differing = sum(
+        1 for (primary, tags, _), tagged in zip(legacy, current)
+        if primary != tagged.primary_category or tags != tagged.tags
+    )
+    print(f"{differing} of {len(documents)} documents tagged differently (whole-word matching)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    readme_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    for extra in (0, 50):
+        tagger = Tagger()
+        extend_taxonomy(tagger, extra)
+        keywords = set(tagger._matcher().keywords)
+        print(f"{len(keywords)} keywords, {count} documents of {readme_kb} KB")
+        compare(tagger, make_documents(count, readme_kb, keywords))
+
+
+if __name__ == "__main__":
+    main()
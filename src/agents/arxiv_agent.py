@@ -12,17 +12,15 @@ class ArxivAgent:
         return papers
 
     def _make_request(self, query):
-        import requests
-        response = requests.get(self.base_url + query)
+        from src.utils.http_transport import default_transport
+        response = default_transport().session.get(self.base_url + query, stream=True)
         response.raise_for_status()
-        return response.text
+        return self._iter_body(response)
+
+    def _iter_body(self, response):
+        with response:
+            yield from response.iter_content(chunk_size=64 * 1024)
 
     def _parse_response(self, response):
-        import xml.etree.ElementTree as ET
-        root = ET.fromstring(response)
-        papers = []
-        for entry in root.findall("{http://www.w3.org/2005/Atom}entry"):
-            title = entry.find("{http://www.w3.org/2005/Atom}title").text
-            summary = entry.find("{http://www.w3.org/2005/Atom}summary").text
-            papers.append({"title": title, "summary": summary})
-        return papers
\ No newline at end of file
+        from src.utils.atom_parser import iter_atom_entries
+        return iter_atom_entries(response)
@@ -1,21 +1,169 @@
 import os
+import sys
 import time
 import logging
-from datetime import datetime, timezone
+import threading
 from dotenv import load_dotenv
-from github import Github
-from huggingface_hub import HfApi
-from pymongo import MongoClient
 
-from nodes.fetchers import GitHubFetcher, HuggingFaceFetcher, ArxivFetcher
-from nodes.summarizer import Summarizer
-from nodes.tagger import Tagger
-from nodes.storage import Storage
-from utils.db_config import get_db_config
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.nodes.fetchers import GitHubFetcher, HuggingFaceFetcher, ArxivFetcher, RepoMetadata, parse_timestamp
+from src.nodes.summarizer import Summarizer
+from src.nodes.tagger import Tagger
+from src.nodes.trend_engine import TrendEngine
+from src.nodes.storage import Storage, SummaryWriter, summary_key, content_hash, paper_content_hash
+from src.nodes.watermarks import WatermarkStore
+from src.nodes.work_leases import WorkLeases
+from src.nodes.readme_enricher import ReadmeEnricher
+from src.utils.db_config import get_db_config
+from src.utils.github_graphql import GitHubGraphQLLoader
+from src.utils.github_query_planner import GitHubQueryPlanner
+from src.utils.http_cache import HttpCache
+from src.utils.http_transport import (
+    HttpTransport, set_default_transport, install_github_transport, install_huggingface_transport
+)
+from src.utils.model_detail_cache import ModelDetailCache
+from src.utils.quota_scheduler import QuotaScheduler, SourceDeferred
+from src.utils.fetch_phase import FetchPhase, FetchJob
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.cadence import CadenceScheduler, SourceCadence
+from src.utils.cycle_journal import CycleJournal
+from src.utils.startup import LazyClient, StartupCache, StartupTimer, fast_start_enabled
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Search results per page; the query planner sizes its requests with the same value
+GITHUB_PER_PAGE = 100
+# Newest papers requested per cycle across all arXiv categories
+ARXIV_MAX_RESULTS = 100
+# Longest a source's fetch may hold up the cycle; a late fetch is processed when it finishes
+FETCH_TIMEOUT_SECONDS = 600
+SOURCES = ['github', 'huggingface', 'arxiv']
+# arXiv announces new papers at 20:00 US Eastern; run shortly after, whether EST or EDT is in effect
+ARXIV_LISTING_OFFSET_SECONDS = int(1.5 * 3600)
+# Items each pipeline stage may hold before fetching waits for it to catch up
+PIPELINE_QUEUE_SIZE = 100
+DEDUPE_WORKERS = 4
+SUMMARIZE_WORKERS = 4
+TAG_WORKERS = 2
+STORE_WORKERS = 2
+# Summaries written per bulk_write round trip
+STORAGE_BULK_CHUNK_SIZE = 100
+# Longest a stored summary waits in the writer's buffer for the chunk to fill
+SUMMARY_FLUSH_SECONDS = 5
+# Work units a process claims at a time when several agents share the sources
+LEASE_BATCH_SIZE = 2
+# Fetched items looked up and queued together while a source's fetch streams them in
+FEED_BATCH_SIZE = 50
+
+
+class WorkItem:
+    """A fetched item on its way through the processing pipeline."""
+
+    def __init__(self, source, payload, journal=None, seq=None):
+        self.source = source
+        self.payload = payload
+        self.summary = None
+        self.tagged = None
+        self.journal = journal
+        self.seq = seq
+        self.key, self.content_hash, self.metrics = self._identity()
+        # The stored version (hash and metrics), looked up for the item's whole batch before queueing
+        self.stored = None
+
+    def mark(self, stage):
+        """Record in the cycle journal that this item reached ``stage``."""
+        if self.journal is not None:
+            self.journal.mark(self.seq, stage)
+
+    def _identity(self):
+        """Natural key, hash of the summarized content, and metrics that may move between cycles."""
+        if self.source == 'github':
+            repo = self.payload
+            content = {
+                'name': repo.name, 'description': repo.description, 'topics': repo.topics,
+                'language': repo.language, 'readme_sha': repo.readme_sha
+            }
+            return summary_key('github', repo.full_name), content_hash(content), {'stars': repo.stars}
+        if self.source == 'huggingface':
+            model = self.payload
+            content = {'name': model.get('name'), 'details': model.get('details')}
+            return (summary_key('huggingface', model.get('id')), content_hash(content),
+                    {'downloads': model.get('downloads') or 0})
+        paper = self.payload
+        return summary_key('arxiv', paper.get('id')), paper_content_hash(paper), {}
+
+    def __str__(self):
+        if self.source == 'github':
+            return f"repo {self.payload.full_name}"
+        if self.source == 'huggingface':
+            return f"model {self.payload.get('id')}"
+        return f"paper {self.payload.get('title')}"
+
+class SourceFeed:
+    """Queues one source's items for processing from the fetch pool as the fetch yields them.
+
+    Items are spooled to the cycle journal, looked up and queued a batch at
+    a time, so a long listing is never held in memory and a full pipeline
+    slows the fetch down. After ``detach`` nothing more is queued; the rest
+    is returned to the caller instead.
+    """
+
+    def __init__(self, source, journal, lookup, put, batch_size=FEED_BATCH_SIZE):
+        self.source = source
+        self.journal = journal
+        self.lookup = lookup
+        self.put = put
+        self.batch_size = batch_size
+        self.count = 0
+        self._detached = False
+        self._lock = threading.Lock()
+
+    def consume(self, fetch):
+        """Run ``fetch`` and queue its items as they arrive; returns those that arrived after ``detach``.
+
+        On SourceDeferred the items fetched before it and its partial results
+        are still queued, and the partial results become whatever could not be.
+        """
+        left, batch = [], []
+        try:
+            for item in fetch():
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    left.extend(self._queue(batch))
+                    batch = []
+        except SourceDeferred as e:
+            batch.extend(e.partial or [])
+            for start in range(0, len(batch), self.batch_size):
+                left.extend(self._queue(batch[start:start + self.batch_size]))
+            e.partial = left
+            raise
+        left.extend(self._queue(batch))
+        return left
+
+    def detach(self):
+        """Stop queueing into the cycle, waiting for a batch being queued to finish."""
+        with self._lock:
+            self._detached = True
+
+    def _queue(self, batch):
+        with self._lock:
+            if self._detached:
+                return batch
+            work_items = [
+                WorkItem(self.source, item, journal=self.journal, seq=self.journal.record_fetched(self.source, item))
+                for item in batch
+            ]
+            self.lookup(work_items)
+            for work_item in work_items:
+                self.put(work_item)
+                self.count += 1
+            self.journal.sync()
+        return []
+
 def validate_tokens():
     """Validate API tokens before starting the agent."""
     # Check environment variables
@@ -43,225 +191,578 @@ def validate_tokens():
     return github_token, hf_token
 
 class AIDiscoveryAgent:
-    def __init__(self):
-        # Load environment variables
-        load_dotenv()
-        
-        # Validate tokens
-        self.github_token, self.hf_token = validate_tokens()
-        
+    def __init__(self, fast_start=None):
+        """Set up clients and components.
+
+        In fast-start mode (``FAST_START=1``) credential checks that passed
+        within ``CREDENTIAL_CHECK_TTL_HOURS`` are skipped and the API clients
+        are only built when first used.
+        """
+        timer = StartupTimer()
+        with timer.phase('env'):
+            # Load environment variables
+            load_dotenv()
+            self.fast_start = fast_start_enabled() if fast_start is None else fast_start
+
+            # Validate tokens
+            self.github_token, self.hf_token = validate_tokens()
+            self.startup_cache = StartupCache(
+                os.getenv('STARTUP_CACHE_PATH', os.path.join(project_root, '.cache', 'startup.json')),
+                credential_ttl=float(os.getenv('CREDENTIAL_CHECK_TTL_HOURS', '24')) * 3600
+            )
+
+        with timer.phase('http'):
+            # Conditional-request cache shared by all fetchers
+            self.http_cache = HttpCache(
+                os.getenv('HTTP_CACHE_DIR', os.path.join(project_root, '.cache', 'http')),
+                max_bytes=int(os.getenv('HTTP_CACHE_MAX_MB', '256')) * 1024 * 1024
+            )
+            # One pooled transport for every client; arXiv asks for one connection at a time
+            self.transport = HttpTransport(cache=self.http_cache, host_limits={'export.arxiv.org': 1})
+            set_default_transport(self.transport)
+            # Must be installed before the GitHub and Hugging Face clients open their connections
+            install_github_transport(self.transport)
+            install_huggingface_transport(self.transport)
+
         # Initialize API clients with better configuration
-        try:
-            self.github_client = Github(
+        with timer.phase('github_auth'):
+            self.github_client = self._client('github', self.github_token, self._github_client)
+        with timer.phase('huggingface_auth'):
+            self.hf_client = self._client('huggingface', self.hf_token, self._hf_client)
+
+        with timer.phase('database'):
+            # Initialize MongoDB using the config
+            db_config = get_db_config(fast_start=self.fast_start)
+            self.db = db_config.db
+        index_cache = self.startup_cache if self.fast_start else None
+
+        # Initialize components
+        with timer.phase('storage'):
+            self.storage = Storage(self.db, bulk_chunk_size=STORAGE_BULK_CHUNK_SIZE, index_cache=index_cache)
+            self.summary_writer = SummaryWriter(self.storage, max_delay=SUMMARY_FLUSH_SECONDS)
+            # Items handed to the writer but not yet confirmed by a flush, by cycle journal
+            self._unflushed = {}
+            self._unflushed_lock = threading.Lock()
+            # Held while a cycle, a resumed source or a late fetch feeds, flushes and commits,
+            # so flush reports and trend saves are never shared between threads
+            self._processing = threading.RLock()
+            self.journal_dir = os.getenv('CYCLE_JOURNAL_DIR', os.path.join(project_root, '.cache', 'journal'))
+            self.watermarks = WatermarkStore(self.db, index_cache=index_cache)
+        with timer.phase('components'):
+            self.scheduler = QuotaScheduler()
+            # With WORK_LEASES=1 every process claims part of each source's search queries/categories
+            self.leases = WorkLeases(
+                self.db, lease_seconds=float(os.getenv('LEASE_SECONDS', '300')), index_cache=index_cache
+            ) if os.getenv('WORK_LEASES', '0').strip().lower() in ('1', 'true', 'yes') else None
+            self.cadence = None
+            self.cadences = self._cadences(aligned=self.leases is not None)
+            self.fetch_phase = FetchPhase(self.scheduler, default_timeout=FETCH_TIMEOUT_SECONDS)
+            self.summarizer = Summarizer()
+            # Trends of newly stored items, kept across restarts
+            self.trends = TrendEngine(
+                os.getenv('TREND_STATE_PATH', os.path.join(project_root, '.cache', 'trends.json'))
+            )
+            self.tagger = Tagger(trends=self.trends)
+            # Fetched items flow through dedupe -> summarize -> tag -> store, each stage on its own workers
+            self.pipeline = Pipeline([
+                PipelineStage('dedupe', self._dedupe_item, workers=DEDUPE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+                PipelineStage('summarize', self._summarize_item, workers=SUMMARIZE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+                PipelineStage('tag', self._tag_item, workers=TAG_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+                PipelineStage('store', self._store_item, workers=STORE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE)
+            ]).start()
+        
+            # Initialize fetchers
+            self.github_fetcher = GitHubFetcher(
+                self.github_client,
+                # README text is left to the enricher, which skips blobs it has already seen
+                graphql_loader=GitHubGraphQLLoader(self.github_token, session=self.transport.session,
+                                                   fetch_readme_text=False),
+                query_planner=GitHubQueryPlanner(per_page=GITHUB_PER_PAGE)
+            )
+            self.model_detail_cache = ModelDetailCache(
+                os.getenv('HF_MODEL_CACHE_PATH', os.path.join(project_root, '.cache', 'hf_model_details.json')),
+                max_entries=int(os.getenv('HF_MODEL_CACHE_SIZE', '10000'))
+            )
+            self.hf_fetcher = HuggingFaceFetcher(
+                self.hf_client,
+                session=self.transport.session,
+                watermarks=self.watermarks,
+                detail_cache=self.model_detail_cache
+            )
+            self.arxiv_fetcher = ArxivFetcher(session=self.transport.session, watermarks=self.watermarks)
+            # Units that leases are taken on. GitHub's are the planner's merged queries, so a leased
+            # run searches no more often than one that fetches every keyword; the Hugging Face
+            # listing is a single newest-first walk to its watermark, so it is leased whole
+            github_plan = self.github_fetcher.query_planner.plan(GitHubFetcher.DEFAULT_KEYWORDS)
+            self.lease_units = {
+                'github': [query.key for query in github_plan.queries],
+                'huggingface': ['listing'],
+                'arxiv': list(self.arxiv_fetcher.categories)
+            }
+            self.readme_enricher = ReadmeEnricher(
                 self.github_token,
-                per_page=10,
-                retry=5,
-                timeout=15,
-                user_agent="AI-Discovery-Agent/1.0"
+                session=self.transport.session,
+                cache_dir=os.getenv('README_CACHE_DIR', os.path.join(project_root, '.cache', 'readmes'))
             )
-            # Test GitHub authentication
-            self.github_client.get_user().login
-            logger.info("Successfully authenticated with GitHub")
-        except Exception as e:
-            raise ValueError(f"GitHub authentication failed: {str(e)}")
+        timer.report()
 
-        # Initialize HuggingFace client
+    def _client(self, name, token, factory):
+        """An authenticated API client; in fast-start mode, a lazy one whose token passed a recent check."""
+        if self.fast_start and self.startup_cache.credentials_checked(name, token):
+            logger.info(f"Fast start: skipping {name} authentication check done within the last TTL")
+            return LazyClient(factory)
+        client = factory()
+        self._check_credentials(name, client)
+        if self.fast_start:
+            self.startup_cache.record_credentials(name, token)
+        return client
+
+    @staticmethod
+    def _check_credentials(name, client):
         try:
-            self.hf_client = HfApi(token=self.hf_token)
-            # Test HuggingFace authentication
-            self.hf_client.whoami()
-            logger.info("Successfully authenticated with Hugging Face")
+            if name == 'github':
+                # Test GitHub authentication
+                client.get_user().login
+                logger.info("Successfully authenticated with GitHub")
+            else:
+                # Test HuggingFace authentication
+                client.whoami()
+                logger.info("Successfully authenticated with Hugging Face")
         except Exception as e:
-            raise ValueError(f"Hugging Face authentication failed: {str(e)}")
+            label = 'GitHub' if name == 'github' else 'Hugging Face'
+            raise ValueError(f"{label} authentication failed: {str(e)}")
 
-        # Initialize MongoDB using the config
-        db_config = get_db_config()
-        self.db = db_config.db
-        
-        # Initialize components
-        self.storage = Storage(self.db)
-        self.summarizer = Summarizer()
-        self.tagger = Tagger()
-        
-        # Initialize fetchers
-        self.github_fetcher = GitHubFetcher(self.github_client)
-        self.hf_fetcher = HuggingFaceFetcher(self.hf_client)
-        self.arxiv_fetcher = ArxivFetcher()
+    def _github_client(self):
+        # Imported here so that importing this module does not load the SDKs
+        from github import Github
+        return Github(
+            self.github_token,
+            per_page=GITHUB_PER_PAGE,
+            retry=5,
+            timeout=15,
+            user_agent="AI-Discovery-Agent/1.0"
+        )
+
+    def _hf_client(self):
+        from huggingface_hub import HfApi
+        return HfApi(token=self.hf_token)
 
-    def run_discovery_cycle(self):
-        """Run one complete discovery cycle."""
+    def run_discovery_cycle(self, sources=None):
+        """Run one discovery cycle for the given sources (all by default).
+
+        Returns the number of new items fetched per source, or None for a
+        source whose fetch failed or has not finished yet, including one that
+        is parked until its quota resets.
+        """
+        sources = sources or SOURCES
+        new_items = {source: None for source in sources}
+        journal = CycleJournal(self.journal_dir, sources=sources)
         try:
-            # Check GitHub rate limit before starting
-            rate_limit = self.github_client.get_rate_limit()
-            if rate_limit.core.remaining < 50:  # Ensure enough quota
-                reset_time = rate_limit.core.reset
-                wait_time = (reset_time - datetime.now(timezone.utc)).seconds + 60
-                logger.warning(f"Rate limit too low. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-
-            # 1. Fetch data from all sources
-            logger.info("Fetching data from sources...")
-            
-            repos = self.github_fetcher.fetch_trending_repos()
-            models = self.hf_fetcher.fetch_latest_models(limit=10)
-            papers = self.arxiv_fetcher.fetch_latest_papers()
-            
-            # 2. Process GitHub repositories
-            logger.info("Processing GitHub repositories...")
-            for repo in repos:
-                try:
-                    # Create summary
-                    summary = self.summarizer.summarize_repo(vars(repo))
-                    
-                    # Tag content
-                    tagged = self.tagger.tag_content({
-                        'id': repo.full_name,
-                        'title': repo.name,
-                        'description': repo.description,
-                        'metadata': {
-                            'language': repo.language,
-                            'topics': repo.topics,
-                            'stars': repo.stars
-                        }
-                    })
-                    
-                    # Store in database
-                    self.storage.store_summary({
-                        'title': summary.title,
-                        'content': summary.content,
-                        'source': 'github',
-                        'category': tagged.primary_category,
-                        'tags': list(tagged.tags),
-                        'url': repo.url,
-                        'metadata': tagged.metadata
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing repo {repo.full_name}: {str(e)}")
-
-            # 3. Process Hugging Face models
-            logger.info("Processing Hugging Face models...")
-            for model in models:
-                try:
-                    # Create model URL if not present
-                    if 'url' not in model:
-                        model_id = model.get('id', '').strip()
-                        if model_id:
-                            model['url'] = f"https://huggingface.co/{model_id}"
-                        else:
-                            model['url'] = None
-                    
-                    # Improve content extraction with fallbacks
-                    model_description = ""
-                    # Try multiple paths to get meaningful content
-                    if 'details' in model:
-                        if 'model_card' in model['details']:
-                            model_description = model['details']['model_card'].get('description', '')
-                        
-                        # If still empty, try additional paths
-                        if not model_description and isinstance(model['details'], dict):
-                            if 'description' in model['details']:
-                                model_description = model['details']['description']
-                            elif 'tags' in model['details']:
-                                model_description = f"Model tags: {', '.join(model['details']['tags'])}"
-                    
-                    # Last resort fallback
-                    if not model_description:
-                        model_description = f"A {model.get('name', 'machine learning')} model from Hugging Face"
-                    
-                    # Set description in model for summarizer to use
-                    model['description'] = model_description
-                    
-                    summary = self.summarizer.summarize_model(model)
-                    tagged = self.tagger.tag_content({
-                        'id': model['id'],
-                        'title': model['name'],
-                        'description': model_description,
-                        'metadata': model['details']
-                    })
-                    
-                    # Ensure we have content for storage
-                    # If summary.content is empty, use the model_description
-                    content_to_store = summary.content if summary.content else model_description
-                    
-                    self.storage.store_summary({
-                        'title': summary.title,
-                        'content': content_to_store,
-                        'source': 'huggingface',
-                        'category': tagged.primary_category,
-                        'tags': list(tagged.tags),
-                        'url': model['url'],
-                        'metadata': tagged.metadata
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing model {model.get('id')}: {str(e)}")
-
-            # 4. Process ArXiv papers
-            logger.info("Processing ArXiv papers...")
-            for paper in papers:
-                try:
-                    # Get or create the ArXiv URL
-                    if 'url' not in paper:
-                        # Extract paper ID from title or other fields if available
-                        paper_id = paper.get('id', '').strip()
-                        if not paper_id:
-                            # Try to extract ID from title by removing spaces and special chars
-                            import re
-                            paper_id = re.sub(r'\W+', '', paper.get('title', ''))
-                        
-                        # Create ArXiv URL (if ID exists)
-                        if paper_id:
-                            paper['url'] = f"https://arxiv.org/abs/{paper_id}"
-                        else:
-                            paper['url'] = None
-                    
-                    summary = self.summarizer.summarize_paper(paper)
-                    tagged = self.tagger.tag_content({
-                        'id': paper['title'],
-                        'title': paper['title'],
-                        'description': paper['summary'],
-                        'metadata': {'source': 'arxiv'}
-                    })
-                    
-                    self.storage.store_summary({
-                        'title': summary.title,
-                        'content': summary.content,
-                        'source': 'arxiv',
-                        'category': tagged.primary_category,
-                        'tags': list(tagged.tags),
-                        'url': paper.get('url'),  # Store the URL
-                        'metadata': tagged.metadata
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing paper {paper['title']}: {str(e)}")
-
-            logger.info("Discovery cycle completed successfully")
+            # 1. Fetch from all sources at once; a source out of quota is parked, not waited on
+            logger.info(f"Fetching data from {', '.join(sources)}...")
+
+            fetches = {
+                'github': self._fetch_github,
+                'huggingface': self._fetch_huggingface,
+                'arxiv': lambda categories=None: self.arxiv_fetcher.fetch_latest_papers(
+                    categories, combined=True, max_results=ARXIV_MAX_RESULTS)
+            }
+            if self.leases is not None:
+                fetches = {source: self._leased(source, fetch) for source, fetch in fetches.items()}
+            feeds = {
+                source: SourceFeed(source, journal, self._lookup_stored, self.pipeline.put) for source in sources
+            }
+            jobs = [
+                FetchJob(source, self._streamed(fetches[source], feeds[source]), self._resumed(source), default=[])
+                for source in sources
+            ]
+
+            with self._processing:
+                # 2. Each fetch hands its items to the pipeline from the fetch pool as they arrive,
+                # so they are summarized and stored while the source is still downloading
+                for result in self.fetch_phase.iter_results(jobs):
+                    feed = feeds[result.source]
+                    if result.status == 'timeout':
+                        # Whatever the fetch yields from now on is processed with its late results
+                        feed.detach()
+                    elif result.status == 'error':
+                        # Marks a failed fetch staged before failing cover items that were never processed
+                        self.watermarks.discard(result.source)
+                        self._release_leases(result.source)
+                    elif result.status == 'ok':
+                        new_items[result.source] = feed.count
+                    logger.info(f"Queued {feed.count} {result.source} items ({result.status})")
+                self._finish_processing(journal)
+
+                # Only advance the watermarks of sources whose fetched items have been processed;
+                # a late or parked fetch commits its own once its remaining results are processed
+                for source, count in new_items.items():
+                    if count is not None:
+                        self.watermarks.commit(source)
+                        self._complete_leases(source)
+
+            logger.info(f"Pipeline stats per stage: {self.pipeline.stats()}")
+            self.http_cache.flush()
+            logger.info(f"HTTP cache stats: {self.http_cache.stats()}")
+            logger.info(f"HTTP transport stats per host: {self.transport.stats()}")
+            logger.info(f"Model detail cache stats: {self.model_detail_cache.stats()}")
+            logger.info(f"Seconds parked per source: {self.scheduler.parked_seconds()}")
+            logger.info(f"Discovery cycle {journal.cycle_id} completed successfully")
             
         except Exception as e:
-            logger.error(f"Error in discovery cycle: {str(e)}")
-            if "rate limit exceeded" in str(e).lower():
-                logger.info("Rate limit exceeded, waiting 1 hour...")
-                time.sleep(3600)  # Wait an hour before retry
-
-    def run(self, interval_minutes=60):
-        """Run the agent continuously with specified interval."""
-        logger.info(f"Starting AI Discovery Agent with {interval_minutes} minute interval")
-        
-        while True:
+            self.watermarks.discard()
+            for source in sources:
+                self._release_leases(source)
+            logger.error(f"Error in discovery cycle {journal.cycle_id}: {str(e)}")
+            new_items = {source: None for source in sources}
+        finally:
+            # Only a cycle that dies with the process leaves its journal behind
+            journal.close()
+        return new_items
+
+    def resume_journals(self):
+        """Finish the cycles that died part way through, from their spooled payloads.
+
+        Items of such a cycle that were not stored yet go through the pipeline
+        again; nothing is fetched. Their watermarks were never committed, so
+        the next cycle fetches them again and dedupe skips what is stored.
+        """
+        for journal in CycleJournal.incomplete(self.journal_dir, payload_types={'RepoMetadata': RepoMetadata}):
+            pending = journal.unfinished()
+            logger.info(f"Resuming cycle {journal.cycle_id}: {len(pending)} items not stored yet")
+            work_items = [WorkItem(source, payload, journal=journal, seq=seq) for seq, source, payload in pending]
+            with self._processing:
+                self._lookup_stored(work_items)
+                for work_item in work_items:
+                    self.pipeline.put(work_item)
+                self._finish_processing(journal)
+            left = len(journal.unfinished())
+            if left:
+                logger.warning(f"{left} items of cycle {journal.cycle_id} failed again; "
+                               f"they are fetched again with the next cycle")
+            journal.close()
+
+    def _fetch_github(self, units=None):
+        """Fetch GitHub repos, deferring the source when too little quota is left.
+
+        Leased runs get planned queries as units, each naming its keywords.
+        """
+        keywords = None if units is None else [keyword for unit in units for keyword in unit.split(',')]
+        rate_limit = self.github_client.get_rate_limit()
+        if rate_limit.core.remaining < 50:  # Ensure enough quota
+            raise SourceDeferred('github', parse_timestamp(rate_limit.core.reset),
+                                 resume=lambda: self._fetch_github(units))
+        repos = self.github_fetcher.fetch_trending_repos(keywords, concurrent=True)
+        return self.readme_enricher.enrich(repos)
+
+    def _fetch_huggingface(self, units=None):
+        """Fetch the latest models as a lazy bulk listing; the listing is one lease unit."""
+        return self.hf_fetcher.fetch_latest_models(limit=10, bulk=True)
+
+    def _streamed(self, fetch, feed):
+        """Wrap a fetch so the fetch pool feeds its items into the pipeline as they arrive.
+
+        Returns the items that arrived after the feed was detached. Resumed
+        work is not streamed: it runs once the cycle is over, and its results
+        go to the source's ``on_resume`` callback.
+        """
+        def work():
+            try:
+                return feed.consume(fetch)
+            except SourceDeferred as e:
+                if e.resume is None:
+                    e.resume = lambda: list(fetch())
+                raise
+        return work
+
+    def _leased(self, source, fetch):
+        """Wrap a source's fetch so it only covers the units this process wins leases on.
+
+        Units are claimed a few at a time until none are left in the current
+        cadence window, so faster processes take on more of the work.
+        """
+        def fetch_claimed():
+            window = self.cadences[source].window(time.time())
+            count = 0
+            while True:
+                units = self.leases.claim(source, window, self.lease_units[source], limit=LEASE_BATCH_SIZE)
+                if not units:
+                    break
+                for item in fetch(units):
+                    count += 1
+                    yield item
+            logger.info(f"Fetched {count} {source} items from leased units")
+        return fetch_claimed
+
+    def _complete_leases(self, source):
+        if self.leases is not None:
+            self.leases.complete(source)
+
+    def _release_leases(self, source):
+        if self.leases is not None:
+            self.leases.release(source)
+
+    def _resumed(self, source):
+        """Build the callback that handles a parked source's results once it resumes.
+
+        Watermarks and leases are only committed once the source's work is
+        ``done``; partial results before it parks again are just processed.
+        """
+        def on_resume(items, done=True):
+            journal = CycleJournal(self.journal_dir, sources=[source])
             try:
-                self.run_discovery_cycle()
-            except Exception as e:
-                logger.error(f"Error in discovery cycle: {str(e)}")
-                logger.info("Waiting 5 minutes before retry...")
-                time.sleep(300)  # Wait 5 minutes before retrying
-                continue
-                
-            logger.info(f"Sleeping for {interval_minutes} minutes...")
-            time.sleep(interval_minutes * 60)
+                with self._processing:
+                    count = self._feed(source, items, journal)
+                    self._finish_processing(journal)
+                    if count is None:
+                        self.watermarks.discard(source)
+                        self._release_leases(source)
+                    elif done:
+                        self.watermarks.commit(source)
+                        self._complete_leases(source)
+            finally:
+                journal.close()
+        return on_resume
+
+    def _finish_processing(self, journal):
+        """Wait for the pipeline to empty and write the summaries still buffered.
+
+        Only ``journal``'s items are marked stored; callers hold the
+        processing lock, so the flush report covers no other thread's items.
+        """
+        self.pipeline.drain()
+        with self._unflushed_lock:
+            written = self._unflushed.pop(journal, [])
+        report = self.summary_writer.flush()
+        # Failures name the natural key, or the title of a keyless summary
+        failed = {failure['key'] for failure in report.failures}
+        for item in written:
+            if (item.key or item.summary.title) not in failed:
+                item.mark('stored')
+        logger.info(f"Stored summaries: {len(report.inserted_ids)} new, {len(report.updated_ids)} updated, "
+                    f"{len(report.failures)} failed")
+        self.trends.save()
+        emerging = self.trends.emerging()
+        if emerging:
+            logger.info("Emerging topics: " + ", ".join(
+                f"{topic['tag']} (x{topic['lift']:g})" for topic in emerging[:10]
+            ))
+
+    def _feed(self, source, items, journal):
+        """Spool and queue a source's items for processing, blocking while the pipeline is full.
+
+        Returns how many were queued, or None if feeding them failed; the
+        failure is left to the caller to handle for this source alone.
+        """
+        logger.info(f"Processing {source} items...")
+        count = 0
+        try:
+            work_items = []
+            for item in items:
+                seq = journal.record_fetched(source, item)
+                work_items.append(WorkItem(source, item, journal=journal, seq=seq))
+            self._lookup_stored(work_items)
+            for work_item in work_items:
+                self.pipeline.put(work_item)
+                count += 1
+        except Exception as e:
+            logger.error(f"Error queueing {source} items after {count}: {str(e)}")
+            count = None
+        journal.sync()
+        logger.info(f"Queued {count} {source} items")
+        return count
+
+    def _lookup_stored(self, work_items):
+        """Attach the stored version of each item, found for the whole batch with one query."""
+        stored = self.storage.find_by_keys(item.key for item in work_items if item.key is not None)
+        for item in work_items:
+            item.stored = stored.get(item.key)
+
+    def _dedupe_item(self, item):
+        """Pipeline stage: skip items stored unchanged in an earlier cycle, updating moved metrics."""
+        stored = item.stored
+        if item.key is None or stored is None or stored.get('content_hash') != item.content_hash:
+            return item
+
+        stored_metrics = stored.get('metrics') or {}
+        moved = {
+            f"metrics.{name}": value
+            for name, value in item.metrics.items()
+            if stored_metrics.get(name) != value
+        }
+        if item.source == 'github' and 'metrics.stars' in moved:
+            # Tag metadata carries the star count too
+            moved['metadata.stars'] = item.metrics['stars']
+        if moved:
+            self.storage.update_by_key(item.key, moved)
+        item.mark('skipped')
+        return None
+
+    def _summarize_item(self, item):
+        """Pipeline stage: prepare an item's URL and description and summarize it."""
+        if item.source == 'github':
+            item.summary = self.summarizer.summarize_repo(vars(item.payload))
+        elif item.source == 'huggingface':
+            model = item.payload
+            # Create model URL if not present
+            if 'url' not in model:
+                model_id = model.get('id', '').strip()
+                if model_id:
+                    model['url'] = f"https://huggingface.co/{model_id}"
+                else:
+                    model['url'] = None
+
+            # Improve content extraction with fallbacks
+            model_description = ""
+            # Try multiple paths to get meaningful content
+            if 'details' in model:
+                if 'model_card' in model['details']:
+                    model_description = model['details']['model_card'].get('description', '')
+
+                # If still empty, try additional paths
+                if not model_description and isinstance(model['details'], dict):
+                    if 'description' in model['details']:
+                        model_description = model['details']['description']
+                    elif 'tags' in model['details']:
+                        model_description = f"Model tags: {', '.join(model['details']['tags'])}"
+
+            # Last resort fallback
+            if not model_description:
+                model_description = f"A {model.get('name', 'machine learning')} model from Hugging Face"
+
+            # Set description in model for summarizer to use
+            model['description'] = model_description
+            item.summary = self.summarizer.summarize_model(model)
+        else:
+            paper = item.payload
+            # Get or create the ArXiv URL
+            if 'url' not in paper:
+                # Extract paper ID from title or other fields if available
+                paper_id = paper.get('id', '').strip()
+                if not paper_id:
+                    # Try to extract ID from title by removing spaces and special chars
+                    import re
+                    paper_id = re.sub(r'\W+', '', paper.get('title', ''))
+
+                # Create ArXiv URL (if ID exists)
+                if paper_id:
+                    paper['url'] = f"https://arxiv.org/abs/{paper_id}"
+                else:
+                    paper['url'] = None
+            item.summary = self.summarizer.summarize_paper(paper)
+        item.mark('summarized')
+        return item
+
+    def _tag_item(self, item):
+        """Pipeline stage: tag an item's content."""
+        if item.source == 'github':
+            repo = item.payload
+            item.tagged = self.tagger.tag_content({
+                'id': repo.full_name,
+                'title': repo.name,
+                'description': repo.description,
+                'metadata': {
+                    'language': repo.language,
+                    'topics': repo.topics,
+                    'stars': repo.stars
+                }
+            })
+        elif item.source == 'huggingface':
+            model = item.payload
+            item.tagged = self.tagger.tag_content({
+                'id': model['id'],
+                'title': model['name'],
+                'description': model['description'],
+                'metadata': model['details']
+            })
+        else:
+            paper = item.payload
+            item.tagged = self.tagger.tag_content({
+                'id': paper['title'],
+                'title': paper['title'],
+                'description': paper['summary'],
+                'metadata': {'source': 'arxiv'}
+            })
+        item.mark('tagged')
+        return item
+
+    def _store_item(self, item):
+        """Pipeline stage: queue an item's summary for the next bulk write; nothing is passed on."""
+        content = item.summary.content
+        if item.source == 'huggingface':
+            # If summary.content is empty, use the model description
+            content = content or item.payload['description']
+        payload = item.payload
+        document = {
+            'title': item.summary.title,
+            'content': content,
+            'source': item.source,
+            'category': item.tagged.primary_category,
+            'tags': list(item.tagged.tags),
+            'url': payload.url if item.source == 'github' else payload.get('url'),
+            'metadata': item.tagged.metadata
+        }
+        if item.key is not None:
+            document.update(natural_key=item.key, content_hash=item.content_hash, metrics=item.metrics)
+        if item.journal is not None:
+            document['cycle_id'] = item.journal.cycle_id
+        with self._unflushed_lock:
+            self._unflushed.setdefault(item.journal, []).append(item)
+        self.summary_writer.add(document)
+        # Unchanged items were dropped at dedupe, so each new or changed item counts once
+        self.trends.observe(item.tagged)
+        return None
+
+    def run(self, interval_minutes=None):
+        """Run the agent continuously, each source on its own cadence.
+
+        ``interval_minutes`` puts every source on the same interval instead.
+        """
+        self.cadences = self._cadences(interval_minutes, aligned=self.leases is not None)
+        cadences = list(self.cadences.values())
+        logger.info("Starting AI Discovery Agent with cadences: " + ", ".join(
+            f"{cadence.source} every {cadence.interval / 60:.0f} minutes" for cadence in cadences
+        ))
+        self.resume_journals()
+        self.cadence = CadenceScheduler(cadences)
+        self.cadence.run(self.run_discovery_cycle)
+
+    @staticmethod
+    def _cadences(interval_minutes=None, aligned=False):
+        """Each source's cadence by name; leases use it to agree on the current window.
+
+        ``aligned`` pins every source's runs to the start of its windows, so
+        processes started at different times still run in the same window.
+        """
+        if interval_minutes:
+            cadences = [SourceCadence(source, interval_minutes * 60) for source in SOURCES]
+        else:
+            cadences = [
+                SourceCadence('github', int(os.getenv('GITHUB_INTERVAL_MINUTES', '60')) * 60),
+                SourceCadence('huggingface', int(os.getenv('HF_INTERVAL_MINUTES', '10')) * 60),
+                # One run per daily listing; backing off would skip whole days
+                SourceCadence('arxiv', 24 * 3600, anchor=ARXIV_LISTING_OFFSET_SECONDS, max_backoff=1)
+            ]
+        if aligned:
+            for cadence in cadences:
+                if cadence.anchor is None:
+                    cadence.anchor = 0
+        return {cadence.source: cadence for cadence in cadences}
 
     def cleanup(self):
         """Cleanup resources."""
+        if self.cadence is not None:
+            self.cadence.stop()
+        self.scheduler.shutdown()
+        self.fetch_phase.shutdown()
+        self.pipeline.shutdown()
+        self.summary_writer.flush()
+        if self.leases is not None:
+            self.leases.close()
         self.storage.close()
-        self.github_client.close()
+        self.http_cache.close()
+        if not isinstance(self.github_client, LazyClient) or self.github_client.created:
+            self.github_client.close()
 
 def main():
     agent = None
@@ -0,0 +1,245 @@
+import os
+import json
+import time
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from src.utils.http_transport import transport_session
+from src.utils.quota_scheduler import reset_time_from_headers
+
+logger = logging.getLogger(__name__)
+
+ARXIV_OAI_URL = "http://export.arxiv.org/oai2"
+
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+ARXIV_META_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+
+class OAIError(Exception):
+    """An OAI-PMH error response, e.g. ``badResumptionToken``."""
+
+    def __init__(self, code: str, message: str = ""):
+        super().__init__(f"OAI-PMH error {code}: {message}")
+        self.code = code
+
+
+@dataclass
+class OAIPage:
+    records: List[Dict[str, Any]]
+    resumption_token: Optional[str]
+    last_datestamp: Optional[str]
+
+
+class ArxivOAIHarvester:
+    """Harvest arXiv metadata over OAI-PMH ``ListRecords``, following resumption tokens.
+
+    Requests are spaced ``request_interval`` seconds apart and a ``503``
+    flow-control response is retried after its ``Retry-After``.
+    """
+
+    def __init__(self, endpoint: str = ARXIV_OAI_URL, session: Optional[requests.Session] = None,
+                 request_interval: float = 3, max_retries: int = 5, timeout: float = 60):
+        self.endpoint = endpoint
+        self.session = session or transport_session()
+        self.request_interval = request_interval
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+    def iter_pages(self, set_spec: str, from_date: str, until_date: str,
+                   resumption_token: Optional[str] = None) -> Iterator[OAIPage]:
+        """Yield pages of a ``ListRecords`` harvest, starting from a token when given."""
+        first_request = True
+        while True:
+            if not first_request:
+                time.sleep(self.request_interval)
+            first_request = False
+
+            if resumption_token:
+                params = {'verb': 'ListRecords', 'resumptionToken': resumption_token}
+            else:
+                params = {'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': set_spec,
+                          'from': from_date, 'until': until_date}
+            page = self._parse_page(self._request(params))
+            yield page
+            if not page.resumption_token:
+                return
+            resumption_token = page.resumption_token
+
+    def _request(self, params: Dict[str, str]) -> bytes:
+        for attempt in range(self.max_retries + 1):
+            response = self.session.get(self.endpoint, params=params, timeout=self.timeout)
+            if response.status_code == 503 and attempt < self.max_retries:
+                resume_at = reset_time_from_headers(response.headers, default_wait=30)
+                wait = max(1.0, resume_at.timestamp() - time.time())
+                logger.info(f"OAI-PMH endpoint asked to retry in {wait:.0f}s")
+                time.sleep(wait)
+                continue
+            response.raise_for_status()
+            return response.content
+        raise OAIError('retriesExceeded', f"gave up after {self.max_retries} retries")
+
+    def _parse_page(self, body: bytes) -> OAIPage:
+        root = ET.fromstring(body)
+        error = root.find(f"{OAI_NS}error")
+        if error is not None:
+            if error.get('code') == 'noRecordsMatch':
+                return OAIPage(records=[], resumption_token=None, last_datestamp=None)
+            raise OAIError(error.get('code', 'unknown'), (error.text or '').strip())
+
+        list_records = root.find(f"{OAI_NS}ListRecords")
+        if list_records is None:
+            return OAIPage(records=[], resumption_token=None, last_datestamp=None)
+
+        records = []
+        last_datestamp = None
+        for record in list_records.iterfind(f"{OAI_NS}record"):
+            header = record.find(f"{OAI_NS}header")
+            if header is not None:
+                last_datestamp = header.findtext(f"{OAI_NS}datestamp") or last_datestamp
+                if header.get('status') == 'deleted':
+                    continue
+            metadata = record.find(f"{OAI_NS}metadata/{ARXIV_META_NS}arXiv")
+            if metadata is not None:
+                records.append(self._to_paper(metadata))
+
+        token = list_records.findtext(f"{OAI_NS}resumptionToken")
+        return OAIPage(records=records, resumption_token=(token or '').strip() or None,
+                       last_datestamp=last_datestamp)
+
+    @staticmethod
+    def _to_paper(metadata: ET.Element) -> Dict[str, Any]:
+        paper_id = metadata.findtext(f"{ARXIV_META_NS}id")
+        authors = []
+        for author in metadata.iterfind(f"{ARXIV_META_NS}authors/{ARXIV_META_NS}author"):
+            name = " ".join(filter(None, [
+                author.findtext(f"{ARXIV_META_NS}forenames"),
+                author.findtext(f"{ARXIV_META_NS}keyname")
+            ]))
+            if name:
+                authors.append(name)
+        categories = (metadata.findtext(f"{ARXIV_META_NS}categories") or "").split()
+        return {
+            'id': paper_id,
+            'url': f"https://arxiv.org/abs/{paper_id}" if paper_id else None,
+            'title': " ".join((metadata.findtext(f"{ARXIV_META_NS}title") or "").split()),
+            'summary': (metadata.findtext(f"{ARXIV_META_NS}abstract") or "").strip(),
+            'authors': authors,
+            'categories': categories,
+            'primary_category': categories[0] if categories else None,
+            'published': metadata.findtext(f"{ARXIV_META_NS}created"),
+            'updated': metadata.findtext(f"{ARXIV_META_NS}updated")
+        }
+
+
+class BackfillCheckpoint:
+    """Progress of a backfill job per set, kept in a JSON file replaced atomically."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable backfill checkpoint: {str(e)}")
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._state.get(key, {}))
+
+    def save(self, key: str, **progress) -> None:
+        with self._lock:
+            self._state.setdefault(key, {}).update(progress)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.path)
+
+
+class ArxivBackfill:
+    """Rebuild arXiv summaries for a date range from an OAI-PMH harvest.
+
+    Records are buffered and handed to ``process_batch`` at page boundaries
+    once ``batch_size`` is reached; the resumption token is checkpointed only
+    after its batch was processed, so a restarted job repeats at most the
+    unprocessed pages. A set may name a category (``stat.ML``): its parent
+    set is harvested and filtered, and papers already covered by an earlier
+    set in the same job are skipped.
+    """
+
+    def __init__(self, harvester: ArxivOAIHarvester, checkpoint: BackfillCheckpoint,
+                 process_batch: Callable[[List[Dict[str, Any]]], Any], batch_size: int = 500):
+        self.harvester = harvester
+        self.checkpoint = checkpoint
+        self.process_batch = process_batch
+        self.batch_size = batch_size
+
+    def run(self, from_date: str, until_date: str, sets: List[str]) -> Dict[str, int]:
+        """Harvest every set and return the number of papers processed per set."""
+        processed = {}
+        for index, spec in enumerate(sets):
+            processed[spec] = self._run_set(spec, sets[:index], from_date, until_date)
+        return processed
+
+    def _run_set(self, spec: str, earlier_specs: List[str], from_date: str, until_date: str) -> int:
+        key = f"{spec}:{from_date}:{until_date}"
+        state = self.checkpoint.get(key)
+        if state.get('done'):
+            logger.info(f"Backfill of {spec} already complete ({state.get('processed', 0)} papers)")
+            return state.get('processed', 0)
+
+        processed = state.get('processed', 0)
+        token = state.get('token')
+        start_date = state.get('last_datestamp') or from_date
+        harvest_set = spec.split('.')[0]
+        if token:
+            logger.info(f"Resuming backfill of {spec} from checkpoint ({processed} papers done)")
+
+        buffer: List[Dict[str, Any]] = []
+        try:
+            pages = self.harvester.iter_pages(harvest_set, start_date, until_date, token)
+            for page in pages:
+                buffer.extend(
+                    paper for paper in page.records
+                    if self._in_set(paper, spec) and not any(self._in_set(paper, s) for s in earlier_specs)
+                )
+                if len(buffer) < self.batch_size and page.resumption_token:
+                    continue
+                if buffer:
+                    self.process_batch(buffer)
+                    processed += len(buffer)
+                    buffer = []
+                self.checkpoint.save(
+                    key,
+                    token=page.resumption_token,
+                    last_datestamp=page.last_datestamp or start_date,
+                    processed=processed,
+                    done=page.resumption_token is None
+                )
+                logger.info(f"Backfill of {spec}: {processed} papers processed")
+        except OAIError as e:
+            if e.code != 'badResumptionToken':
+                raise
+            # Expired token: harvest again from the last checkpointed day
+            logger.warning(f"Resumption token for {spec} expired; restarting from {start_date}")
+            self.checkpoint.save(key, token=None)
+            return self._run_set(spec, earlier_specs, from_date, until_date)
+        return processed
+
+    @staticmethod
+    def _in_set(paper: Dict[str, Any], spec: str) -> bool:
+        """Whether a paper belongs to a set (``cs``) or category (``stat.ML``)."""
+        for category in paper.get('categories', []):
+            if category == spec or category.split('.')[0] == spec:
+                return True
+        return False
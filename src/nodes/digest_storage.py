@@ -1,11 +1,12 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone
-from pymongo import MongoClient, DESCENDING
-from pymongo.database import Database
-from pymongo.errors import PyMongoError
 import logging
 import os
 
+from src.utils.lazy_import import lazy_import
+
+pymongo = lazy_import('pymongo')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ class DigestStorage:
         try:
             if isinstance(db_connection, str):
                 logger.info(f"Connecting to MongoDB using connection string")
-                self.client = MongoClient(db_connection)
+                self.client = pymongo.MongoClient(db_connection)
                 # Use environment variable for DB name
                 self.db_name = os.getenv('DB_NAME', 'aidigest')
                 self.db = self.client[self.db_name]
@@ -36,7 +37,7 @@ class DigestStorage:
             
             # Create indexes for efficient querying
             try:
-                self.digests.create_index([("date_created", DESCENDING)])
+                self.digests.create_index([("date_created", pymongo.DESCENDING)])
                 self.digests.create_index([("category", 1)])
                 self.digests.create_index([("source", 1)])
                 self.digests.create_index([("content_id", 1)], unique=True)
@@ -82,7 +83,7 @@ class DigestStorage:
             logger.info(f"Stored digest for '{digest_data['title']}'")
             return str(result.inserted_id)
             
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Database error storing digest: {str(e)}")
             return None
     
@@ -110,10 +111,10 @@ class DigestStorage:
                 query["source"] = source
                 
             # Execute query
-            cursor = self.digests.find(query).sort("date_created", DESCENDING).limit(limit)
+            cursor = self.digests.find(query).sort("date_created", pymongo.DESCENDING).limit(limit)
             return list(cursor)
             
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Database error retrieving digests: {str(e)}")
             return []
     
@@ -129,7 +130,7 @@ class DigestStorage:
         """
         try:
             return self.digests.find_one({"content_id": content_id})
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Database error retrieving digest: {str(e)}")
             return None
     
@@ -160,6 +161,6 @@ class DigestStorage:
                 
             return stats
             
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Database error getting digest stats: {str(e)}")
             return {"error": str(e)}
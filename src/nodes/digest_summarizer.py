@@ -1,19 +1,20 @@
 import logging
 import time
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from pymongo.database import Database
-from pymongo.collection import Collection
 
 from src.utils.gemini_client import GeminiClient
 from src.nodes.digest_storage import DigestStorage
 
+if TYPE_CHECKING:
+    from pymongo.database import Database
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DigestSummarizer:
-    def __init__(self, source_db: Database, digest_db: Database):
+    def __init__(self, source_db: "Database", digest_db: "Database"):
         """
         Initialize the digest summarizer.
         
@@ -2,12 +2,26 @@ import os
 import time
 import requests
 import logging
-import xml.etree.ElementTree as ET
+import threading
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 from dataclasses import dataclass
-from github.PaginatedList import PaginatedList
-from github import Github, RateLimitExceededException
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from src.utils.lazy_import import lazy_import
+from src.utils.rate_limiter import GitHubRateLimiter
+from src.utils.github_graphql import GraphQLUnavailableError
+from src.utils.http_transport import transport_session
+from src.utils.atom_parser import iter_atom_entries
+from src.nodes.watermarks import newest_mark, oldest_mark, is_new
+from src.utils.quota_scheduler import SourceDeferred, reset_time_from_headers, defer_on_throttle
+
+if TYPE_CHECKING:
+    from github.PaginatedList import PaginatedList
+
+# PyGithub is loaded when a fetch first needs it, not when this module is imported
+github = lazy_import('github')
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -24,130 +38,507 @@ class RepoMetadata:
     topics: List[str]
     url: str
     language: str
+    readme: str = ""
+    readme_sha: str = ""
 
 
 class GitHubFetcher:
-    def __init__(self, api_client):
+    DEFAULT_KEYWORDS = [
+        "artificial-intelligence",
+        "machine-learning",
+        "deep-learning",
+        "neural-networks",
+        "ai-agents",
+        "llm",
+        "transformers",
+        "autonomous-agents"
+    ]
+    REPOS_PER_KEYWORD = 10
+
+    def __init__(self, api_client, rate_limiter=None, max_workers=4, graphql_loader=None, query_planner=None):
         self.github_client = api_client
         self.logger = logging.getLogger(__name__)
+        self.rate_limiter = rate_limiter or GitHubRateLimiter()
+        self.max_workers = max_workers
+        self.graphql_loader = graphql_loader
+        self.query_planner = query_planner
+        self.last_plan = None
 
-    def fetch_trending_repos(self, keywords=None, days=7):
+    def fetch_trending_repos(self, keywords=None, days=7, concurrent=False):
+        """Most-starred repos per keyword created in the last ``days`` days.
+
+        Search only sorts by stars, so there is no watermark to resume from:
+        every cycle searches the whole window and the agent's dedupe stage
+        skips repos that are already stored unchanged.
+        """
         if keywords is None:
-            keywords = [
-                "artificial-intelligence",
-                "machine-learning",
-                "deep-learning",
-                "neural-networks",
-                "ai-agents",
-                "llm",
-                "transformers",
-                "autonomous-agents"
-            ]
+            keywords = self.DEFAULT_KEYWORDS
         
         date_threshold = datetime.now(timezone.utc) - timedelta(days=days)
-        date_query = date_threshold.strftime("created:>%Y-%m-%d")
-        trending_repos = []
+
+        # Re-run the whole fetch once the quota resets; nothing is returned before that
+        def resume():
+            return self.fetch_trending_repos(keywords, days, concurrent)
+
+        if self.query_planner is not None:
+            return self._fetch_trending_repos_planned(keywords, date_threshold, resume, concurrent)
+        if concurrent:
+            return self._fetch_trending_repos_concurrent(keywords, date_threshold, resume)
+
+        keyword_hits = []
         
         for keyword in keywords:
             try:
                 # Check rate limit before making request
                 rate_limit = self.github_client.get_rate_limit()
                 if rate_limit.core.remaining < 10:
-                    reset_time = rate_limit.core.reset
-                    wait_time = (reset_time - datetime.now(timezone.utc)).seconds + 60
-                    self.logger.warning(f"Rate limit low. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    self.logger.warning("Rate limit low. Deferring GitHub until the quota resets...")
+                    raise SourceDeferred('github', parse_timestamp(rate_limit.core.reset), resume=resume)
 
-                query = f"{keyword} {date_query} stars:>10 language:python"
+                query = f"{keyword} {self._date_query(date_threshold)} stars:>10 language:python"
                 self.logger.info(f"Fetching repositories for query: {query}")
                 
-                repos: PaginatedList = self.github_client.search_repositories(
+                repos: "PaginatedList" = self.github_client.search_repositories(
                     query=query,
                     sort="stars",
                     order="desc"
                 )
                 
-                # Process repositories with rate limit awareness
-                current_repos = []
+                # Only collect the search hits here; metadata is loaded in one batch below
+                current_hits = []
                 for repo in repos:
-                    if len(current_repos) >= 10:
-                        break
-                        
-                    try:
-                        time.sleep(2)  # Delay between requests
-                        topics = repo.get_topics()  # This makes an additional API call
-                        
-                        metadata = RepoMetadata(
-                            name=repo.name,
-                            full_name=repo.full_name,
-                            description=repo.description or "",
-                            stars=repo.stargazers_count,
-                            created_at=repo.created_at,
-                            updated_at=repo.updated_at,
-                            topics=topics,
-                            url=repo.html_url,
-                            language=repo.language or "Unknown"
-                        )
-                        current_repos.append(metadata)
-                        self.logger.debug(f"Processed repo: {repo.full_name}")
-                        
-                    except RateLimitExceededException:
-                        self.logger.warning("Rate limit exceeded, waiting for reset...")
-                        time.sleep(3600)  # Wait an hour
+                    if len(current_hits) >= self.REPOS_PER_KEYWORD:
                         break
-                    except Exception as e:
-                        self.logger.error(f"Error processing repo {repo.full_name}: {str(e)}")
-                        continue
+                    current_hits.append(repo)
                 
-                trending_repos.extend(current_repos)
+                keyword_hits.append((keyword, current_hits))
                 
-            except RateLimitExceededException:
-                self.logger.warning("Rate limit exceeded, waiting for reset...")
-                time.sleep(3600)  # Wait an hour
-                continue
+            except SourceDeferred:
+                raise
+            except github.RateLimitExceededException as e:
+                raise self._deferral(e, resume)
             except Exception as e:
                 self.logger.error(f"Error fetching repos for keyword {keyword}: {str(e)}")
                 continue
 
-        if not trending_repos:
+        # Remove duplicates before loading metadata, then sort
+        unique_hits = list({repo.full_name: repo for _, hits in keyword_hits for repo in hits}.values())
+        try:
+            unique_repos = self._load_repo_metadata(unique_hits)
+        except github.RateLimitExceededException as e:
+            raise self._deferral(e, resume)
+
+        if not unique_repos:
+            self.logger.warning("No repositories found for any keywords")
+            return []
+
+        return sorted(unique_repos, key=lambda x: x.stars, reverse=True)
+
+    def _fetch_trending_repos_concurrent(self, keywords, date_threshold, resume):
+        """Run keyword searches and per-repo calls on a bounded pool.
+
+        Calls are paced by the shared token-bucket limiter instead of fixed
+        sleeps. Results are merged in keyword order so dedup and star
+        ordering match the sequential path.
+        """
+        try:
+            self.rate_limiter.sync(self.github_client.get_rate_limit())
+        except Exception as e:
+            self.logger.debug(f"Could not sync rate limiter with GitHub: {str(e)}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                search_results = list(executor.map(
+                    lambda keyword: self._search_keyword(keyword, date_threshold),
+                    keywords
+                ))
+
+                # Deduplicate before the follow-up calls so each repo costs one request
+                unique_hits = {}
+                for hits in search_results:
+                    for repo in hits:
+                        unique_hits[repo.full_name] = repo
+
+                unique_repos = self._load_repo_metadata(list(unique_hits.values()), executor)
+            except github.RateLimitExceededException as e:
+                raise self._deferral(e, resume)
+
+        if not unique_repos:
+            self.logger.warning("No repositories found for any keywords")
+            return []
+
+        return sorted(unique_repos, key=lambda x: x.stars, reverse=True)
+
+    def _fetch_trending_repos_planned(self, keywords, date_threshold, resume, concurrent):
+        """Search with OR-combined queries from the query planner.
+
+        Hits are streamed page by page; the plan records how many search
+        requests it actually used.
+        """
+        plan = self.query_planner.plan(keywords)
+        self.last_plan = plan
+        query_hits = defaultdict(list)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers) if concurrent else None
+        try:
+            for query, repo in self.stream_planned_search(plan, date_threshold):
+                query_hits[query.key].append(repo)
+
+            unique_hits = list({repo.full_name: repo for hits in query_hits.values() for repo in hits}.values())
+            unique_repos = self._load_repo_metadata(unique_hits, executor)
+        except github.RateLimitExceededException as e:
+            raise self._deferral(e, resume)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.logger.info(f"Search plan: {plan.summary()}")
+
+        if not unique_repos:
             self.logger.warning("No repositories found for any keywords")
             return []
 
-        # Remove duplicates and sort
-        unique_repos = list({repo.full_name: repo for repo in trending_repos}.values())
         return sorted(unique_repos, key=lambda x: x.stars, reverse=True)
 
+    def stream_planned_search(self, plan, date_threshold):
+        """Yield (planned query, repo) pairs as each search page arrives.
+
+        A failing query is logged and skipped, keeping the hits of the others;
+        running out of rate limit still ends the whole search.
+        """
+        for planned in plan.queries:
+            try:
+                yield from self._stream_planned_query(planned, plan, date_threshold)
+            except github.RateLimitExceededException:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error fetching repos for query {planned.terms}: {str(e)}")
+
+    def _stream_planned_query(self, planned, plan, date_threshold):
+        query = f"{planned.terms} {self._date_query(date_threshold)} stars:>10 language:python"
+        self.logger.info(f"Fetching repositories for query: {query}")
+        results = self.github_client.search_repositories(
+            query=query,
+            sort="stars",
+            order="desc"
+        )
+
+        yielded = 0
+        for page in self._iter_pages(results, plan):
+            for repo in page:
+                if yielded >= planned.max_results:
+                    break
+                yielded += 1
+                yield planned, repo
+            if yielded >= planned.max_results or len(page) < plan.per_page:
+                break
+
+    def _iter_pages(self, results, plan):
+        """Fetch result pages one request at a time, counting requests on the plan."""
+        if not hasattr(results, 'get_page'):
+            # Plain sequences (e.g. test doubles) arrive as a single page
+            self.rate_limiter.acquire_search()
+            plan.requests_used += 1
+            yield list(results)
+            return
+
+        page_index = 0
+        while True:
+            self.rate_limiter.acquire_search()
+            page = results.get_page(page_index)
+            plan.requests_used += 1
+            yield page
+            page_index += 1
+
+    def _search_keyword(self, keyword, date_threshold):
+        try:
+            query = f"{keyword} {self._date_query(date_threshold)} stars:>10 language:python"
+            self.rate_limiter.acquire_search()
+            self.logger.info(f"Fetching repositories for query: {query}")
+            repos = self.github_client.search_repositories(
+                query=query,
+                sort="stars",
+                order="desc"
+            )
+            hits = []
+            for repo in repos:
+                if len(hits) >= self.REPOS_PER_KEYWORD:
+                    break
+                hits.append(repo)
+            return hits
+        except github.RateLimitExceededException:
+            self.logger.warning(f"Rate limit exceeded while searching for keyword {keyword}")
+            self.rate_limiter.search.drain_to(0)
+            raise
+        except Exception as e:
+            self.logger.error(f"Error fetching repos for keyword {keyword}: {str(e)}")
+            return []
+
+    @staticmethod
+    def _date_query(date_threshold):
+        return date_threshold.strftime("created:>%Y-%m-%d")
+
+    def _deferral(self, error, resume):
+        self.logger.warning("Rate limit exceeded, deferring GitHub until the quota resets...")
+        return SourceDeferred('github', reset_time_from_headers(getattr(error, 'headers', None)), resume=resume)
+
+    def _load_repo_metadata(self, repos, executor=None):
+        """Build RepoMetadata for search hits, preserving their order.
+
+        Topics, language, stars and README come from one batched GraphQL
+        request when a loader is configured. Repos it could not resolve, or
+        all of them when GraphQL is unavailable, fall back to REST calls.
+        """
+        batched = {}
+        if self.graphql_loader is not None and repos:
+            try:
+                batched = self.graphql_loader.load([repo.full_name for repo in repos])
+            except GraphQLUnavailableError as e:
+                self.logger.warning(f"GraphQL metadata unavailable, falling back to REST: {str(e)}")
+
+        rest_repos = [repo for repo in repos if repo.full_name not in batched]
+        if executor is not None:
+            rest_metadata = executor.map(self._fetch_repo_metadata, rest_repos)
+        else:
+            rest_metadata = map(self._fetch_repo_metadata_throttled, rest_repos)
+        resolved = {repo.full_name: metadata for repo, metadata in zip(rest_repos, rest_metadata)}
+
+        results = []
+        for repo in repos:
+            if repo.full_name in batched:
+                results.append(self._to_metadata_from_graphql(repo, batched[repo.full_name]))
+            elif resolved.get(repo.full_name) is not None:
+                results.append(resolved[repo.full_name])
+        return results
+
+    def _fetch_repo_metadata_throttled(self, repo):
+        try:
+            time.sleep(2)  # Delay between requests
+            metadata = self._to_metadata(repo, repo.get_topics())  # This makes an additional API call
+            self.logger.debug(f"Processed repo: {repo.full_name}")
+            return metadata
+        except github.RateLimitExceededException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error processing repo {repo.full_name}: {str(e)}")
+            return None
+
+    def _fetch_repo_metadata(self, repo):
+        try:
+            self.rate_limiter.acquire_core()
+            return self._to_metadata(repo, repo.get_topics())
+        except github.RateLimitExceededException:
+            self.logger.warning(f"Rate limit exceeded while processing repo {repo.full_name}")
+            self.rate_limiter.core.drain_to(0)
+            raise
+        except Exception as e:
+            self.logger.error(f"Error processing repo {repo.full_name}: {str(e)}")
+            return None
+
+    def _to_metadata(self, repo, topics):
+        return RepoMetadata(
+            name=repo.name,
+            full_name=repo.full_name,
+            description=repo.description or "",
+            stars=repo.stargazers_count,
+            created_at=repo.created_at,
+            updated_at=repo.updated_at,
+            topics=topics,
+            url=repo.html_url,
+            language=repo.language or "Unknown"
+        )
+
+    def _to_metadata_from_graphql(self, repo, loaded):
+        metadata = self._to_metadata(repo, loaded['topics'])
+        metadata.stars = loaded['stars']
+        metadata.language = loaded['language'] or metadata.language
+        metadata.readme = loaded['readme']
+        metadata.readme_sha = loaded['readme_sha']
+        return metadata
+
     def fetch_new_repos(self, keywords):
         # Reuse fetch_trending_repos but with a shorter timeframe
         return self.fetch_trending_repos(keywords)[:20]  # Return top 20 newest repos
 
 
+def parse_timestamp(value):
+    """Normalize API timestamps (datetime or ISO string) to aware UTC datetimes."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class HuggingFaceFetcher:
-    def __init__(self, api_client):
+    # Upper bound on models listed while paging back to a watermark
+    MAX_INCREMENTAL_ITEMS = 500
+
+    def __init__(self, api_client, http_cache=None, watermarks=None, max_workers=8, detail_cache=None,
+                 session=None):
         self.api_client = api_client
+        # model_info goes through the shared transport (and its cache) when one is given
+        self.session = session or (transport_session(http_cache) if http_cache else None)
+        self.watermarks = watermarks
+        self.max_workers = max_workers
+        # Details of unchanged model revisions are served from here without a model_info call
+        self.detail_cache = detail_cache
 
-    def fetch_latest_models(self, limit=10):
+    def fetch_latest_models(self, limit=10, bulk=False):
+        if bulk:
+            return self.iter_latest_models(limit)
         try:
-            # Using list_models instead of get
-            models = self.api_client.list_models(
-                limit=limit,
-                sort="lastModified",
-                direction=-1
-            )
-            
-            return [
-                {
-                    'id': model.modelId,
-                    'name': model.modelId.split('/')[-1],
-                    'details': self._get_model_details(model.modelId),
-                    'last_modified': getattr(model, 'lastModified', ''),
-                    'downloads': getattr(model, 'downloads', 0)
-                }
+            mark = self.watermarks.get('huggingface', 'lastModified') if self.watermarks else None
+            if mark:
+                models = list(self._iter_models_since(mark))
+            else:
+                # Using list_models instead of get
+                models = list(self.api_client.list_models(
+                    limit=limit,
+                    sort="lastModified",
+                    direction=-1
+                ))
+
+            self._stage_watermark(models)
+
+            entries = [
+                self._model_entry(model, self._get_model_details(model.modelId, self._model_version(model)))
                 for model in models
             ]
+            self._flush_detail_cache()
+            return entries
+        except Exception as e:
+            defer_on_throttle('huggingface', e, resume=lambda: self.fetch_latest_models(limit))
+            raise Exception(f"Error fetching models: {str(e)}")
+
+    def iter_latest_models(self, limit=10):
+        """Lazily yield the latest models, taking their details from the listing itself.
+
+        The listing is requested with card data and tags expanded, so most
+        models need no ``model_info`` call. Models the listing could not
+        describe are resolved on a bounded thread pool; entries are yielded
+        as soon as they are complete, so callers can start processing while
+        the listing is still paging.
+        """
+        try:
+            mark = self.watermarks.get('huggingface', 'lastModified') if self.watermarks else None
+            if mark:
+                listing = self._iter_models_since(mark, cardData=True, full=True)
+            else:
+                listing = self.api_client.list_models(
+                    limit=limit,
+                    sort="lastModified",
+                    direction=-1,
+                    cardData=True,
+                    full=True
+                )
+
+            listed = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {}
+                for model in listing:
+                    listed.append(model)
+                    version = self._model_version(model)
+                    details = self._listed_details(model, version)
+                    if details is not None:
+                        yield self._model_entry(model, details)
+                        continue
+
+                    pending[executor.submit(self._get_model_details, model.modelId, version)] = model
+                    # Keep at most two lookups per worker in flight
+                    if len(pending) >= 2 * self.max_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield self._model_entry(pending.pop(future), future.result())
+
+                for future in as_completed(pending):
+                    yield self._model_entry(pending[future], future.result())
+
+            self._stage_watermark(listed)
+            self._flush_detail_cache()
         except Exception as e:
+            defer_on_throttle('huggingface', e, resume=lambda: self.fetch_latest_models(limit))
             raise Exception(f"Error fetching models: {str(e)}")
 
+    def _model_entry(self, model, details):
+        return {
+            'id': model.modelId,
+            'name': model.modelId.split('/')[-1],
+            'details': details,
+            'last_modified': getattr(model, 'lastModified', ''),
+            'downloads': getattr(model, 'downloads', 0)
+        }
+
+    def _listed_details(self, model, version):
+        """Details for a listing entry from the cache or the listing itself, or None."""
+        if self.detail_cache is not None:
+            cached = self.detail_cache.get(model.modelId, version)
+            if cached is not None:
+                return cached
+        details = self._details_from_listing(model)
+        if details is not None and self.detail_cache is not None:
+            self.detail_cache.put(model.modelId, version, details)
+        return details
+
+    def _details_from_listing(self, model):
+        """Build model details from an expanded listing entry, or None if it lacks them."""
+        tags = getattr(model, 'tags', None)
+        if tags is None:
+            return None
+        card = getattr(model, 'card_data', None) or getattr(model, 'cardData', None) or {}
+        license_tags = [tag.split(':', 1)[1] for tag in tags if tag.startswith('license:')]
+        return {
+            'model_card': {
+                'description': card.get('description', '') or '',
+                'language': card.get('language', '') or '',
+                'license': card.get('license') or (license_tags[0] if license_tags else ''),
+                'pipeline_tag': getattr(model, 'pipeline_tag', ''),
+                'tasks': tags
+            },
+            'tags': tags
+        }
+
+    def _model_version(self, model):
+        """Identify a model revision by commit sha, falling back to lastModified."""
+        sha = getattr(model, 'sha', None)
+        if isinstance(sha, str) and sha:
+            return sha
+        modified = self._model_timestamp(model)
+        return modified.isoformat() if modified else None
+
+    def _flush_detail_cache(self):
+        if self.detail_cache is not None:
+            self.detail_cache.flush()
+
+    def _stage_watermark(self, models):
+        if self.watermarks is not None:
+            last_seen, last_ids = newest_mark(models, self._model_timestamp, lambda model: model.modelId)
+            self.watermarks.stage('huggingface', 'lastModified', last_seen, last_ids)
+
+    def _iter_models_since(self, mark, **listing_options):
+        """Page through the newest-first listing until the watermark is reached."""
+        seen_ids = set(mark['last_ids'])
+        # list_models pages lazily, so stopping early saves the remaining page requests
+        for model in self.api_client.list_models(
+            limit=self.MAX_INCREMENTAL_ITEMS,
+            sort="lastModified",
+            direction=-1,
+            **listing_options
+        ):
+            modified = self._model_timestamp(model)
+            if modified is not None and modified < mark['last_seen']:
+                break
+            if modified == mark['last_seen'] and model.modelId in seen_ids:
+                continue
+            yield model
+
+    def _model_timestamp(self, model):
+        return parse_timestamp(getattr(model, 'lastModified', None) or getattr(model, 'last_modified', None))
+
     def fetch_popular_models(self):
         try:
             models = self.api_client.list_models(
@@ -159,15 +550,37 @@ class HuggingFaceFetcher:
         except Exception as e:
             raise Exception(f"Error fetching popular models: {str(e)}")
 
-    def _get_model_details(self, model_id):
+    def _get_model_details(self, model_id, version=None):
+        if self.detail_cache is not None:
+            cached = self.detail_cache.get(model_id, version)
+            if cached is not None:
+                return cached
         try:
-            model_info = self.api_client.model_info(model_id)
-            return {
+            model_info = self._model_info(model_id)
+            details = {
                 'model_card': self._extract_model_card(model_info),
                 'tags': getattr(model_info, 'tags', [])
             }
         except Exception as e:
             return {'model_card': {}, 'tags': []}
+        if self.detail_cache is not None:
+            self.detail_cache.put(model_id, version, details)
+        return details
+
+    def _model_info(self, model_id):
+        if self.session is None:
+            return self.api_client.model_info(model_id)
+
+        from huggingface_hub.hf_api import ModelInfo
+        from huggingface_hub.utils import build_hf_headers
+        endpoint = getattr(self.api_client, 'endpoint', None) or "https://huggingface.co"
+        response = self.session.get(
+            f"{endpoint}/api/models/{model_id}",
+            headers=build_hf_headers(token=getattr(self.api_client, 'token', None)),
+            timeout=30
+        )
+        response.raise_for_status()
+        return ModelInfo(**response.json())
 
     def _extract_model_card(self, model_info):
         return {
@@ -180,59 +593,172 @@ class HuggingFaceFetcher:
 
 
 class ArxivFetcher:
-    def __init__(self, api_client=None):  # Make api_client optional
+    PAGE_SIZE = 100
+    # Pages of the combined query can be larger; arXiv serves up to 2000 results per call.
+    # They are streamed, while per-category pages are revalidated through the HTTP cache
+    COMBINED_PAGE_SIZE = 500
+    STREAM_CHUNK_SIZE = 64 * 1024
+    MAX_INCREMENTAL_ITEMS = 1000
+    REQUEST_INTERVAL = 3  # arXiv asks for 3 seconds between API calls
+
+    def __init__(self, api_client=None, http_cache=None, watermarks=None, session=None):  # Make api_client optional
         self.base_url = "http://export.arxiv.org/api/query?"
         self.categories = ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "stat.ML"]
         self.api_client = api_client  # Store but don't require api_client
+        self.session = session or transport_session(http_cache)
+        self.watermarks = watermarks
+        # Monotonic time of the last API request, shared by every call on this fetcher
+        self._last_request = None
+        self._request_lock = threading.Lock()
+
+    def fetch_latest_papers(self, categories=None, combined=False, max_results=5):
+        categories = list(categories or self.categories)
+        if combined:
+            return self._fetch_combined(categories, max_results)
+        return self._fetch_categories(categories, max_results)
+
+    def _fetch_combined(self, categories, max_results, start=0):
+        """Fetch all categories with one OR-combined query, paged newest-first.
+
+        A paper cross-listed in several categories is returned once, so it is
+        summarized and stored once. Watermarks are kept per category, so they
+        hold whichever categories a call combines; paging stops at the oldest
+        of them and papers every category of theirs has seen are left out.
+        """
+        search_query = "+OR+".join(f"cat:{category}" for category in categories)
+        marks = {category: self.watermarks.get('arxiv', category) for category in categories} if self.watermarks else {}
+        mark = oldest_mark(list(marks.values()))
+        limit = max(max_results, self.MAX_INCREMENTAL_ITEMS) if mark else max_results
+        papers = []
+        try:
+            for paper in self._page_query(search_query, mark, limit, self.COMBINED_PAGE_SIZE, start=start,
+                                          stream=True):
+                papers.append(paper)
+        except requests.RequestException as e:
+            # Papers from finished pages are kept; paging resumes at or before where it stopped
+            resume_start = start + len(papers)
+            defer_on_throttle(
+                'arxiv', e,
+                resume=lambda: self._fetch_combined(categories, max_results, resume_start),
+                partial=papers
+            )
+            raise
+
+        for category in categories:
+            self._stage_watermark(
+                category, [paper for paper in papers if category in self._listed_in(paper, categories)]
+            )
+        return [
+            paper for paper in papers
+            if any(is_new(marks.get(category), parse_timestamp(paper.get('published')), paper.get('id'))
+                   for category in self._listed_in(paper, categories))
+        ]
+
+    @staticmethod
+    def _listed_in(paper, categories):
+        """The queried categories a paper is listed in; all of them when the feed does not say."""
+        listed = [category for category in categories if category in (paper.get('categories') or [])]
+        return listed or categories
 
-    def fetch_latest_papers(self, categories=None):
-        if categories:
-            self.categories = categories
-            
+    def _fetch_categories(self, categories, max_results=5):
         papers = []
-        for category in self.categories:
-            query = f"search_query=cat:{category}&sortBy=submittedDate&sortOrder=descending&max_results=5"
-            response = self._make_request(query)
-            papers.extend(self._parse_response(response))
+        for index, category in enumerate(categories):
+            mark = self.watermarks.get('arxiv', category) if self.watermarks else None
+            try:
+                if mark:
+                    category_papers = self._fetch_papers_since(category, mark)
+                else:
+                    query = (f"search_query=cat:{category}&sortBy=submittedDate&sortOrder=descending"
+                             f"&max_results={max_results}")
+                    self._wait_for_interval()
+                    response = self._make_request(query)
+                    category_papers = list(self._parse_response(response))
+            except requests.RequestException as e:
+                # Papers from finished categories are kept; the rest resume after the back-off
+                remaining = categories[index:]
+                defer_on_throttle(
+                    'arxiv', e,
+                    resume=lambda: self._fetch_categories(remaining, max_results),
+                    partial=papers
+                )
+                raise
+
+            self._stage_watermark(category, category_papers)
+            papers.extend(category_papers)
         return papers
 
-    def _make_request(self, query):
-        response = requests.get(self.base_url + query)
+    def _stage_watermark(self, query, papers):
+        if self.watermarks is not None:
+            last_seen, last_ids = newest_mark(
+                papers,
+                lambda paper: parse_timestamp(paper.get('published')),
+                lambda paper: paper.get('id')
+            )
+            self.watermarks.stage('arxiv', query, last_seen, last_ids)
+
+    def _fetch_papers_since(self, category, mark):
+        """Page newest-first through a category until the watermark is reached."""
+        return list(self._page_query(f"cat:{category}", mark, self.MAX_INCREMENTAL_ITEMS, self.PAGE_SIZE))
+
+    def _page_query(self, search_query, mark, limit, page_size, start=0, stream=False):
+        """Yield unique papers for a query newest-first, stopping at the watermark or limit.
+
+        Pages are requested ``REQUEST_INTERVAL`` seconds apart. Papers already
+        yielded are dropped as each page is parsed, since new submissions can
+        shift an entry onto the next page. With ``stream`` each page is parsed
+        entry by entry as it downloads instead of being buffered.
+        """
+        boundary_ids = set(mark['last_ids']) if mark else set()
+        yielded_ids = set()
+        while start < limit:
+            self._wait_for_interval()
+            size = min(page_size, limit - start)
+            query = (f"search_query={search_query}&sortBy=submittedDate&sortOrder=descending"
+                     f"&start={start}&max_results={size}")
+            response = self._make_request(query, stream=stream)
+            page_length = 0
+            for paper in self._parse_response(response):
+                page_length += 1
+                paper_id = paper.get('id')
+                if paper_id in yielded_ids:
+                    continue
+                if mark:
+                    published = parse_timestamp(paper.get('published'))
+                    if published is not None and published < mark['last_seen']:
+                        return
+                    if published == mark['last_seen'] and paper_id in boundary_ids:
+                        continue
+                if paper_id:
+                    yielded_ids.add(paper_id)
+                yield paper
+            if page_length < size:
+                return
+            start += size
+
+    def _wait_for_interval(self):
+        """Keep ``REQUEST_INTERVAL`` seconds between requests, also across calls such as leased batches."""
+        with self._request_lock:
+            if self._last_request is not None:
+                wait = self.REQUEST_INTERVAL - (time.monotonic() - self._last_request)
+                if wait > 0:
+                    time.sleep(wait)
+            self._last_request = time.monotonic()
+
+    def _make_request(self, query, stream=False):
+        """Return the response body, or an iterator over its chunks when streaming.
+
+        Streamed responses bypass the conditional-request cache.
+        """
+        response = self.session.get(self.base_url + query, stream=stream)
         response.raise_for_status()
+        if stream:
+            return self._iter_body(response)
         return response.text
 
+    def _iter_body(self, response):
+        with response:
+            yield from response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+
     def _parse_response(self, response):
-        root = ET.fromstring(response)
-        papers = []
-        for entry in root.findall("{http://www.w3.org/2005/Atom}entry"):
-            title = entry.find("{http://www.w3.org/2005/Atom}title").text
-            summary = entry.find("{http://www.w3.org/2005/Atom}summary").text
-            
-            # Extract paper ID and URL
-            paper_id = None
-            url = None
-            
-            # Find the id element which contains the arxiv ID
-            id_element = entry.find("{http://www.w3.org/2005/Atom}id")
-            if id_element is not None and id_element.text:
-                # Extract the arxiv ID from the URL
-                id_text = id_element.text
-                if "arxiv.org/abs/" in id_text:
-                    paper_id = id_text.split("arxiv.org/abs/")[-1]
-                    url = f"https://arxiv.org/abs/{paper_id}"
-            
-            # Find the direct URL if available
-            links = entry.findall("{http://www.w3.org/2005/Atom}link")
-            for link in links:
-                if link.get("rel") == "alternate" or link.get("title") == "pdf":
-                    url = link.get("href")
-                    break
-            
-            paper = {
-                "title": title, 
-                "summary": summary,
-                "id": paper_id,
-                "url": url
-            }
-            papers.append(paper)
-        return papers
\ No newline at end of file
+        """Lazily parse an Atom feed, given as text or as an iterable of chunks."""
+        return iter_atom_entries(response)
@@ -0,0 +1,221 @@
+import os
+import re
+import html
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from src.utils.http_transport import transport_session
+
+logger = logging.getLogger(__name__)
+
+# One alternation so markdown and HTML are stripped in a single regex pass. Every
+# match becomes a space plus the text worth keeping (link text, inline code); a
+# template replacement avoids a Python callback per match. Line-level markup is
+# anchored on a literal newline (the text is prefixed with one) rather than ^.
+_MARKUP_PATTERN = re.compile(
+    r"```.*?(?:```|\Z)|~~~.*?(?:~~~|\Z)"
+    r"|<!--.*?(?:-->|\Z)"
+    r"|</?[A-Za-z][^>]*>"
+    r"|!\[[^\]]*\]\([^)]*\)"
+    r"|\[(?P<link_text>[^\]]*)\]\([^)]*\)"
+    r"|`(?P<code>[^`\n]*)`"
+    r"|\n[ \t]*(?:\[[^\]\n]+\]:[^\n]*|#{1,6}|>|[-*+](?=[ \t])|\d+\.(?=[ \t])|[-*_|:= \t]{3,}(?=\n|\Z))"
+    r"|https?://\S+"
+    r"|[*~]{1,3}|_{1,3}(?!\w)|\s_{1,3}",
+    re.DOTALL
+)
+_KEEP_TEMPLATE = r" \g<link_text>\g<code> "
+
+
+def markdown_to_text(markdown: str) -> str:
+    """Strip markdown and HTML markup down to plain text."""
+    text = _MARKUP_PATTERN.sub(_KEEP_TEMPLATE, "\n" + markdown)
+    if '&' in text:
+        text = html.unescape(text)
+    return ' '.join(text.split())
+
+
+class ReadmeEnricher:
+    """Fill ``RepoMetadata.readme`` with capped, plain-text README content.
+
+    READMEs are downloaded concurrently, truncated to ``max_bytes`` and
+    cleaned once; the cleaned text is cached by git blob SHA so unchanged
+    READMEs are neither downloaded nor cleaned again. With ``cache_dir`` the
+    cleaned texts are also kept on disk, one file per SHA, so the cache
+    survives restarts; the least recently used files beyond ``cache_size``
+    are removed after each ``enrich``.
+    """
+
+    API_URL = "https://api.github.com"
+
+    def __init__(self, token: Optional[str] = None, session: Optional[requests.Session] = None,
+                 max_bytes: int = 64 * 1024, max_workers: int = 8, cache_size: int = 5000,
+                 api_url: str = API_URL, cache_dir: Optional[str] = None):
+        self.token = token
+        self.session = session or transport_session()
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.api_url = api_url.rstrip('/')
+        self.cache_dir = cache_dir
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.downloads = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def enrich(self, repos: List) -> List:
+        """Set ``readme`` (and ``readme_sha``) on each repo in place and return the list."""
+        if not repos:
+            return repos
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self._enrich_repo, repos))
+        self._trim_disk_cache()
+        logger.info(f"README enrichment stats: {self.stats()}")
+        return repos
+
+    def _enrich_repo(self, repo) -> None:
+        sha = getattr(repo, 'readme_sha', '') or ''
+        cached = self._cache_get(sha) if sha else None
+        if cached is not None:
+            repo.readme = cached
+            return
+
+        try:
+            raw = getattr(repo, 'readme', '') or ''
+            if raw:
+                raw = raw.encode('utf-8')[:self.max_bytes]
+            else:
+                raw = self._download(repo.full_name, sha)
+        except Exception as e:
+            logger.error(f"Error fetching README for {repo.full_name}: {str(e)}")
+            return
+
+        if not sha:
+            # No SHA from the API: key by the content's blob SHA so it is still cleaned only once
+            sha = self._blob_sha(raw)
+            cached = self._cache_get(sha)
+            if cached is not None:
+                repo.readme = cached
+                repo.readme_sha = sha
+                return
+        text = markdown_to_text(raw.decode('utf-8', errors='ignore'))
+
+        repo.readme = text
+        repo.readme_sha = sha
+        self._cache_put(sha, text)
+
+    def _download(self, full_name: str, sha: str):
+        """Stream at most max_bytes of the raw README, by blob SHA when known."""
+        url = (f"{self.api_url}/repos/{full_name}/git/blobs/{sha}" if sha
+               else f"{self.api_url}/repos/{full_name}/readme")
+        headers = {'Accept': 'application/vnd.github.raw'}
+        if self.token:
+            headers['Authorization'] = f"token {self.token}"
+
+        with self.session.get(url, headers=headers, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    break
+        with self._lock:
+            self.downloads += 1
+        return b''.join(chunks)[:self.max_bytes]
+
+    @staticmethod
+    def _blob_sha(raw: bytes) -> str:
+        return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+    def _cache_get(self, sha: str) -> Optional[str]:
+        with self._lock:
+            text = self._cache.get(sha)
+            if text is not None:
+                self._cache.move_to_end(sha)
+                self.hits += 1
+                return text
+        text = self._disk_get(sha)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(sha, text)
+        return text
+
+    def _cache_put(self, sha: str, text: str) -> None:
+        with self._lock:
+            self._remember(sha, text)
+        self._disk_put(sha, text)
+
+    def _remember(self, sha: str, text: str) -> None:
+        """Keep a text in memory, evicting the least recently used; the caller holds the lock."""
+        self._cache[sha] = text
+        self._cache.move_to_end(sha)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _disk_path(self, sha: str) -> Optional[str]:
+        # Blob SHAs are hex, so they are safe file names; anything else stays in memory
+        if not self.cache_dir or not sha.isalnum():
+            return None
+        return os.path.join(self.cache_dir, sha)
+
+    def _disk_get(self, sha: str) -> Optional[str]:
+        path = self._disk_path(sha)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            # The modification time orders files for eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return text
+
+    def _disk_put(self, sha: str, text: str) -> None:
+        path = self._disk_path(sha)
+        if path is None:
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cached README {sha}: {str(e)}")
+
+    def _trim_disk_cache(self) -> None:
+        """Remove the least recently used README files beyond ``cache_size``."""
+        if not self.cache_dir:
+            return
+        try:
+            paths = [entry for entry in os.scandir(self.cache_dir) if entry.is_file() and entry.name.isalnum()]
+            if len(paths) <= self.cache_size:
+                return
+            paths.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in paths[:len(paths) - self.cache_size]:
+                os.remove(entry.path)
+        except OSError as e:
+            logger.warning(f"Could not trim README cache: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'downloads': self.downloads,
+                'cached': len(self._cache)
+            }
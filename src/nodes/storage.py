@@ -1,10 +1,18 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from datetime import datetime, timezone
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import hashlib
 import logging
+import threading
+import json
 import os
+import re
+
+from src.utils.lazy_import import lazy_import
+
+# Loaded on first use, so importing this module does not pay for the driver
+pymongo = lazy_import('pymongo')
+bson = lazy_import('bson')
 
 # Add logger for better debugging
 logger = logging.getLogger(__name__)
@@ -20,12 +28,81 @@ class Summary:
     metadata: Dict[str, Any]
     id: Optional[str] = None
 
+@dataclass
+class StoreReport:
+    """Outcome of a batched write: stored IDs and the documents that failed.
+
+    Each failure names the document's position in the input, its natural
+    key (or title) and the error.
+    """
+    inserted_ids: List[str] = field(default_factory=list)
+    updated_ids: List[str] = field(default_factory=list)
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+
+    def merge(self, other: "StoreReport") -> None:
+        self.inserted_ids.extend(other.inserted_ids)
+        self.updated_ids.extend(other.updated_ids)
+        self.failures.extend(other.failures)
+
+
+def summary_key(source: str, item_id: Optional[str]) -> Optional[str]:
+    """Natural key of an item across cycles, e.g. ``github:owner/repo``.
+
+    arXiv IDs are stored without their version so a revised paper replaces
+    the summary of its earlier version.
+    """
+    if not item_id:
+        return None
+    item_id = str(item_id).strip()
+    if source == 'arxiv':
+        item_id = re.sub(r'v\d+$', '', item_id)
+    return f"{source}:{item_id}"
+
+
+def content_hash(fields: Dict[str, Any]) -> str:
+    """Stable hash of the fields a summary is built from."""
+    encoded = json.dumps(fields, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def paper_content_hash(paper: Dict[str, Any]) -> str:
+    """Content hash of an arXiv paper, alike for the hourly Atom feed and the OAI-PMH backfill.
+
+    The two feeds wrap and indent titles, abstracts and names differently,
+    so whitespace is collapsed before hashing.
+    """
+    def normalized(text: Optional[str]) -> str:
+        return " ".join((text or "").split())
+
+    return content_hash({
+        'title': normalized(paper.get('title')),
+        'summary': normalized(paper.get('summary')),
+        'authors': [normalized(author) for author in paper.get('authors') or []]
+    })
+
+
 class Storage:
-    def __init__(self, db_connection):
+    REQUIRED_FIELDS = ['title', 'content', 'source', 'category']
+    # Index name (as MongoDB names it), field and options
+    INDEXES = [
+        ("date_created_1", "date_created", {}),
+        ("source_1", "source", {}),
+        ("category_1", "category", {}),
+        # One document per item; summaries stored before natural keys existed are left alone
+        ("natural_key_1", "natural_key", {
+            "unique": True,
+            "partialFilterExpression": {"natural_key": {"$exists": True}}
+        }),
+    ]
+
+    def __init__(self, db_connection, bulk_chunk_size: int = 500, index_cache=None):
+        """``index_cache`` (a StartupCache) skips creating indexes already created by an earlier start."""
+        self.bulk_chunk_size = bulk_chunk_size
+        self.index_cache = index_cache
         try:
             if isinstance(db_connection, str):
                 logger.info(f"Connecting to MongoDB using connection string")
-                self.client = MongoClient(db_connection)
+                self.client = pymongo.MongoClient(db_connection)
                 # Use environment variable for DB name instead of hardcoding
                 db_name = os.getenv('DB_NAME', 'aidigest')
                 self.db = self.client[db_name]
@@ -38,34 +115,158 @@ class Storage:
             logger.info(f"Using collection: summaries")
             
             # Create index for better performance
-            self.create_index("date_created")
-            self.create_index("source")
-            self.create_index("category")
+            self.ensure_indexes()
             
-            # Test the connection by performing a simple operation
-            count = self.summaries.count_documents({})
-            logger.info(f"Connected to summaries collection. Document count: {count}")
+            # Test the connection by performing a simple operation; the estimate reads
+            # collection metadata instead of scanning every document
+            count = self.summaries.estimated_document_count()
+            logger.info(f"Connected to summaries collection. Document count (estimated): {count}")
             
         except Exception as e:
             logger.error(f"Error initializing Storage: {str(e)}")
             raise
 
     def store_summary(self, summary_data: Dict[str, Any]) -> str:
-        """Store a new summary in the database."""
+        """Store a summary, replacing the stored one when its natural key is known."""
         try:
-            # Validate required fields
-            required_fields = ['title', 'content', 'source', 'category']
-            if not all(field in summary_data for field in required_fields):
-                raise ValueError("Missing required fields in summary data")
+            self.validate_summary(summary_data)
 
             # Add timestamp using timezone-aware datetime
-            summary_data['date_created'] = datetime.now(timezone.utc)
-            
-            # Insert document
-            result = self.summaries.insert_one(summary_data)
-            return str(result.inserted_id)
+            now = datetime.now(timezone.utc)
+
+            if not summary_data.get('natural_key'):
+                summary_data['date_created'] = now
+                result = self.summaries.insert_one(summary_data)
+                return str(result.inserted_id)
+
+            # Upsert by natural key; the first stored date stays so digests are not rebuilt per cycle
+            query, update = self._upsert(summary_data, now)
+            stored = self.summaries.find_one_and_update(
+                query,
+                update,
+                projection={"_id": 1},
+                upsert=True,
+                return_document=pymongo.ReturnDocument.AFTER
+            )
+            return str(stored['_id'])
         
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+
+    def store_summaries_many(self, summaries: Iterable[Dict[str, Any]],
+                             chunk_size: Optional[int] = None) -> StoreReport:
+        """Store summaries with unordered bulk writes, ``chunk_size`` documents per round trip.
+
+        Keyed summaries are upserted and the rest inserted, as in
+        ``store_summary``. A document that fails validation or its write is
+        reported in the result instead of aborting the batch.
+        """
+        chunk_size = chunk_size or self.bulk_chunk_size
+        report = StoreReport()
+        chunk = []
+        for index, summary_data in enumerate(summaries):
+            try:
+                self.validate_summary(summary_data)
+            except ValueError as e:
+                report.failures.append(self._failure(index, summary_data, str(e)))
+                continue
+            chunk.append((index, summary_data))
+            if len(chunk) >= chunk_size:
+                report.merge(self._write_chunk(chunk))
+                chunk = []
+        if chunk:
+            report.merge(self._write_chunk(chunk))
+        return report
+
+    def _write_chunk(self, chunk) -> StoreReport:
+        now = datetime.now(timezone.utc)
+        operations = []
+        for _, summary_data in chunk:
+            if summary_data.get('natural_key'):
+                operations.append(pymongo.UpdateOne(*self._upsert(summary_data, now), upsert=True))
+            else:
+                summary_data['date_created'] = now
+                summary_data.setdefault('_id', bson.ObjectId())
+                operations.append(pymongo.InsertOne(summary_data))
+
+        report = StoreReport()
+        failed = {}
+        upserted = {}
+        try:
+            result = self.summaries.bulk_write(operations, ordered=False)
+            upserted = dict(result.upserted_ids or {})
+        except pymongo.errors.BulkWriteError as e:
+            failed = {error['index']: error.get('errmsg', '') for error in e.details.get('writeErrors', [])}
+            upserted = {entry['index']: entry['_id'] for entry in e.details.get('upserted', [])}
+        except pymongo.errors.PyMongoError as e:
+            # Nothing is known to have been written; report the whole chunk
+            failed = {position: str(e) for position in range(len(chunk))}
+
+        updated_keys = []
+        for position, (index, summary_data) in enumerate(chunk):
+            if position in failed:
+                report.failures.append(self._failure(index, summary_data, failed[position]))
+            elif position in upserted:
+                report.inserted_ids.append(str(upserted[position]))
+            elif summary_data.get('natural_key'):
+                updated_keys.append(summary_data['natural_key'])
+            else:
+                report.inserted_ids.append(str(summary_data['_id']))
+
+        if updated_keys:
+            try:
+                for document in self.summaries.find({"natural_key": {"$in": updated_keys}}, {"_id": 1}):
+                    report.updated_ids.append(str(document['_id']))
+            except pymongo.errors.PyMongoError as e:
+                logger.warning(f"Could not look up IDs of {len(updated_keys)} updated summaries: {str(e)}")
+        return report
+
+    @staticmethod
+    def _upsert(summary_data: Dict[str, Any], now: datetime):
+        """Query and update that upsert a keyed summary, keeping its first ``date_created``."""
+        document = dict(summary_data)
+        document.pop('date_created', None)
+        document['date_updated'] = now
+        return {"natural_key": document['natural_key']}, {"$set": document, "$setOnInsert": {"date_created": now}}
+
+    @staticmethod
+    def _failure(index: int, summary_data: Dict[str, Any], error: str) -> Dict[str, Any]:
+        return {
+            'index': index,
+            'key': summary_data.get('natural_key') or summary_data.get('title'),
+            'error': error
+        }
+
+    def validate_summary(self, summary_data: Dict[str, Any]) -> None:
+        """Raise ValueError unless the summary has every required field."""
+        if not all(name in summary_data for name in self.REQUIRED_FIELDS):
+            raise ValueError("Missing required fields in summary data")
+
+    def find_by_keys(self, natural_keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """The stored content hash and metrics of each item by natural key, in one query; unstored keys are left out."""
+        natural_keys = list(dict.fromkeys(natural_keys))
+        if not natural_keys:
+            return {}
+        try:
+            cursor = self.summaries.find(
+                {"natural_key": {"$in": natural_keys}},
+                {"natural_key": 1, "content_hash": 1, "metrics": 1}
+            )
+            return {doc["natural_key"]: doc for doc in cursor}
+        
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+
+    def update_by_key(self, natural_key: str, update_data: Dict[str, Any]) -> bool:
+        """Set only the given fields of a stored item."""
+        try:
+            result = self.summaries.update_one(
+                {"natural_key": natural_key},
+                {"$set": dict(update_data, date_updated=datetime.now(timezone.utc))}
+            )
+            return result.modified_count > 0
+        
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Database error: {str(e)}")
 
     def retrieve_summary(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -74,7 +275,7 @@ class Storage:
             cursor = self.summaries.find(query)
             return list(cursor)
         
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Database error: {str(e)}")
 
     def delete_summary(self, summary_id: str) -> bool:
@@ -84,7 +285,7 @@ class Storage:
             result = self.summaries.delete_one({"_id": ObjectId(summary_id)})
             return result.deleted_count > 0
         
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Database error: {str(e)}")
 
     def update_summary(self, summary_id: str, update_data: Dict[str, Any]) -> bool:
@@ -97,7 +298,7 @@ class Storage:
             )
             return result.modified_count > 0
         
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Database error: {str(e)}")
 
     def get_summaries_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
@@ -111,7 +312,7 @@ class Storage:
             }
             return list(self.summaries.find(query).sort("date_created", -1))
         
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Database error: {str(e)}")
 
     def get_summaries_by_category(self, category: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -121,14 +322,29 @@ class Storage:
                 {"category": category}
             ).sort("date_created", -1).limit(limit))
         
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Database error: {str(e)}")
 
-    def create_index(self, field: str):
+    def ensure_indexes(self) -> List[str]:
+        """Create the summaries indexes the index cache does not know about; returns their names."""
+        known = set()
+        cache_key = f"{getattr(self.db, 'name', '')}.summaries"
+        if self.index_cache is not None:
+            known = self.index_cache.known_indexes(cache_key)
+        created = []
+        for name, field_name, options in self.INDEXES:
+            if name not in known:
+                self.create_index(field_name, **options)
+                created.append(name)
+        if created and self.index_cache is not None:
+            self.index_cache.record_indexes(cache_key, created)
+        return created
+
+    def create_index(self, field: str, **options):
         """Create an index on a specific field."""
         try:
-            self.summaries.create_index(field)
-        except PyMongoError as e:
+            self.summaries.create_index(field, **options)
+        except pymongo.errors.PyMongoError as e:
             raise Exception(f"Error creating index: {str(e)}")
 
     def close(self):
@@ -136,5 +352,72 @@ class Storage:
         try:
             if hasattr(self, 'client'):
                 self.client.close()
-        except PyMongoError as e:
-            raise Exception(f"Error closing connection: {str(e)}")
\ No newline at end of file
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Error closing connection: {str(e)}")
+
+
+class SummaryWriter:
+    """Buffers validated summaries and writes them to Storage in bulk.
+
+    A full buffer is written by the ``add`` call that filled it; with
+    ``max_delay`` a partly filled one is written by a timer at most that
+    many seconds after its first summary arrived, so a slow trickle still
+    reaches the database while the cycle runs. ``flush`` writes the rest.
+    Safe to share between threads.
+    """
+
+    def __init__(self, storage: Storage, chunk_size: Optional[int] = None, max_delay: Optional[float] = None):
+        self.storage = storage
+        self.chunk_size = chunk_size or storage.bulk_chunk_size
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        # Signalled when the last write in flight finishes
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._report = StoreReport()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, summary_data: Dict[str, Any]) -> None:
+        self.storage.validate_summary(summary_data)
+        with self._lock:
+            self._buffer.append(summary_data)
+            if len(self._buffer) < self.chunk_size:
+                if self.max_delay is not None and self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self._write_buffer)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self._write_buffer()
+
+    def flush(self) -> StoreReport:
+        """Write buffered summaries and return the report of everything written since the last flush."""
+        self._write_buffer()
+        with self._idle:
+            # Writes started by add or the timer belong to this report too
+            self._idle.wait_for(lambda: self._in_flight == 0)
+            report, self._report = self._report, StoreReport()
+        return report
+
+    def _write_buffer(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not batch:
+                return
+            self._in_flight += 1
+        try:
+            self._write(batch)
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        report = self.storage.store_summaries_many(batch, chunk_size=self.chunk_size)
+        for failure in report.failures:
+            logger.error(f"Failed to store summary {failure['key']}: {failure['error']}")
+        with self._lock:
+            self._report.merge(report)
@@ -1,7 +1,10 @@
-from typing import Dict, List, Set, Any
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Any
 import re
 from dataclasses import dataclass
 from collections import defaultdict
+from functools import lru_cache
+
+from src.nodes.trend_engine import TrendEngine
 
 @dataclass
 class TaggedContent:
@@ -11,8 +14,93 @@ class TaggedContent:
     relevance_scores: Dict[str, float]
     metadata: Dict[str, Any]
 
+# Maps every ASCII character other than a-z to a space, leaving only words
+_WORDS_ONLY = str.maketrans({chr(code): ' ' for code in range(128) if not 'a' <= chr(code) <= 'z'})
+
+
+class KeywordMatcher:
+    """Find which of a set of keywords occur in a text in one pass over it.
+
+    Keywords match whole words only, so 'rl' does not match inside "world"
+    nor 'agent' inside "management", but a plural ("agents", "processes",
+    "policies") or a trailing version number ("gpt4", "llama2") still counts.
+
+    The text is reduced to its set of words once; single-word keywords are
+    then found by one set intersection with their precomputed forms, however
+    many keywords there are. A keyword of several words ('language model',
+    'fine-tuning') is only searched for, with its own compiled regex, when
+    all of its words occur in the text.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(keyword.lower() for keyword in keywords)
+        forms = defaultdict(set)
+        self._phrases = []
+        for keyword in sorted(self.keywords):
+            words = keyword.translate(_WORDS_ONLY).split()
+            if words == [keyword]:
+                for form in self._plural_forms(keyword):
+                    forms[form].add(keyword)
+                continue
+            # Spaces match any whitespace; other characters must be as written
+            spelled = r'\s+'.join(map(re.escape, keyword.split()))
+            ending = r'(?:e?s)?'
+            if self._plural_in_ies(keyword):
+                spelled, ending = spelled[:-1], r'(?:y(?:e?s)?|ies)'
+            self._phrases.append((
+                keyword,
+                frozenset(words[:-1]),
+                self._plural_forms(words[-1]) if words else frozenset(),
+                # No lookbehind: a pattern that starts with a literal is searched for much faster
+                re.compile(rf'{spelled}{ending}(?![a-z])')
+            ))
+        self._forms = {form: frozenset(matched) for form, matched in forms.items()}
+
+    @staticmethod
+    def _plural_forms(word: str) -> FrozenSet[str]:
+        forms = {word, word + 's', word + 'es'}
+        if KeywordMatcher._plural_in_ies(word):
+            forms.add(word[:-1] + 'ies')
+        return frozenset(forms)
+
+    @staticmethod
+    def _plural_in_ies(word: str) -> bool:
+        """Whether a word's plural swaps a final y for -ies: "policy", but not "day"."""
+        return len(word) > 1 and word[-1] == 'y' and word[-2].isalpha() and word[-2] not in 'aeiouy'
+
+    def find(self, text: str) -> Set[str]:
+        """The keywords that occur in ``text``, which must already be lowercase."""
+        present = set(text.translate(_WORDS_ONLY).split())
+        found = set()
+        for form in present & self._forms.keys():
+            found.update(self._forms[form])
+        for keyword, leading, last_forms, pattern in self._phrases:
+            if (keyword not in found and leading <= present
+                    and (not last_forms or not last_forms.isdisjoint(present))
+                    and self._search_phrase(pattern, text)):
+                found.add(keyword)
+        return found
+
+    @staticmethod
+    def _search_phrase(pattern, text: str) -> bool:
+        for match in pattern.finditer(text):
+            start = match.start()
+            if start == 0 or not 'a' <= text[start - 1] <= 'z':
+                return True
+        return False
+
+
+@lru_cache(maxsize=8)
+def keyword_matcher(keywords: FrozenSet[str]) -> KeywordMatcher:
+    """The compiled matcher for a taxonomy's keywords, built once per distinct set."""
+    return KeywordMatcher(keywords)
+
+
 class Tagger:
-    def __init__(self):
+    def __init__(self, trends: Optional[TrendEngine] = None):
+        # Running trends that analyze_trends adds to; without one each call stands alone
+        self.trends = trends
+
         # Define category keywords
         self.category_keywords = {
             'llm': {'language model', 'transformer', 'gpt', 'bert', 'llama', 'nlp'},
@@ -35,15 +123,18 @@ class Tagger:
         try:
             # Extract text content
             text = self._extract_text_content(content)
+
+            # One pass finds every category and tag keyword in the text
+            matched = self._matcher().find(text)
             
             # Get primary category
-            primary_category = self._determine_primary_category(text)
+            primary_category = self._determine_primary_category(matched)
             
             # Generate tags
-            tags = self._generate_tags(text, content.get('metadata', {}))
+            tags = self._generate_tags(matched, content.get('metadata', {}))
             
             # Calculate relevance scores
-            relevance_scores = self._calculate_relevance_scores(text)
+            relevance_scores = self._calculate_relevance_scores(text, matched)
             
             return TaggedContent(
                 content_id=content.get('id', ''),
@@ -65,29 +156,35 @@ class Tagger:
         ]
         return ' '.join(str(field).lower() for field in text_fields if field)
 
-    def _determine_primary_category(self, text: str) -> str:
+    def _matcher(self) -> KeywordMatcher:
+        """Matcher over both taxonomies; rebuilt only if their keywords change."""
+        keywords = set()
+        for groups in (self.category_keywords, self.common_tags):
+            for group_keywords in groups.values():
+                keywords.update(group_keywords)
+        return keyword_matcher(frozenset(keywords))
+
+    def _determine_primary_category(self, matched: Set[str]) -> str:
         """Determine the primary category based on keyword matches."""
         category_scores = defaultdict(int)
         
         for category, keywords in self.category_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    category_scores[category] += 1
+            hits = len(keywords & matched)
+            if hits:
+                category_scores[category] += hits
         
         if not category_scores:
             return 'uncategorized'
         
         return max(category_scores.items(), key=lambda x: x[1])[0]
 
-    def _generate_tags(self, text: str, metadata: Dict[str, Any]) -> Set[str]:
+    def _generate_tags(self, matched: Set[str], metadata: Dict[str, Any]) -> Set[str]:
         """Generate tags based on content analysis and metadata."""
         tags = set()
         
         # Add tags based on common tag categories
         for category, keywords in self.common_tags.items():
-            for keyword in keywords:
-                if keyword in text:
-                    tags.add(keyword)
+            tags.update(keywords & matched)
         
         # Add tags from metadata
         if 'topics' in metadata:
@@ -97,15 +194,14 @@ class Tagger:
             
         return tags
 
-    def _calculate_relevance_scores(self, text: str) -> Dict[str, float]:
+    def _calculate_relevance_scores(self, text: str, matched: Set[str]) -> Dict[str, float]:
         """Calculate relevance scores for different aspects."""
         scores = {}
         total_words = len(text.split())
         
         # Calculate scores for each category
         for category, keywords in self.category_keywords.items():
-            category_matches = sum(1 for keyword in keywords if keyword in text)
-            scores[category] = min(1.0, category_matches / len(keywords))
+            scores[category] = min(1.0, len(keywords & matched) / len(keywords))
         
         # Add content quality score based on length and keyword density
         scores['content_quality'] = min(1.0, total_words / 1000)  # Normalize by 1000 words
@@ -113,20 +209,12 @@ class Tagger:
         return scores
 
     def analyze_trends(self, tagged_items: List[TaggedContent]) -> Dict[str, Any]:
-        """Analyze trends in tagged content."""
-        trend_analysis = {
-            'popular_categories': defaultdict(int),
-            'trending_tags': defaultdict(int),
-            'emerging_topics': set()
-        }
-        
-        for item in tagged_items:
-            trend_analysis['popular_categories'][item.primary_category] += 1
-            for tag in item.tags:
-                trend_analysis['trending_tags'][tag] += 1
-        
-        return {
-            'popular_categories': dict(trend_analysis['popular_categories']),
-            'trending_tags': dict(trend_analysis['trending_tags']),
-            'emerging_topics': list(trend_analysis['emerging_topics'])
-        }
\ No newline at end of file
+        """Add newly tagged items to the trends and return the current window's view.
+
+        Only the new items are counted; earlier ones are already in the
+        tagger's TrendEngine, which also supplies the baseline that
+        ``emerging_topics`` is measured against.
+        """
+        trends = self.trends if self.trends is not None else TrendEngine()
+        trends.observe_many(tagged_items)
+        return trends.analyze()
@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class SpaceSaving:
+    """Approximate counts of the most frequent keys in bounded memory.
+
+    The Space-Saving algorithm (Metwally et al.): at most ``capacity`` keys
+    are counted. A new key evicts the least counted one and inherits its
+    count, which is remembered as the new key's possible overcount, so
+    counts are never underestimated and every key seen more often than
+    total / capacity is kept.
+    """
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, key: str, count: int = 1) -> None:
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            evicted = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(evicted)
+            del self.errors[evicted]
+            self.counts[key] = floor + count
+            self.errors[key] = floor
+
+    def estimate(self, key: str) -> int:
+        return self.counts.get(key, 0)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'counts': self.counts, 'errors': self.errors}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], capacity: int) -> 'SpaceSaving':
+        sketch = cls(capacity)
+        sketch.counts = dict(data.get('counts', {}))
+        sketch.errors = {key: data.get('errors', {}).get(key, 0) for key in sketch.counts}
+        return sketch
+
+
+@dataclass
+class TrendBucket:
+    """Items, categories and tags seen during one hour or one day."""
+    start: int
+    items: int = 0
+    categories: Counter = field(default_factory=Counter)
+    tags: SpaceSaving = field(default_factory=SpaceSaving)
+
+
+class TrendEngine:
+    """Incremental tag and category trends over hourly and daily buckets.
+
+    Tagged items are counted into the bucket of the hour and of the day they
+    were observed in; the last ``hourly_buckets`` hours and ``daily_buckets``
+    days are kept. Tag counts per bucket are Space-Saving sketches of
+    ``tag_capacity`` keys, so the long tail of rare tags costs bounded memory.
+
+    The current window is the last ``window_hours`` hours. A tag is emerging
+    when it appears in at least ``min_count`` items of the window and its
+    share of the window's items is ``min_ratio`` times its share over the
+    ``baseline_days`` full days before the window (add-one smoothed, so a
+    brand-new tag has a finite baseline). Nothing is emerging until there is
+    a baseline day to compare with.
+
+    With a ``path`` the state is loaded on start and written by ``save()``,
+    so a restart does not need to recount stored summaries.
+    """
+
+    def __init__(self, path: Optional[str] = None, hourly_buckets: int = 48, daily_buckets: int = 30,
+                 tag_capacity: int = 500, window_hours: int = 24, baseline_days: int = 7,
+                 min_count: int = 3, min_ratio: float = 2.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.hourly_buckets = hourly_buckets
+        self.daily_buckets = daily_buckets
+        self.tag_capacity = tag_capacity
+        self.window_hours = window_hours
+        self.baseline_days = baseline_days
+        self.min_count = min_count
+        self.min_ratio = min_ratio
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hourly: "OrderedDict[int, TrendBucket]" = OrderedDict()
+        self._daily: "OrderedDict[int, TrendBucket]" = OrderedDict()
+        self.started = clock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def observe(self, tagged, at: Optional[float] = None) -> None:
+        """Count one TaggedContent, observed at ``at`` (now by default)."""
+        at = self._clock() if at is None else at
+        with self._lock:
+            for series, size, keep in ((self._hourly, HOUR, self.hourly_buckets),
+                                       (self._daily, DAY, self.daily_buckets)):
+                start = int(at // size * size)
+                bucket = series.get(start)
+                if bucket is None:
+                    bucket = series[start] = TrendBucket(start, tags=SpaceSaving(self.tag_capacity))
+                    self._expire(series, start - (keep - 1) * size)
+                bucket.items += 1
+                bucket.categories[tagged.primary_category] += 1
+                for tag in tagged.tags:
+                    bucket.tags.add(tag)
+
+    def observe_many(self, tagged_items: Iterable, at: Optional[float] = None) -> None:
+        for tagged in tagged_items:
+            self.observe(tagged, at)
+
+    @staticmethod
+    def _expire(series: "OrderedDict[int, TrendBucket]", oldest: int) -> None:
+        for start in [start for start in series if start < oldest]:
+            del series[start]
+
+    @staticmethod
+    def _totals(buckets: List[TrendBucket]) -> Tuple[int, Counter, Counter]:
+        items, categories, tags = 0, Counter(), Counter()
+        for bucket in buckets:
+            items += bucket.items
+            categories.update(bucket.categories)
+            tags.update(bucket.tags.counts)
+        return items, categories, tags
+
+    def emerging(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Emerging tags with their window and baseline counts, strongest lift first."""
+        now = self._clock() if now is None else now
+        window_start = now - self.window_hours * HOUR
+        # Baseline days end where the day holding the window start begins
+        baseline_end = int(window_start // DAY * DAY)
+        baseline_start = max(baseline_end - self.baseline_days * DAY, int(self.started // DAY * DAY))
+        with self._lock:
+            window_items, _, window_tags = self._totals(
+                [bucket for start, bucket in self._hourly.items() if window_start <= start <= now]
+            )
+            baseline_items, _, baseline_tags = self._totals(
+                [bucket for start, bucket in self._daily.items() if baseline_start <= start < baseline_end]
+            )
+        if not window_items or baseline_end <= baseline_start:
+            return []
+
+        emerging = []
+        for tag, count in window_tags.items():
+            if count < self.min_count:
+                continue
+            share = count / window_items
+            baseline_share = (baseline_tags.get(tag, 0) + 1) / (baseline_items + 1)
+            lift = share / baseline_share
+            if lift >= self.min_ratio:
+                emerging.append({'tag': tag, 'count': count, 'baseline_count': baseline_tags.get(tag, 0),
+                                 'lift': round(lift, 2)})
+        return sorted(emerging, key=lambda topic: (-topic['lift'], topic['tag']))
+
+    def analyze(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Category and tag counts of the current window and its emerging topics."""
+        now = self._clock() if now is None else now
+        window_start = now - self.window_hours * HOUR
+        with self._lock:
+            _, categories, tags = self._totals(
+                [bucket for start, bucket in self._hourly.items() if window_start <= start <= now]
+            )
+        return {
+            'popular_categories': dict(categories),
+            'trending_tags': dict(tags),
+            'emerging_topics': [topic['tag'] for topic in self.emerging(now)]
+        }
+
+    def save(self) -> None:
+        """Write the buckets to ``path`` so the next start picks up from here."""
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                'started': self.started,
+                'hourly': [self._bucket_to_dict(bucket) for bucket in self._hourly.values()],
+                'daily': [self._bucket_to_dict(bucket) for bucket in self._daily.values()]
+            }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write trend state: {str(e)}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.started = state.get('started', self.started)
+            for series, key in ((self._hourly, 'hourly'), (self._daily, 'daily')):
+                for data in state.get(key, []):
+                    series[data['start']] = TrendBucket(
+                        start=data['start'],
+                        items=data['items'],
+                        categories=Counter(data['categories']),
+                        tags=SpaceSaving.from_dict(data['tags'], self.tag_capacity)
+                    )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable trend state: {str(e)}")
+            self._hourly.clear()
+            self._daily.clear()
+
+    @staticmethod
+    def _bucket_to_dict(bucket: TrendBucket) -> Dict[str, Any]:
+        return {'start': bucket.start, 'items': bucket.items,
+                'categories': dict(bucket.categories), 'tags': bucket.tags.to_dict()}
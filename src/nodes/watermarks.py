@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timezone
+import logging
+import threading
+
+from src.utils.lazy_import import lazy_import
+
+pymongo = lazy_import('pymongo')
+
+logger = logging.getLogger(__name__)
+
+
+class WatermarkStore:
+    """Per-source, per-query high-water marks for incremental fetching.
+
+    Fetchers stage the newest timestamp and IDs they saw; the marks are only
+    written by ``commit()`` once the cycle has processed those items, so a
+    crash mid-cycle never skips data.
+    """
+
+    MAX_BOUNDARY_IDS = 200
+
+    def __init__(self, db_connection, collection_name: str = "fetch_watermarks", index_cache=None):
+        try:
+            self.collection = db_connection[collection_name]
+            cache_key = f"{getattr(db_connection, 'name', '')}.{collection_name}"
+            if index_cache is None or "source_1_query_1" not in index_cache.known_indexes(cache_key):
+                self.collection.create_index([("source", 1), ("query", 1)], unique=True)
+                if index_cache is not None:
+                    index_cache.record_indexes(cache_key, ["source_1_query_1"])
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Error initializing watermark store: {str(e)}")
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str, query: str) -> Optional[Dict[str, Any]]:
+        """Return ``{'last_seen': datetime, 'last_ids': [...]}`` or None on first run."""
+        try:
+            doc = self.collection.find_one({"source": source, "query": query})
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+        if not doc:
+            return None
+        last_seen = doc.get("last_seen")
+        if isinstance(last_seen, datetime) and last_seen.tzinfo is None:
+            # MongoDB hands back naive UTC datetimes
+            last_seen = last_seen.replace(tzinfo=timezone.utc)
+        return {"last_seen": last_seen, "last_ids": doc.get("last_ids", [])}
+
+    def stage(self, source: str, query: str, last_seen: Optional[datetime], last_ids: List[str]) -> None:
+        """Remember a new mark for ``commit()``; older marks never replace newer ones."""
+        if last_seen is None:
+            return
+        key = (source, query)
+        with self._lock:
+            current = self._pending.get(key)
+            if current and current["last_seen"] > last_seen:
+                return
+            if current and current["last_seen"] == last_seen:
+                last_ids = list(dict.fromkeys(current["last_ids"] + list(last_ids)))
+            self._pending[key] = {
+                "last_seen": last_seen,
+                "last_ids": list(last_ids)[:self.MAX_BOUNDARY_IDS]
+            }
+
+    def commit(self, source: Optional[str] = None) -> int:
+        """Persist staged marks, optionally for one source only. Returns the number written."""
+        with self._lock:
+            if source is None:
+                pending, self._pending = self._pending, {}
+            else:
+                pending = {key: mark for key, mark in self._pending.items() if key[0] == source}
+                for key in pending:
+                    del self._pending[key]
+        try:
+            for (mark_source, query), mark in pending.items():
+                self.collection.update_one(
+                    {"source": mark_source, "query": query},
+                    {"$set": {
+                        "last_seen": mark["last_seen"],
+                        "last_ids": mark["last_ids"],
+                        "updated_at": datetime.now(timezone.utc)
+                    }},
+                    upsert=True
+                )
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+        if pending:
+            logger.info(f"Committed {len(pending)} fetch watermarks")
+        return len(pending)
+
+    def discard(self, source: Optional[str] = None) -> None:
+        """Drop staged marks, optionally for one source only, e.g. after a failed fetch."""
+        with self._lock:
+            if source is None:
+                self._pending = {}
+            else:
+                self._pending = {key: mark for key, mark in self._pending.items() if key[0] != source}
+
+
+def newest_mark(items: List[Any], timestamp, identifier) -> Tuple[Optional[datetime], List[str]]:
+    """Return the newest timestamp among items and the IDs sharing it."""
+    newest = None
+    ids: List[str] = []
+    for item in items:
+        seen = timestamp(item)
+        if seen is None:
+            continue
+        if newest is None or seen > newest:
+            newest, ids = seen, [identifier(item)]
+        elif seen == newest:
+            ids.append(identifier(item))
+    return newest, ids
+
+
+def oldest_mark(marks: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """The mark a query covering several watermarked units can stop at: the oldest one.
+
+    None when any unit has no mark yet, since that unit must be fetched in full.
+    """
+    if not marks or any(not mark or mark.get("last_seen") is None for mark in marks):
+        return None
+    last_seen = min(mark["last_seen"] for mark in marks)
+    last_ids = [item_id for mark in marks if mark["last_seen"] == last_seen for item_id in mark["last_ids"]]
+    return {"last_seen": last_seen, "last_ids": list(dict.fromkeys(last_ids))}
+
+
+def is_new(mark: Optional[Dict[str, Any]], seen: Optional[datetime], item_id: Optional[str]) -> bool:
+    """Whether an item is past a unit's mark: newer than it, or as new and not among its IDs."""
+    if not mark or seen is None:
+        return True
+    return seen > mark["last_seen"] or (seen == mark["last_seen"] and item_id not in mark["last_ids"])
@@ -0,0 +1,165 @@
+import os
+import uuid
+import socket
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, List, Optional
+
+from src.utils.lazy_import import lazy_import
+
+pymongo = lazy_import('pymongo')
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLeases:
+    """Split a cycle's work units between agent processes through MongoDB leases.
+
+    A unit (a GitHub search query, an arXiv category, ...) is claimed for one
+    cycle window by inserting ``<source>:<window>:<unit>``; the unique
+    ``_id`` lets exactly one process win. Held leases are extended by a
+    heartbeat thread while their items are fetched and processed, and are
+    marked done once the source's watermarks are committed. A lease whose
+    holder crashed expires after ``lease_seconds`` and can be claimed again.
+    """
+
+    def __init__(self, db_connection, owner: Optional[str] = None, lease_seconds: float = 300,
+                 heartbeat_seconds: Optional[float] = None, collection_name: str = "work_leases",
+                 retention: timedelta = timedelta(days=7),
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc), index_cache=None):
+        try:
+            self.collection = db_connection[collection_name]
+            cache_key = f"{getattr(db_connection, 'name', '')}.{collection_name}"
+            if index_cache is None or "purge_at_1" not in index_cache.known_indexes(cache_key):
+                # Finished windows are purged by MongoDB's TTL monitor
+                self.collection.create_index("purge_at", expireAfterSeconds=0)
+                if index_cache is not None:
+                    index_cache.record_indexes(cache_key, ["purge_at_1"])
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Error initializing work leases: {str(e)}")
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or lease_seconds / 3
+        self.retention = retention
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._held: Dict[str, str] = {}  # lease id -> source
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def claim(self, source: str, window: int, units: List[str], limit: Optional[int] = None) -> List[str]:
+        """Claim up to ``limit`` units of a source's window that no live lease holds."""
+        claimed = []
+        for unit in units:
+            if limit is not None and len(claimed) >= limit:
+                break
+            lease_id = f"{source}:{window}:{unit}"
+            with self._lock:
+                if lease_id in self._held:
+                    continue
+            if self._claim_one(lease_id, source, window, unit):
+                with self._lock:
+                    self._held[lease_id] = source
+                claimed.append(unit)
+        if claimed:
+            logger.info(f"{self.owner} claimed {source} units {claimed} for window {window}")
+            self._start_heartbeat()
+        return claimed
+
+    def _claim_one(self, lease_id: str, source: str, window: int, unit: str) -> bool:
+        now = self._clock()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        try:
+            self.collection.insert_one({
+                '_id': lease_id,
+                'source': source,
+                'window': window,
+                'unit': unit,
+                'owner': self.owner,
+                'status': 'leased',
+                'expires_at': expires_at,
+                'purge_at': now + self.retention,
+                'attempts': 1
+            })
+            return True
+        except pymongo.errors.DuplicateKeyError:
+            pass
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+
+        # Taken before; reclaim it only if its holder stopped renewing it
+        try:
+            taken = self.collection.find_one_and_update(
+                {'_id': lease_id, 'status': 'leased', 'expires_at': {'$lt': now}},
+                {'$set': {'owner': self.owner, 'expires_at': expires_at}, '$inc': {'attempts': 1}}
+            )
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+        if taken is not None:
+            logger.warning(f"Reclaimed expired lease {lease_id} from {taken.get('owner')}")
+        return taken is not None
+
+    def complete(self, source: str) -> int:
+        """Mark every lease held for a source as done; returns how many."""
+        return self._finish(source, {'status': 'done'})
+
+    def release(self, source: str) -> int:
+        """Give up a source's leases so any process can claim them right away."""
+        return self._finish(source, {})
+
+    def _finish(self, source: str, fields: Dict) -> int:
+        with self._lock:
+            lease_ids = [lease_id for lease_id, held_source in self._held.items() if held_source == source]
+            for lease_id in lease_ids:
+                del self._held[lease_id]
+        if not lease_ids:
+            return 0
+        try:
+            result = self.collection.update_many(
+                {'_id': {'$in': lease_ids}, 'owner': self.owner},
+                {'$set': dict(fields, expires_at=self._clock())}
+            )
+        except pymongo.errors.PyMongoError as e:
+            raise Exception(f"Database error: {str(e)}")
+        return result.modified_count
+
+    def held(self) -> List[str]:
+        with self._lock:
+            return list(self._held)
+
+    def heartbeat(self) -> int:
+        """Extend every held lease; returns how many were still ours."""
+        lease_ids = self.held()
+        if not lease_ids:
+            return 0
+        try:
+            result = self.collection.update_many(
+                {'_id': {'$in': lease_ids}, 'owner': self.owner, 'status': 'leased'},
+                {'$set': {'expires_at': self._clock() + timedelta(seconds=self.lease_seconds)}}
+            )
+        except pymongo.errors.PyMongoError as e:
+            logger.warning(f"Lease heartbeat failed: {str(e)}")
+            return 0
+        if result.matched_count < len(lease_ids):
+            logger.warning(f"{len(lease_ids) - result.matched_count} leases of {self.owner} expired and were taken over")
+        return result.matched_count
+
+    def _start_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(target=self._beat, name="lease-heartbeat", daemon=True)
+            self._heartbeat.start()
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.heartbeat_seconds):
+            self.heartbeat()
+
+    def close(self) -> None:
+        """Stop the heartbeat and release whatever is still held."""
+        self._stop.set()
+        with self._lock:
+            sources = set(self._held.values())
+        for source in sources:
+            self.release(source)
@@ -0,0 +1,105 @@
+import os
+import sys
+import logging
+import argparse
+from datetime import date, timedelta
+from dotenv import load_dotenv
+
+# Add project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.nodes.arxiv_backfill import ARXIV_OAI_URL, ArxivBackfill, ArxivOAIHarvester, BackfillCheckpoint
+from src.nodes.storage import summary_key, paper_content_hash
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETS = ["cs", "stat.ML"]
+
+
+def build_summary(paper, summarizer, tagger):
+    """Summarize and tag a harvested paper into a summaries document."""
+    summary = summarizer.summarize_paper(paper)
+    tagged = tagger.tag_content({
+        'id': paper['title'],
+        'title': paper['title'],
+        'description': paper['summary'],
+        'metadata': {'source': 'arxiv'}
+    })
+    return {
+        'title': summary.title,
+        'content': summary.content,
+        'source': 'arxiv',
+        'category': tagged.primary_category,
+        'tags': list(tagged.tags),
+        'url': paper.get('url'),
+        'metadata': tagged.metadata,
+        # Same natural key and hash as the hourly cycle, so a backfilled paper is not stored twice
+        'natural_key': summary_key('arxiv', paper.get('id')),
+        'content_hash': paper_content_hash(paper),
+        'metrics': {}
+    }
+
+
+def make_batch_processor(summarizer, tagger, storage):
+    def process_batch(papers):
+        summaries = []
+        for paper in papers:
+            try:
+                summaries.append(build_summary(paper, summarizer, tagger))
+            except Exception as e:
+                logger.error(f"Error processing paper {paper.get('id')}: {str(e)}")
+        report = storage.store_summaries_many(summaries)
+        for failure in report.failures:
+            logger.error(f"Error storing paper {failure['key']}: {failure['error']}")
+        stored = len(report.inserted_ids) + len(report.updated_ids)
+        logger.info(f"Stored {stored}/{len(papers)} papers from batch")
+    return process_batch
+
+
+def parse_args(argv=None):
+    yesterday = date.today() - timedelta(days=1)
+    parser = argparse.ArgumentParser(description="Backfill arXiv summaries for a date range over OAI-PMH.")
+    parser.add_argument('--from', dest='from_date', required=True, help="First datestamp, YYYY-MM-DD")
+    parser.add_argument('--until', dest='until_date', default=yesterday.isoformat(),
+                        help="Last datestamp, YYYY-MM-DD (default: yesterday)")
+    parser.add_argument('--set', dest='sets', action='append',
+                        help="OAI set or category to harvest; repeatable (default: cs, stat.ML)")
+    parser.add_argument('--batch-size', type=int, default=500, help="Papers per Summarizer/Storage batch")
+    parser.add_argument('--endpoint', default=os.getenv('ARXIV_OAI_URL', ARXIV_OAI_URL))
+    parser.add_argument('--checkpoint', default=None,
+                        help="Checkpoint file (default: .cache/backfill/arxiv-<from>-<until>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run an arXiv backfill, resuming from its checkpoint if one exists."""
+    load_dotenv()
+    args = parse_args(argv)
+    checkpoint_path = args.checkpoint or os.path.join(
+        project_root, '.cache', 'backfill', f"arxiv-{args.from_date}-{args.until_date}.json"
+    )
+
+    from src.utils.db_config import get_db_config
+    from src.nodes.storage import Storage
+    from src.nodes.summarizer import Summarizer
+    from src.nodes.tagger import Tagger
+
+    storage = Storage(get_db_config().db)
+    backfill = ArxivBackfill(
+        ArxivOAIHarvester(args.endpoint),
+        BackfillCheckpoint(checkpoint_path),
+        make_batch_processor(Summarizer(), Tagger(), storage),
+        batch_size=args.batch_size
+    )
+    processed = backfill.run(args.from_date, args.until_date, args.sets or DEFAULT_SETS)
+    logger.info(f"Backfill completed: {processed}")
+    return processed
+
+
+if __name__ == "__main__":
+    main()
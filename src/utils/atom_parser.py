@@ -0,0 +1,93 @@
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, Union
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+# Qualified tag names are built once instead of for every entry
+ENTRY = ATOM_NS + "entry"
+TITLE = ATOM_NS + "title"
+SUMMARY = ATOM_NS + "summary"
+ID = ATOM_NS + "id"
+LINK = ATOM_NS + "link"
+AUTHOR = ATOM_NS + "author"
+NAME = ATOM_NS + "name"
+CATEGORY = ATOM_NS + "category"
+PUBLISHED = ATOM_NS + "published"
+UPDATED = ATOM_NS + "updated"
+PRIMARY_CATEGORY = ARXIV_NS + "primary_category"
+
+Chunk = Union[str, bytes]
+
+
+def iter_atom_entries(source: Union[Chunk, Iterable[Chunk]]) -> Iterator[Dict]:
+    """Yield one paper dict per Atom ``<entry>`` as soon as the entry closes.
+
+    ``source`` is a whole document or an iterable of chunks, such as
+    ``response.iter_content()``. Each finished entry is dropped from the tree
+    so memory stays bounded by a single entry, whatever the feed size.
+    """
+    if isinstance(source, (str, bytes)):
+        source = [source]
+
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    for chunk in source:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if root is None:
+                root = element
+            if event == 'end' and element.tag == ENTRY:
+                yield entry_to_paper(element)
+                root.clear()
+    parser.close()
+    for event, element in parser.read_events():
+        if event == 'end' and element.tag == ENTRY:
+            yield entry_to_paper(element)
+
+
+def entry_to_paper(entry: ET.Element) -> Dict:
+    """Convert an arXiv Atom entry element to a paper dict in one pass over its children."""
+    paper = {
+        "title": None,
+        "summary": None,
+        "id": None,
+        "url": None,
+        "published": None,
+        "updated": None,
+        "authors": [],
+        "categories": [],
+        "primary_category": None
+    }
+    link_url = None
+    for child in entry:
+        tag = child.tag
+        if tag == TITLE:
+            paper["title"] = child.text
+        elif tag == SUMMARY:
+            paper["summary"] = child.text
+        elif tag == ID:
+            # Extract the arxiv ID from the abs URL
+            if child.text and "arxiv.org/abs/" in child.text:
+                paper["id"] = child.text.split("arxiv.org/abs/")[-1]
+                paper["url"] = f"https://arxiv.org/abs/{paper['id']}"
+        elif tag == LINK:
+            if link_url is None and (child.get("rel") == "alternate" or child.get("title") == "pdf"):
+                link_url = child.get("href")
+        elif tag == AUTHOR:
+            name = child.findtext(NAME)
+            if name:
+                paper["authors"].append(name)
+        elif tag == CATEGORY:
+            term = child.get("term")
+            if term:
+                paper["categories"].append(term)
+        elif tag == PRIMARY_CATEGORY:
+            paper["primary_category"] = child.get("term")
+        elif tag == PUBLISHED:
+            paper["published"] = child.text
+        elif tag == UPDATED:
+            paper["updated"] = child.text
+    if link_url:
+        paper["url"] = link_url
+    return paper
@@ -0,0 +1,125 @@
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceCadence:
+    """How often a source is fetched.
+
+    ``anchor`` pins runs to fixed wall-clock slots (``anchor + k * interval``
+    seconds since the epoch), e.g. just after arXiv's daily listing. A source
+    whose runs keep finding nothing waits up to ``max_backoff`` intervals.
+    """
+    source: str
+    interval: float
+    anchor: Optional[float] = None
+    max_backoff: float = 4
+
+    def window(self, now: float) -> int:
+        """Index of the cadence slot containing ``now``; the same on every process."""
+        return int(math.floor((now - (self.anchor or 0)) / self.interval))
+
+
+@dataclass
+class _CadenceState:
+    next_due: float
+    multiplier: float = 1
+    idle_runs: int = 0
+
+
+class CadenceScheduler:
+    """Run discovery cycles for whichever sources are due, one cycle at a time.
+
+    Each source is due on its own cadence. The next run is counted from
+    when the last run was due, not from when it finished, so cycle time does
+    not make the schedule drift; slots missed while a cycle overran are
+    skipped rather than run back to back. A run that finds nothing new
+    doubles the source's interval up to its ``max_backoff``, and one that
+    finds something restores it. A failed run is retried after
+    ``retry_delay`` seconds.
+    """
+
+    def __init__(self, cadences: List[SourceCadence], retry_delay: float = 300,
+                 clock: Callable[[], float] = time.time):
+        self.cadences = {cadence.source: cadence for cadence in cadences}
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._stop = threading.Event()
+        now = clock()
+        # Every source runs once at startup
+        self._state = {source: _CadenceState(next_due=now) for source in self.cadences}
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        now = self._clock() if now is None else now
+        return [source for source, state in self._state.items() if state.next_due <= now]
+
+    def seconds_until_due(self, now: Optional[float] = None) -> float:
+        now = self._clock() if now is None else now
+        return max(0.0, min(state.next_due for state in self._state.values()) - now)
+
+    def record(self, source: str, new_items: Optional[int], now: Optional[float] = None) -> None:
+        """Schedule a source's next run after one that found ``new_items`` (None if it failed)."""
+        now = self._clock() if now is None else now
+        cadence = self.cadences[source]
+        state = self._state[source]
+
+        if new_items is None:
+            state.next_due = now + min(self.retry_delay, cadence.interval)
+            return
+
+        if new_items:
+            state.multiplier = 1
+            state.idle_runs = 0
+        else:
+            state.idle_runs += 1
+            state.multiplier = min(state.multiplier * 2, cadence.max_backoff)
+
+        step = cadence.interval * state.multiplier
+        if cadence.anchor is not None:
+            # Next wall-clock slot after now
+            slots = math.floor((now - cadence.anchor) / step) + 1
+            state.next_due = cadence.anchor + slots * step
+            return
+
+        next_due = state.next_due + step
+        if next_due <= now:
+            next_due += (math.floor((now - next_due) / step) + 1) * step
+        state.next_due = next_due
+
+    def run(self, cycle: Callable[[List[str]], Dict[str, Optional[int]]]) -> None:
+        """Call ``cycle`` with the due sources until ``stop`` is called.
+
+        ``cycle`` returns the number of new items per source, or None for a
+        source whose run failed.
+        """
+        while not self._stop.is_set():
+            sources = self.due()
+            if sources:
+                started = self._clock()
+                try:
+                    results = cycle(sources)
+                except Exception as e:
+                    logger.error(f"Error in discovery cycle: {str(e)}")
+                    results = {}
+                for source in sources:
+                    self.record(source, results.get(source))
+                logger.info(f"Cycle for {', '.join(sources)} took {self._clock() - started:.1f}s; "
+                            f"next runs: {self.schedule()}")
+            self._stop.wait(self.seconds_until_due())
+
+    def schedule(self) -> Dict[str, str]:
+        """Seconds until each source is due and its current backoff, for logging."""
+        now = self._clock()
+        return {
+            source: f"in {max(0.0, state.next_due - now):.0f}s (x{state.multiplier:g})"
+            for source, state in self._state.items()
+        }
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,138 @@
+import os
+import json
+import uuid
+import logging
+import threading
+from dataclasses import is_dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stages after which an item needs no more work
+FINAL_STAGES = ('stored', 'skipped')
+
+
+class CycleJournal:
+    """Append-only record of one discovery cycle, kept in a local spool file.
+
+    Every fetched payload is written to ``<cycle_id>.jsonl`` before it is
+    processed, followed by a line for each stage it reaches (summarized,
+    tagged, stored, or skipped as unchanged). A journal whose cycle ends is
+    deleted, so any file left in ``directory`` belongs to a cycle that died
+    part way through; ``incomplete()`` loads those and ``unfinished()``
+    returns the payloads that still have to be stored, with no new fetches.
+
+    Dataclass payloads are rebuilt from ``payload_types`` by class name.
+    """
+
+    def __init__(self, directory: str, cycle_id: Optional[str] = None, sources: Optional[List[str]] = None,
+                 payload_types: Optional[Dict[str, type]] = None):
+        self.directory = directory
+        self.cycle_id = cycle_id or f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.path = os.path.join(directory, f"{self.cycle_id}.jsonl")
+        self.payload_types = payload_types or {}
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        self._items: Dict[int, Tuple[str, Any]] = {}
+        self._stages: Dict[int, str] = {}
+        self._file = None
+        if sources is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._write({'cycle_id': self.cycle_id, 'sources': sources,
+                         'started_at': datetime.now(timezone.utc).isoformat()})
+
+    @classmethod
+    def incomplete(cls, directory: str, payload_types: Optional[Dict[str, type]] = None) -> List['CycleJournal']:
+        """Journals of cycles that did not finish, oldest first."""
+        if not os.path.isdir(directory):
+            return []
+        journals = []
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.jsonl'):
+                journal = cls(directory, cycle_id=name[:-len('.jsonl')], payload_types=payload_types)
+                journal._load()
+                journals.append(journal)
+        return journals
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line, object_hook=self._decode)
+                except ValueError:
+                    # The last line may be cut short by the crash
+                    logger.warning(f"Skipping unreadable line in cycle journal {self.cycle_id}")
+                    continue
+                if 'payload' in record:
+                    self._items[record['seq']] = (record['source'], record['payload'])
+                    self._next_seq = max(self._next_seq, record['seq'] + 1)
+                elif 'stage' in record:
+                    self._stages[record['seq']] = record['stage']
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def record_fetched(self, source: str, payload: Any) -> int:
+        """Spool a fetched payload; returns its sequence number in this cycle."""
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._items[seq] = (source, payload)
+            self._write({'seq': seq, 'source': source, 'payload': payload})
+        return seq
+
+    def mark(self, seq: int, stage: str) -> None:
+        with self._lock:
+            self._stages[seq] = stage
+            self._write({'seq': seq, 'stage': stage})
+
+    def stage(self, seq: int) -> str:
+        with self._lock:
+            return self._stages.get(seq, 'fetched')
+
+    def unfinished(self) -> List[Tuple[int, str, Any]]:
+        """``(seq, source, payload)`` of every item not yet stored or skipped."""
+        with self._lock:
+            return [(seq, source, payload) for seq, (source, payload) in sorted(self._items.items())
+                    if self._stages.get(seq) not in FINAL_STAGES]
+
+    def sync(self) -> None:
+        """Force what was written so far to disk."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """End the cycle and delete its journal."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        # Flushed per line so a crashed process loses at most the line in progress
+        self._file.write(json.dumps(record, default=self._encode) + '\n')
+        self._file.flush()
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return {'__datetime__': value.isoformat()}
+        if is_dataclass(value):
+            return {'__dataclass__': type(value).__name__, 'fields': vars(value)}
+        if isinstance(value, (set, frozenset, tuple)):
+            return list(value)
+        return str(value)
+
+    def _decode(self, record: Dict[str, Any]) -> Any:
+        if '__datetime__' in record:
+            return datetime.fromisoformat(record['__datetime__'])
+        if '__dataclass__' in record:
+            payload_type = self.payload_types.get(record['__dataclass__'])
+            return payload_type(**record['fields']) if payload_type else record['fields']
+        return record
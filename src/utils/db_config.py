@@ -1,27 +1,35 @@
 import os
-from typing import Optional
-from pymongo import MongoClient
-from pymongo.database import Database
-from pymongo.errors import ServerSelectionTimeoutError, PyMongoError
+from typing import TYPE_CHECKING, Optional
 import logging
 from dotenv import load_dotenv
 
+from src.utils.lazy_import import lazy_import
+from src.utils.startup import fast_start_enabled
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+    from pymongo.database import Database
+
+pymongo = lazy_import('pymongo')
+
 logger = logging.getLogger(__name__)
 
 class DatabaseConfig:
     _instance: Optional['DatabaseConfig'] = None
-    _client: Optional[MongoClient] = None
-    _db: Optional[Database] = None
+    _client: Optional['MongoClient'] = None
+    _db: Optional['Database'] = None
 
-    def __new__(cls):
+    def __new__(cls, fast_start: Optional[bool] = None):
         if cls._instance is None:
             cls._instance = super(DatabaseConfig, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, fast_start: Optional[bool] = None):
         if not hasattr(self, 'initialized'):
             load_dotenv()
             self.initialized = True
+            # FAST_START decides unless the caller (the agent) says otherwise
+            self.fast_start = fast_start_enabled() if fast_start is None else fast_start
             # Get connection string from environment
             self.mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
             # Ensure we use the correct database name from environment
@@ -36,7 +44,7 @@ class DatabaseConfig:
         try:
             if self._client is None:
                 # Configure MongoDB client with appropriate options for Atlas
-                self._client = MongoClient(
+                self._client = pymongo.MongoClient(
                     self.mongo_uri,
                     serverSelectionTimeoutMS=10000,  # Increased timeout for Atlas connection
                     connectTimeoutMS=10000,
@@ -45,26 +53,30 @@ class DatabaseConfig:
                     w='majority'  # Ensure write acknowledgment
                 )
                 self._db = self._client[self.db_name]
+                if self.fast_start:
+                    # The client connects in the background; a bad URI fails the first operation
+                    logger.info(f"Fast start: MongoDB client for {self.db_name} created without a round trip")
+                    return
                 # Test connection
                 self._client.server_info()
                 logger.info(f"Successfully connected to MongoDB Atlas: {self.db_name}")
                 # Log database collections for debugging
                 collections = self._db.list_collection_names()
                 logger.info(f"Available collections: {collections}")
-        except (PyMongoError, ServerSelectionTimeoutError) as e:
+        except (pymongo.errors.PyMongoError, pymongo.errors.ServerSelectionTimeoutError) as e:
             logger.error(f"Failed to connect to MongoDB Atlas: {str(e)}")
             logger.error(f"Connection string (partial): {self.mongo_uri[:20]}...")
             raise
 
     @property
-    def db(self) -> Database:
+    def db(self) -> 'Database':
         """Get database instance."""
         if self._db is None:
             self.connect()
         return self._db
 
     @property
-    def client(self) -> MongoClient:
+    def client(self) -> 'MongoClient':
         """Get MongoDB client instance."""
         if self._client is None:
             self.connect()
@@ -106,6 +118,9 @@ class DatabaseConfig:
             logger.error(f"Error getting database stats: {str(e)}")
             return {}
 
-def get_db_config() -> DatabaseConfig:
-    """Get singleton instance of DatabaseConfig."""
-    return DatabaseConfig()
+def get_db_config(fast_start: Optional[bool] = None) -> DatabaseConfig:
+    """Get singleton instance of DatabaseConfig.
+
+    ``fast_start`` only applies when the instance is first created.
+    """
+    return DatabaseConfig(fast_start)
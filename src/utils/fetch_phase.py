@@ -0,0 +1,130 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.utils.quota_scheduler import QuotaScheduler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchJob:
+    source: str
+    work: Callable[[], Any]
+    on_resume: Callable[..., None]
+    default: Any = None
+    timeout: Optional[float] = None
+
+
+@dataclass
+class FetchResult:
+    source: str
+    items: Any
+    status: str  # 'ok', 'parked', 'timeout', 'error' or 'busy'
+    seconds: float
+    error: Optional[str] = None
+
+
+class FetchPhase:
+    """Run every source's fetch at the same time through the quota scheduler.
+
+    Each source gets its own timeout and failures stay with their source. A
+    fetch that overruns its timeout keeps running in the background; its
+    results go to the source's ``on_resume`` callback when they arrive, and
+    the source is skipped by later phases until then. Late results are
+    handled on a thread of their own, never inline in the phase that gave
+    up waiting for them.
+    """
+
+    def __init__(self, scheduler: QuotaScheduler, default_timeout: float = 600, max_workers: int = 8):
+        self.scheduler = scheduler
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._lock = threading.Lock()
+        self._running: Dict[str, float] = {}
+
+    def run(self, jobs: List[FetchJob]) -> Dict[str, FetchResult]:
+        """Fetch all sources and return their results keyed by source."""
+        return {result.source: result for result in self.iter_results(jobs)}
+
+    def iter_results(self, jobs: List[FetchJob]) -> Iterator[FetchResult]:
+        """Yield each source's result as soon as its fetch finishes, fails or times out."""
+        results = []
+        pending = {}
+        for job in jobs:
+            with self._lock:
+                busy = job.source in self._running
+                if not busy:
+                    self._running[job.source] = time.monotonic()
+            if busy:
+                result = FetchResult(job.source, job.default, 'busy', 0.0)
+                results.append(result)
+                yield result
+                continue
+            future = self._executor.submit(self.scheduler.submit, job.source, job.work, job.on_resume, job.default)
+            timeout = job.timeout if job.timeout is not None else self.default_timeout
+            pending[future] = (job, time.monotonic(), timeout)
+
+        while pending:
+            now = time.monotonic()
+            next_deadline = min(started + timeout for _, started, timeout in pending.values())
+            done, _ = wait(list(pending), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in list(pending):
+                job, started, timeout = pending[future]
+                if future in done:
+                    del pending[future]
+                    result = self._result(job, future, now - started)
+                elif now >= started + timeout:
+                    del pending[future]
+                    logger.warning(f"Fetch for {job.source} exceeded {timeout:.0f}s; "
+                                   f"its results will be processed when ready")
+                    future.add_done_callback(lambda late, job=job: self._late(job, late))
+                    result = FetchResult(job.source, job.default, 'timeout', now - started)
+                else:
+                    continue
+                results.append(result)
+                yield result
+
+        logger.info("Fetch durations: " + ", ".join(
+            f"{result.source}={result.seconds:.2f}s ({result.status})" for result in results
+        ))
+
+    def _result(self, job: FetchJob, future, seconds: float) -> FetchResult:
+        self._done(job.source)
+        try:
+            items = future.result()
+        except Exception as e:
+            logger.error(f"Fetch for {job.source} failed: {str(e)}")
+            return FetchResult(job.source, job.default, 'error', seconds, error=str(e))
+        status = 'parked' if self.scheduler.is_parked(job.source) else 'ok'
+        return FetchResult(job.source, items, status, seconds)
+
+    def _late(self, job: FetchJob, future) -> None:
+        # A future that finished meanwhile runs its callback right here, on the caller's thread
+        threading.Thread(
+            target=self._finish_late, args=(job, future), name=f"late-{job.source}", daemon=True
+        ).start()
+
+    def _finish_late(self, job: FetchJob, future) -> None:
+        self._done(job.source)
+        try:
+            items = future.result()
+        except Exception as e:
+            logger.error(f"Late fetch for {job.source} failed: {str(e)}")
+            return
+        try:
+            # Parked while running late, the fetch has more results to come when the source resumes
+            job.on_resume(items, done=not self.scheduler.is_parked(job.source))
+        except Exception as e:
+            logger.error(f"Processing late results for {job.source} failed: {str(e)}")
+
+    def _done(self, source: str) -> None:
+        with self._lock:
+            self._running.pop(source, None)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -3,10 +3,14 @@ import logging
 import time
 import random
 from typing import Dict, Any, Optional
-import google.generativeai as genai
-from google.api_core.exceptions import ResourceExhausted, GoogleAPIError
 from dotenv import load_dotenv
 
+from src.utils.lazy_import import lazy_import
+
+# The Gemini SDK takes long to import; load it when a client is first created
+genai = lazy_import('google.generativeai')
+api_exceptions = lazy_import('google.api_core.exceptions')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -51,7 +55,7 @@ class GeminiClient:
         while retries <= self.max_retries:
             try:
                 return func(*args, **kwargs)
-            except ResourceExhausted as e:
+            except api_exceptions.ResourceExhausted as e:
                 # Check if we should retry
                 if retries == self.max_retries:
                     logger.error(f"Maximum retries exceeded: {str(e)}")
@@ -0,0 +1,121 @@
+import json
+import logging
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# The root tree's entries give the README's blob SHA whatever the file is called
+REPO_FIELDS = """
+    nameWithOwner
+    stargazerCount
+    primaryLanguage {{ name }}
+    repositoryTopics(first: 20) {{ nodes {{ topic {{ name }} }} }}
+    rootTree: object(expression: "HEAD:") {{ ... on Tree {{ entries {{ name oid type }} }} }}{readme_text}
+"""
+# Text of the most common README name; READMEs named otherwise are downloaded by SHA
+README_TEXT_FIELD = """
+    readme: object(expression: "HEAD:README.md") { ... on Blob { oid text } }"""
+
+
+class GraphQLUnavailableError(Exception):
+    """Raised when the GraphQL endpoint cannot serve a batch."""
+
+
+class GitHubGraphQLLoader:
+    """Resolve repository metadata for many repos in a single GraphQL request.
+
+    Each batch of up to ``batch_size`` repositories costs one HTTP round trip
+    instead of one REST ``get_topics()`` call per repository.
+    """
+
+    MAX_BATCH_SIZE = 100
+
+    def __init__(self, token: Optional[str], endpoint: str = GITHUB_GRAPHQL_URL,
+                 batch_size: int = MAX_BATCH_SIZE, timeout: float = 30,
+                 session: Optional[requests.Session] = None, fetch_readme_text: bool = True):
+        self.token = token
+        self.endpoint = endpoint
+        self.batch_size = min(batch_size, self.MAX_BATCH_SIZE)
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        # With fetch_readme_text=False only the README blob SHA is requested
+        self.repo_fields = REPO_FIELDS.format(readme_text=README_TEXT_FIELD if fetch_readme_text else "")
+
+    def load(self, full_names: List[str]) -> Dict[str, Dict]:
+        """Return metadata keyed by ``full_name`` for every repo GraphQL resolved.
+
+        Repositories that GraphQL could not resolve are left out of the result
+        so the caller can fall back to REST for just those.
+        """
+        if not self.token:
+            raise GraphQLUnavailableError("No GitHub token configured for GraphQL")
+
+        metadata = {}
+        for start in range(0, len(full_names), self.batch_size):
+            batch = full_names[start:start + self.batch_size]
+            metadata.update(self._load_batch(batch))
+        return metadata
+
+    def _build_query(self, full_names: List[str]) -> str:
+        parts = []
+        for index, full_name in enumerate(full_names):
+            owner, name = full_name.split('/', 1)
+            parts.append(
+                f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{{self.repo_fields}}}"
+            )
+        return "query {\n" + "\n".join(parts) + "\n}"
+
+    def _load_batch(self, full_names: List[str]) -> Dict[str, Dict]:
+        try:
+            response = self.session.post(
+                self.endpoint,
+                json={"query": self._build_query(full_names)},
+                headers={"Authorization": f"bearer {self.token}"},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise GraphQLUnavailableError(f"GraphQL request failed: {str(e)}")
+
+        data = payload.get('data')
+        if not data:
+            errors = payload.get('errors') or 'empty response'
+            raise GraphQLUnavailableError(f"GraphQL returned no data: {errors}")
+        if payload.get('errors'):
+            logger.warning(f"GraphQL returned partial errors: {payload['errors']}")
+
+        metadata = {}
+        for index, full_name in enumerate(full_names):
+            node = data.get(f"r{index}")
+            if node:
+                metadata[full_name] = self._parse_repo(node)
+        return metadata
+
+    def _parse_repo(self, node: Dict) -> Dict:
+        readme_sha = self._readme_sha(node)
+        readme = node.get('readme') or {}
+        topics = (node.get('repositoryTopics') or {}).get('nodes') or []
+        return {
+            'full_name': node.get('nameWithOwner'),
+            'stars': node.get('stargazerCount', 0),
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'topics': [topic['topic']['name'] for topic in topics if topic.get('topic')],
+            'readme': (readme.get('text') or "") if readme_sha and readme.get('oid') == readme_sha else "",
+            'readme_sha': readme_sha
+        }
+
+    @staticmethod
+    def _readme_sha(node: Dict) -> str:
+        """Blob SHA of the root README (README.md, Readme.rst, README, ...), markdown first."""
+        entries = ((node.get('rootTree') or {}).get('entries')) or []
+        readmes = sorted(
+            (entry for entry in entries
+             if entry.get('type') == 'blob' and (entry.get('name') or '').lower().split('.')[0] == 'readme'),
+            key=lambda entry: (not entry['name'].lower().endswith(('.md', '.markdown')), entry['name'])
+        )
+        return (readmes[0].get('oid') or "") if readmes else ""
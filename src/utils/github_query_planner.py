@@ -0,0 +1,85 @@
+import math
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class PlannedQuery:
+    keywords: List[str]
+    terms: str
+    max_results: int
+
+    @property
+    def key(self) -> str:
+        return ",".join(self.keywords)
+
+
+@dataclass
+class SearchPlan:
+    queries: List[PlannedQuery]
+    per_page: int
+    requests_used: int = 0
+
+    @property
+    def estimated_requests(self) -> int:
+        """Upper bound on search requests, one per page of each query."""
+        return sum(max(1, math.ceil(query.max_results / self.per_page)) for query in self.queries)
+
+    def summary(self) -> dict:
+        return {
+            'keywords': sum(len(query.keywords) for query in self.queries),
+            'queries': len(self.queries),
+            'estimated_requests': self.estimated_requests,
+            'requests_used': self.requests_used
+        }
+
+
+class GitHubQueryPlanner:
+    """Pack keywords into the fewest OR-combined GitHub search queries.
+
+    GitHub allows at most five AND/OR/NOT operators and 256 characters per
+    query, so keywords are packed greedily into groups that respect both
+    limits. Each group asks for as many results as the per-keyword searches
+    would have returned together, fetched at ``per_page`` results per request.
+    """
+
+    MAX_QUERY_LENGTH = 256
+    MAX_OPERATORS = 5
+    # Room kept for the created:/stars:/language: qualifiers appended per query
+    RESERVED_QUALIFIER_LENGTH = 64
+
+    def __init__(self, results_per_keyword: int = 10, per_page: int = 100, use_topics: bool = False):
+        self.results_per_keyword = results_per_keyword
+        self.per_page = per_page
+        self.use_topics = use_topics
+
+    def term_for(self, keyword: str) -> str:
+        if self.use_topics:
+            return f"topic:{keyword.replace(' ', '-')}"
+        return f'"{keyword}"' if ' ' in keyword else keyword
+
+    def plan(self, keywords: List[str]) -> SearchPlan:
+        budget = self.MAX_QUERY_LENGTH - self.RESERVED_QUALIFIER_LENGTH
+        queries = []
+        group: List[str] = []
+        terms: List[str] = []
+
+        for keyword in dict.fromkeys(keywords):
+            term = self.term_for(keyword)
+            candidate = " OR ".join(terms + [term])
+            if terms and (len(terms) > self.MAX_OPERATORS or len(candidate) > budget):
+                queries.append(self._planned(group, terms))
+                group, terms = [], []
+            group.append(keyword)
+            terms.append(term)
+
+        if group:
+            queries.append(self._planned(group, terms))
+        return SearchPlan(queries=queries, per_page=self.per_page)
+
+    def _planned(self, keywords: List[str], terms: List[str]) -> PlannedQuery:
+        return PlannedQuery(
+            keywords=list(keywords),
+            terms=" OR ".join(terms),
+            max_results=self.results_per_keyword * len(keywords)
+        )
@@ -0,0 +1,221 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the wire encoding of the original body; the cached body is decoded
+HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class HttpCache:
+    """On-disk store of HTTP response bodies and their validators.
+
+    Entries are evicted least-recently-used first once the bodies exceed
+    ``max_bytes``. The index survives restarts so validators from the
+    previous cycle are reused; it is only written by ``flush()`` (the agent
+    calls it once per cycle) and ``close()``, not on every response. Bodies
+    a crash left without an index entry are removed on the next start.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Set when the index in memory differs from the one on disk
+        self._dirty = False
+        # Serializes index writes so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def key_for(url: str, accept: Optional[str] = None) -> str:
+        return f"{url}|{accept or ''}"
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def _load_index(self) -> None:
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for key, entry in json.load(f):
+                        if os.path.exists(self._body_path(key)):
+                            self._entries[key] = entry
+                            self.total_bytes += entry['size']
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable HTTP cache index: {str(e)}")
+                self._entries.clear()
+                self.total_bytes = 0
+        self._remove_unindexed_bodies()
+
+    def _remove_unindexed_bodies(self) -> None:
+        indexed = {os.path.basename(self._body_path(key)) for key in self._entries}
+        for name in os.listdir(self.cache_dir):
+            # Bodies are named by a sha256 hex digest
+            if len(name) == 64 and name not in indexed:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def flush(self) -> None:
+        """Write the index to disk if it changed since the last flush."""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = list(self._entries.items())
+                self._dirty = False
+            path = os.path.join(self.cache_dir, self.INDEX_FILE)
+            tmp_path = path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write HTTP cache index: {str(e)}")
+                with self._lock:
+                    self._dirty = True
+
+    def close(self) -> None:
+        self.flush()
+
+    def validators(self, key: str) -> Optional[Dict]:
+        """Return the stored validators for a key, without touching LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return {'etag': entry.get('etag'), 'last_modified': entry.get('last_modified')}
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached headers and body for a key and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                with open(self._body_path(key), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return {'headers': entry['headers'], 'body': body}
+
+    def put(self, key: str, headers: Dict[str, str], body: bytes) -> None:
+        etag = headers.get('ETag') or headers.get('etag')
+        last_modified = headers.get('Last-Modified') or headers.get('last-modified')
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            with open(self._body_path(key), 'wb') as f:
+                f.write(body)
+            self._entries[key] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(body),
+                'headers': {k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS}
+            }
+            self.total_bytes += len(body)
+            while self.total_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+            self._dirty = True
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry['size']
+        self._dirty = True
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'evictions': self.evictions
+            }
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Transport adapter that revalidates GETs against an HttpCache.
+
+    Stored validators are sent as ``If-None-Match``/``If-Modified-Since``;
+    a ``304 Not Modified`` is turned back into a ``200`` carrying the cached
+    body, so callers never see the difference. Without a cache it behaves
+    like a plain ``HTTPAdapter``.
+    """
+
+    def __init__(self, cache: Optional[HttpCache], **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if self.cache is None or request.method != 'GET' or kwargs.get('stream'):
+            return super().send(request, **kwargs)
+
+        key = self.cache.key_for(request.url, request.headers.get('Accept'))
+        validators = self.cache.validators(key)
+        if validators:
+            if validators['etag']:
+                request.headers['If-None-Match'] = validators['etag']
+            if validators['last_modified']:
+                request.headers['If-Modified-Since'] = validators['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and validators:
+            cached = self.cache.get(key)
+            if cached is not None:
+                headers = dict(cached['headers'])
+                headers.update({k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS})
+                response.status_code = 200
+                response.reason = 'OK'
+                response.headers = requests.structures.CaseInsensitiveDict(headers)
+                response._content = cached['body']
+                response.from_cache = True
+                return response
+
+        self.cache.record_miss()
+        if response.status_code == 200:
+            self.cache.put(key, dict(response.headers), response.content)
+        response.from_cache = False
+        return response
@@ -0,0 +1,213 @@
+import time
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from urllib3.util.retry import Retry
+
+from src.utils.http_cache import CachingHTTPAdapter, HttpCache
+
+logger = logging.getLogger(__name__)
+
+
+class TransportAdapter(CachingHTTPAdapter):
+    """Adapter applying the transport's timeouts, host limits and counters.
+
+    Adapters made by the same transport share one urllib3 pool manager, so
+    connections are reused whichever session or client sends the request.
+    """
+
+    def __init__(self, transport: "HttpTransport", cache: Optional[HttpCache] = None, **kwargs):
+        super().__init__(cache, **kwargs)
+        self.transport = transport
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.transport.timeout
+        host = urlparse(request.url).hostname or ''
+        start = time.perf_counter()
+        with self.transport.host_slot(host):
+            try:
+                response = super().send(request, **kwargs)
+            except Exception:
+                self.transport.record(host, time.perf_counter() - start, error=True)
+                raise
+
+        raw = getattr(response, 'raw', None)
+        retries = getattr(raw, 'retries', None)
+        size = 0
+        if not getattr(response, 'from_cache', False):
+            if kwargs.get('stream'):
+                size = int(response.headers.get('Content-Length') or 0)
+            else:
+                size = len(response.content)
+        self.transport.record(
+            host,
+            time.perf_counter() - start,
+            size=size,
+            retries=len(retries.history) if retries is not None else 0,
+            error=response.status_code >= 500
+        )
+        return response
+
+
+class HttpTransport:
+    """Pooled HTTP transport shared by every fetcher and agent.
+
+    Connections are kept alive per host, responses are requested gzipped,
+    every request gets connect/read timeouts, and transient 5xx/connection
+    errors are retried with backoff. ``host_limits`` caps concurrent
+    requests per host (e.g. one at a time for arXiv); ``stats()`` reports
+    requests, errors, retries, bytes and latency per host.
+    """
+
+    RETRY_STATUSES = (500, 502, 504)
+
+    def __init__(self, cache: Optional[HttpCache] = None, max_connections_per_host: int = 10,
+                 host_limits: Optional[Dict[str, int]] = None, connect_timeout: float = 5,
+                 read_timeout: float = 30, max_retries: int = 3, backoff_factor: float = 0.5):
+        self.cache = cache
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_connections_per_host = max_connections_per_host
+        self.host_limits = dict(host_limits or {})
+        self.retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0, 'latency_total': 0.0, 'latency_max': 0.0
+        })
+        self.adapter = self._new_adapter(self.retry)
+        self.session = self.new_session()
+
+    def _new_adapter(self, max_retries) -> TransportAdapter:
+        return TransportAdapter(
+            self,
+            self.cache,
+            max_retries=max_retries,
+            pool_connections=32,
+            pool_maxsize=self.max_connections_per_host
+        )
+
+    def adapter_with_retry(self, max_retries) -> TransportAdapter:
+        """An adapter with its own retry policy that still shares this transport's pools."""
+        adapter = self._new_adapter(max_retries)
+        adapter.poolmanager = self.adapter.poolmanager
+        return adapter
+
+    def new_session(self) -> requests.Session:
+        """A session routed through the shared adapter, for clients that set their own headers."""
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = 'gzip, deflate'
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        return session
+
+    def host_slot(self, host: str):
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.host_limits.get(host, self.max_connections_per_host))
+                self._slots[host] = slot
+            return slot
+
+    def record(self, host: str, latency: float, size: int = 0, retries: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats[host]
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['retries'] += retries
+            stats['bytes'] += size
+            stats['latency_total'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                host: {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'bytes': stats['bytes'],
+                    'avg_latency': stats['latency_total'] / stats['requests'] if stats['requests'] else 0.0,
+                    'max_latency': stats['latency_max']
+                }
+                for host, stats in self._stats.items()
+            }
+
+
+_default_transport: Optional[HttpTransport] = None
+_default_lock = threading.Lock()
+
+
+def default_transport() -> HttpTransport:
+    """The process-wide transport, created on first use unless one was set."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = HttpTransport()
+        return _default_transport
+
+
+def set_default_transport(transport: HttpTransport) -> None:
+    global _default_transport
+    with _default_lock:
+        _default_transport = transport
+
+
+def transport_session(cache: Optional[HttpCache] = None) -> requests.Session:
+    """The default transport's session, or a session of a new transport over ``cache``."""
+    if cache is None:
+        return default_transport().session
+    return HttpTransport(cache=cache).session
+
+
+def install_github_transport(transport: HttpTransport) -> None:
+    """Route PyGithub's connections through the shared transport.
+
+    PyGithub has no session hook, so connection classes that mount a
+    transport adapter are injected. PyGithub's own retry policy is kept.
+    """
+    from github.Requester import Requester, HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+
+    def mount_transport(connection):
+        connection.adapter = transport.adapter_with_retry(connection.retry)
+        connection.session.mount("https://", connection.adapter)
+        connection.session.mount("http://", connection.adapter)
+
+    class TransportHTTPSConnectionClass(HTTPSRequestsConnectionClass):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            mount_transport(self)
+
+    class TransportHTTPConnectionClass(HTTPRequestsConnectionClass):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            mount_transport(self)
+
+    Requester.injectConnectionClasses(TransportHTTPConnectionClass, TransportHTTPSConnectionClass)
+    # injectConnectionClasses is meant for tests and turns off connection reuse; restore it
+    Requester._Requester__persist = True
+
+
+def install_huggingface_transport(transport: HttpTransport) -> bool:
+    """Route huggingface_hub through the shared transport where the hub allows it.
+
+    Only requests-based hub releases expose ``configure_http_backend``; newer
+    releases keep their own client and False is returned.
+    """
+    try:
+        from huggingface_hub import configure_http_backend
+    except ImportError:
+        logger.info("huggingface_hub manages its own HTTP client; only direct requests use the shared transport")
+        return False
+    configure_http_backend(backend_factory=transport.new_session)
+    return True
@@ -0,0 +1,37 @@
+import sys
+import importlib.util
+from types import ModuleType
+
+
+class _MissingModule(ModuleType):
+    """Placeholder for an optional SDK that is not installed; fails on first use."""
+
+    def __getattr__(self, name):
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name=self.__name__)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return module ``name`` without executing it until an attribute is first used.
+
+    Heavy SDKs (pymongo, PyGithub, google-generativeai) are bound at module
+    level this way so that importing an entry point or node only pays for the
+    SDKs it actually calls. Names such as exception classes are looked up
+    when used, e.g. ``except pymongo.errors.PyMongoError``. A module that is
+    not installed raises ModuleNotFoundError on first use instead of on import.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        spec = None
+    if spec is None:
+        return _MissingModule(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
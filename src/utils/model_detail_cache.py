@@ -0,0 +1,105 @@
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelDetailCache:
+    """Persistent cache of Hugging Face model details keyed by model revision.
+
+    Entries are keyed on ``(model_id, version)`` where the version is the
+    model's commit sha, or its lastModified timestamp when no sha is known,
+    so a cached entry is only reused while the model is unchanged. The least
+    recently used entries are evicted beyond ``max_entries``; ``flush()``
+    writes the cache to ``path`` so it survives restarts.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._dirty = False
+        # Serializes file writes so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    @staticmethod
+    def key_for(model_id: str, version: str) -> str:
+        return f"{model_id}@{version}"
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for key, details in json.load(f)[-self.max_entries:]:
+                    self._entries[key] = details
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable model detail cache: {str(e)}")
+            self._entries.clear()
+
+    def get(self, model_id: str, version: Optional[str]) -> Optional[Dict]:
+        """Return cached details for this revision of a model, or None."""
+        if not version:
+            return None
+        key = self.key_for(model_id, version)
+        with self._lock:
+            details = self._entries.get(key)
+            if details is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return details
+
+    def put(self, model_id: str, version: Optional[str], details: Dict) -> None:
+        if not version:
+            return
+        key = self.key_for(model_id, version)
+        with self._lock:
+            self._entries[key] = details
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Write the cache to disk if it changed since the last flush."""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = list(self._entries.items())
+                self._dirty = False
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, default=str)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write model detail cache: {str(e)}")
+                with self._lock:
+                    self._dirty = True
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'evictions': self.evictions
+            }
@@ -0,0 +1,138 @@
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PipelineStage:
+    """One step of a pipeline: worker threads reading from a bounded queue.
+
+    ``handler`` returns the item to pass downstream, or None to drop it
+    (counted as ``dropped`` unless this is the last stage). An
+    exception fails only the item being handled; it is logged and counted.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Any], workers: int = 1, queue_size: int = 100):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.next_stage: Optional["PipelineStage"] = None
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats = {'processed': 0, 'errors': 0, 'dropped': 0, 'max_depth': 0,
+                       'latency_total': 0.0, 'latency_max': 0.0}
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, item: Any) -> None:
+        """Queue an item, blocking while the queue is full."""
+        self.queue.put(item)
+        depth = self.queue.qsize()
+        with self._lock:
+            self._stats['max_depth'] = max(self._stats['max_depth'], depth)
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _work(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                start = time.perf_counter()
+                try:
+                    result = self.handler(item)
+                except Exception as e:
+                    self._record(time.perf_counter() - start, error=True)
+                    logger.error(f"Pipeline stage {self.name} failed for {item}: {str(e)}")
+                    continue
+                self._record(time.perf_counter() - start, dropped=result is None and self.next_stage is not None)
+                if result is not None and self.next_stage is not None:
+                    # Queued downstream before task_done, so draining stage by stage sees it
+                    self.next_stage.put(result)
+            finally:
+                self.queue.task_done()
+
+    def _record(self, latency: float, error: bool = False, dropped: bool = False) -> None:
+        with self._lock:
+            self._stats['processed'] += 1
+            self._stats['errors'] += int(error)
+            self._stats['dropped'] += int(dropped)
+            self._stats['latency_total'] += latency
+            self._stats['latency_max'] = max(self._stats['latency_max'], latency)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            processed = self._stats['processed']
+            return {
+                'processed': processed,
+                'errors': self._stats['errors'],
+                'dropped': self._stats['dropped'],
+                'queue_depth': self.queue.qsize(),
+                'max_queue_depth': self._stats['max_depth'],
+                'avg_latency': self._stats['latency_total'] / processed if processed else 0.0,
+                'max_latency': self._stats['latency_max']
+            }
+
+
+class Pipeline:
+    """Stages chained by bounded queues, each stage on its own workers.
+
+    ``put`` blocks while the first stage's queue is full, and a full queue
+    further down holds up the stage feeding it, so a slow stage slows the
+    producer instead of growing memory. ``drain`` waits until every queued
+    item has left the last stage.
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+        self._started = False
+
+    def start(self) -> "Pipeline":
+        if not self._started:
+            for stage in self.stages:
+                stage.start()
+            self._started = True
+        return self
+
+    def put(self, item: Any) -> None:
+        self.stages[0].put(item)
+
+    def feed(self, items: Iterable[Any]) -> int:
+        """Queue every item, consuming ``items`` only as fast as the first stage accepts them."""
+        count = 0
+        for item in items:
+            self.put(item)
+            count += 1
+        return count
+
+    def drain(self) -> None:
+        for stage in self.stages:
+            stage.queue.join()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def shutdown(self) -> None:
+        if self._started:
+            self.drain()
+            for stage in self.stages:
+                stage.stop()
+            self._started = False
@@ -0,0 +1,158 @@
+import time
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SourceDeferred(Exception):
+    """Raised by a fetcher whose quota is exhausted.
+
+    ``partial`` holds results that are safe to process now and ``resume``
+    fetches whatever is left once ``resume_at`` has passed.
+    """
+
+    def __init__(self, source: str, resume_at: datetime, partial=None,
+                 resume: Optional[Callable[[], Any]] = None):
+        super().__init__(f"{source} deferred until {resume_at.isoformat()}")
+        self.source = source
+        self.resume_at = resume_at
+        self.partial = partial
+        self.resume = resume
+
+
+def reset_time_from_headers(headers, default_wait: int = 3600) -> datetime:
+    """Work out when a throttled API will accept calls again."""
+    now = datetime.now(timezone.utc)
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    if headers.get('x-ratelimit-reset'):
+        try:
+            return datetime.fromtimestamp(int(headers['x-ratelimit-reset']), tz=timezone.utc)
+        except (TypeError, ValueError):
+            pass
+    if headers.get('retry-after'):
+        try:
+            return now + timedelta(seconds=int(headers['retry-after']))
+        except (TypeError, ValueError):
+            pass
+    return now + timedelta(seconds=default_wait)
+
+
+def defer_on_throttle(source: str, error: Exception, resume: Callable[[], Any], partial=None) -> None:
+    """Raise SourceDeferred if an HTTP error is a 429/503 throttle response."""
+    response = getattr(error, 'response', None)
+    if response is not None and getattr(response, 'status_code', None) in (429, 503):
+        raise SourceDeferred(
+            source,
+            reset_time_from_headers(getattr(response, 'headers', None), default_wait=60),
+            partial=partial,
+            resume=resume
+        ) from error
+
+
+class QuotaScheduler:
+    """Parks sources whose quota ran out and resumes them at their reset time.
+
+    A parked source never blocks the caller: ``submit`` returns whatever
+    partial results are available and a timer thread runs the remaining
+    work later, handing its results to the source's ``on_resume(items, done)``
+    callback; ``done`` is False for partial results when the source has to
+    park again, as its remaining work is still to come. The source stays
+    parked until that callback returns, so a new submit never fetches it
+    while its resumed work is still running.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._parked: Dict[str, Dict[str, Any]] = {}
+        self._parked_seconds: Dict[str, float] = {}
+
+    def submit(self, source: str, work: Callable[[], Any],
+               on_resume: Callable[..., None], default=None):
+        """Run work for a source now, or skip it while the source is parked."""
+        with self._lock:
+            if source in self._parked:
+                logger.info(f"Source {source} is parked; its resumed work is still pending")
+                return default
+
+        try:
+            return work()
+        except SourceDeferred as e:
+            self._park(source, e, work, on_resume)
+            return e.partial if e.partial is not None else default
+
+    def _park(self, source: str, deferral: SourceDeferred,
+              work: Callable[[], Any], on_resume: Callable[..., None]) -> None:
+        delay = max(0.0, deferral.resume_at.timestamp() - self._clock())
+        timer = threading.Timer(delay, self._resume, args=(source,))
+        timer.daemon = True
+        with self._lock:
+            self._parked[source] = {
+                'since': self._clock(),
+                'resume_at': deferral.resume_at,
+                'work': deferral.resume or work,
+                'on_resume': on_resume,
+                'timer': timer
+            }
+        logger.warning(f"Parking source {source} for {delay:.0f}s until {deferral.resume_at.isoformat()}")
+        timer.start()
+
+    def _resume(self, source: str) -> None:
+        with self._lock:
+            entry = self._parked.get(source)
+            if entry is None or entry['since'] is None:
+                return
+            parked_for = self._clock() - entry['since']
+            self._parked_seconds[source] = self._parked_seconds.get(source, 0.0) + parked_for
+            # Still parked for submit, but no longer counted as time spent waiting
+            entry['since'] = None
+        logger.info(f"Resuming source {source} after {parked_for:.0f}s parked")
+
+        try:
+            self._run_resumed(source, entry)
+        finally:
+            with self._lock:
+                # Parking again replaced the entry; only the finished one is removed
+                if self._parked.get(source) is entry:
+                    del self._parked[source]
+
+    def _run_resumed(self, source: str, entry: Dict[str, Any]) -> None:
+        try:
+            result = entry['work']()
+        except SourceDeferred as e:
+            if e.partial:
+                entry['on_resume'](e.partial, done=False)
+            self._park(source, e, entry['work'], entry['on_resume'])
+            return
+        except Exception as e:
+            logger.error(f"Resumed work for {source} failed: {str(e)}")
+            return
+
+        try:
+            entry['on_resume'](result, done=True)
+        except Exception as e:
+            logger.error(f"Processing resumed results for {source} failed: {str(e)}")
+
+    def is_parked(self, source: str) -> bool:
+        with self._lock:
+            return source in self._parked
+
+    def parked_seconds(self) -> Dict[str, float]:
+        """Total time each source has spent parked, including any current parking."""
+        now = self._clock()
+        with self._lock:
+            totals = dict(self._parked_seconds)
+            for source, entry in self._parked.items():
+                if entry['since'] is not None:
+                    totals[source] = totals.get(source, 0.0) + (now - entry['since'])
+        return totals
+
+    def shutdown(self) -> None:
+        """Cancel pending resumptions."""
+        with self._lock:
+            for entry in self._parked.values():
+                entry['timer'].cancel()
+            self._parked.clear()
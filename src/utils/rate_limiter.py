@@ -0,0 +1,99 @@
+import time
+import threading
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace calls against an API quota."""
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if they are available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available. Returns False if timeout expires first."""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self._sleep(wait)
+
+    def drain_to(self, tokens: float) -> None:
+        """Lower the available tokens, e.g. after the server reports less quota."""
+        with self._lock:
+            self._refill()
+            self._tokens = max(0.0, min(self._tokens, tokens))
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class GitHubRateLimiter:
+    """Shared limiter holding one bucket per GitHub quota (search and core)."""
+
+    SEARCH_PER_MINUTE = 30
+    CORE_PER_HOUR = 5000
+
+    def __init__(self, search_per_minute: float = SEARCH_PER_MINUTE,
+                 core_per_hour: float = CORE_PER_HOUR,
+                 core_burst: float = 100,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.search = TokenBucket(search_per_minute / 60.0, search_per_minute, clock, sleep)
+        self.core = TokenBucket(core_per_hour / 3600.0, core_burst, clock, sleep)
+
+    def acquire_search(self, timeout: Optional[float] = None) -> bool:
+        return self.search.acquire(timeout=timeout)
+
+    def acquire_core(self, timeout: Optional[float] = None) -> bool:
+        return self.core.acquire(timeout=timeout)
+
+    def sync(self, rate_limit) -> None:
+        """Clamp the buckets to the remaining quota reported by GitHub."""
+        resources = getattr(rate_limit, 'resources', None) or rate_limit
+        for name, bucket in (('search', self.search), ('core', self.core)):
+            remaining = getattr(getattr(resources, name, None), 'remaining', None)
+            if isinstance(remaining, int):
+                bucket.drain_to(remaining)
+                logger.debug(f"GitHub {name} quota synced: {remaining} remaining")
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def fast_start_enabled() -> bool:
+    """Whether FAST_START is set: skip startup checks that an earlier start already passed."""
+    return os.getenv('FAST_START', '0').strip().lower() in ('1', 'true', 'yes')
+
+
+class StartupTimer:
+    """Time named startup phases and log them as one breakdown."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._started = clock()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self._clock() - start))
+
+    def total(self) -> float:
+        return self._clock() - self._started
+
+    def report(self) -> str:
+        breakdown = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases)
+        message = f"Startup took {self.total():.3f}s ({breakdown})"
+        logger.info(message)
+        return message
+
+
+class StartupCache:
+    """Facts worth remembering between restarts, kept in a small JSON file.
+
+    Credential checks are stored by a hash of the secret, never the secret
+    itself, and expire after ``credential_ttl`` seconds. Index sets are
+    remembered per collection so existing indexes are not re-created.
+    """
+
+    def __init__(self, path: str, credential_ttl: float = 24 * 3600,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.credential_ttl = credential_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {'credentials': {}, 'indexes': {}}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                for section in self._state:
+                    self._state[section].update(loaded.get(section, {}))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable startup cache: {str(e)}")
+
+    @staticmethod
+    def _fingerprint(secret: str) -> str:
+        return hashlib.sha256(secret.encode('utf-8')).hexdigest()
+
+    def credentials_checked(self, name: str, secret: str) -> bool:
+        """Whether this exact secret passed its check within the TTL."""
+        with self._lock:
+            entry = self._state['credentials'].get(name)
+        return (
+            entry is not None
+            and entry.get('fingerprint') == self._fingerprint(secret)
+            and self._clock() - entry.get('checked_at', 0) < self.credential_ttl
+        )
+
+    def record_credentials(self, name: str, secret: str) -> None:
+        with self._lock:
+            self._state['credentials'][name] = {'fingerprint': self._fingerprint(secret), 'checked_at': self._clock()}
+        self._save()
+
+    def known_indexes(self, collection: str) -> Set[str]:
+        with self._lock:
+            return set(self._state['indexes'].get(collection, []))
+
+    def record_indexes(self, collection: str, names: Iterable[str]) -> None:
+        with self._lock:
+            known = set(self._state['indexes'].get(collection, []))
+            self._state['indexes'][collection] = sorted(known | set(names))
+        self._save()
+
+    def _save(self) -> None:
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._state, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write startup cache: {str(e)}")
+
+
+class LazyClient:
+    """Stand-in for a client that is only built on first attribute access."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    @property
+    def created(self) -> bool:
+        return self._client is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
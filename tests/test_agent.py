@@ -5,15 +5,49 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import unittest
-from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
+from unittest.mock import Mock, MagicMock, patch
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+import threading
+import time
+import subprocess
+import tempfile
 import json
+import gzip
+import re
 from typing import Dict, List
 
-from src.nodes.fetchers import GitHubFetcher, HuggingFaceFetcher, ArxivFetcher
-from src.nodes.storage import Storage
+from github import RateLimitExceededException
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from src.nodes.fetchers import GitHubFetcher, HuggingFaceFetcher, ArxivFetcher, RepoMetadata
+from src.nodes.storage import Storage, SummaryWriter, summary_key, content_hash
 from src.nodes.summarizer import Summarizer
-from src.nodes.tagger import Tagger
+from src.nodes.tagger import Tagger, KeywordMatcher, TaggedContent
+from src.nodes.trend_engine import TrendEngine, SpaceSaving
+from src.nodes.watermarks import WatermarkStore
+from src.nodes.work_leases import WorkLeases
+from src.nodes.readme_enricher import ReadmeEnricher, markdown_to_text
+from src.nodes.arxiv_backfill import ArxivBackfill, ArxivOAIHarvester, BackfillCheckpoint
+from src.utils.rate_limiter import TokenBucket, GitHubRateLimiter
+from src.utils.github_graphql import GitHubGraphQLLoader, GraphQLUnavailableError
+from src.utils.github_query_planner import GitHubQueryPlanner
+from src.utils.http_cache import HttpCache
+from src.utils.http_transport import HttpTransport, transport_session
+from src.utils.quota_scheduler import QuotaScheduler, SourceDeferred
+from src.utils.model_detail_cache import ModelDetailCache
+from src.utils.atom_parser import iter_atom_entries
+from src.utils.fetch_phase import FetchPhase, FetchJob
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.cadence import CadenceScheduler, SourceCadence
+from src.utils.cycle_journal import CycleJournal
+from src.utils.startup import LazyClient, StartupCache, StartupTimer
+from src.main import AIDiscoveryAgent, SourceFeed, WorkItem
+from src.scripts.backfill_arxiv import build_summary
+from src.utils.db_config import DatabaseConfig, get_db_config
 
 class MockResponse:
     def __init__(self, json_data):
@@ -46,6 +80,665 @@ class TestGitHubFetcher(unittest.TestCase):
         self.assertEqual(len(repos), 1)
         self.assertEqual(repos[0].name, "test-repo")
 
+    def _create_mock_repo(self, name, stars):
+        mock_repo = Mock()
+        mock_repo.name = name
+        mock_repo.full_name = f"user/{name}"
+        mock_repo.description = f"{name} repository"
+        mock_repo.stargazers_count = stars
+        mock_repo.created_at = datetime.now()
+        mock_repo.updated_at = datetime.now()
+        mock_repo.get_topics.return_value = ["ai"]
+        mock_repo.html_url = f"https://github.com/user/{name}"
+        mock_repo.language = "Python"
+        return mock_repo
+
+    def test_fetch_trending_repos_concurrent_matches_sequential(self):
+        shared = self._create_mock_repo("shared", 50)
+        results = {
+            "llm": [self._create_mock_repo("a", 10), shared, self._create_mock_repo("b", 50)],
+            "rl": [shared, self._create_mock_repo("c", 70)],
+        }
+        quota = SimpleNamespace(remaining=5000, reset=None)
+        self.mock_github_client.get_rate_limit.return_value = SimpleNamespace(core=quota, search=quota)
+        self.mock_github_client.search_repositories.side_effect = (
+            lambda query, sort, order: results[query.split()[0]]
+        )
+
+        with patch('src.nodes.fetchers.time.sleep'):
+            sequential = self.fetcher.fetch_trending_repos(["llm", "rl"])
+        concurrent = self.fetcher.fetch_trending_repos(["llm", "rl"], concurrent=True)
+
+        self.assertEqual([r.full_name for r in concurrent], [r.full_name for r in sequential])
+        self.assertEqual([r.full_name for r in concurrent], ["user/c", "user/shared", "user/b", "user/a"])
+        # The shared repo is only enriched once per fetch
+        self.assertEqual(shared.get_topics.call_count, 2)
+
+    def test_every_fetch_searches_the_whole_window(self):
+        # Star-sorted search has no created-order watermark, so known repos come back every cycle
+        repo = self._create_mock_repo("a", 10)
+        quota = SimpleNamespace(remaining=5000, reset=None)
+        self.mock_github_client.get_rate_limit.return_value = SimpleNamespace(core=quota, search=quota)
+        self.mock_github_client.search_repositories.return_value = [repo]
+        window_start = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
+
+        first = self.fetcher.fetch_trending_repos(["llm"], concurrent=True)
+        second = self.fetcher.fetch_trending_repos(["llm"], concurrent=True)
+
+        self.assertEqual([r.full_name for r in first], ["user/a"])
+        self.assertEqual([r.full_name for r in second], ["user/a"])
+        for call in self.mock_github_client.search_repositories.call_args_list:
+            self.assertIn(f"created:>{window_start}", call.kwargs['query'])
+
+    def test_fetch_trending_repos_uses_graphql_batch(self):
+        repos = [self._create_mock_repo("a", 10), self._create_mock_repo("b", 20)]
+        self.mock_github_client.search_repositories.return_value = repos
+        loader = Mock()
+        loader.load.return_value = {
+            "user/a": {'stars': 15, 'language': 'Python', 'topics': ['llm'],
+                       'readme': '# A', 'readme_sha': 'abc'}
+        }
+        fetcher = GitHubFetcher(self.mock_github_client, graphql_loader=loader)
+
+        result = fetcher.fetch_trending_repos(["llm"], concurrent=True)
+
+        loader.load.assert_called_once_with(["user/a", "user/b"])
+        self.assertEqual([r.full_name for r in result], ["user/b", "user/a"])
+        self.assertEqual(result[1].topics, ['llm'])
+        self.assertEqual(result[1].readme, '# A')
+        repos[0].get_topics.assert_not_called()
+        # Repos GraphQL did not resolve fall back to REST
+        repos[1].get_topics.assert_called_once()
+
+    def test_fetch_trending_repos_falls_back_to_rest(self):
+        repo = self._create_mock_repo("a", 10)
+        self.mock_github_client.search_repositories.return_value = [repo]
+        loader = Mock()
+        loader.load.side_effect = GraphQLUnavailableError("down")
+        fetcher = GitHubFetcher(self.mock_github_client, graphql_loader=loader)
+
+        result = fetcher.fetch_trending_repos(["llm"], concurrent=True)
+
+        self.assertEqual(result[0].topics, ["ai"])
+        repo.get_topics.assert_called_once()
+
+
+    def test_rate_limit_defers_source_instead_of_sleeping(self):
+        self.mock_github_client.search_repositories.side_effect = RateLimitExceededException(
+            403, {'message': 'rate limit'}, {'X-RateLimit-Reset': '1700000000'}
+        )
+
+        with patch('src.nodes.fetchers.time.sleep') as mock_sleep:
+            with self.assertRaises(SourceDeferred) as context:
+                self.fetcher.fetch_trending_repos(["llm"], concurrent=True)
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(context.exception.source, 'github')
+        self.assertEqual(context.exception.resume_at.timestamp(), 1700000000)
+        self.assertIsNotNone(context.exception.resume)
+
+
+class FakePaginatedList:
+    def __init__(self, repos, per_page):
+        self.repos = repos
+        self.per_page = per_page
+        self.pages_requested = []
+
+    def get_page(self, index):
+        self.pages_requested.append(index)
+        return self.repos[index * self.per_page:(index + 1) * self.per_page]
+
+
+class TestGitHubQueryPlanner(unittest.TestCase):
+    def test_plan_respects_operator_and_length_limits(self):
+        planner = GitHubQueryPlanner()
+        keywords = [f"topic-{i}" for i in range(40)] + ["a" * 150, "b" * 150]
+
+        plan = planner.plan(keywords)
+
+        for query in plan.queries:
+            self.assertLessEqual(query.terms.count(" OR "), GitHubQueryPlanner.MAX_OPERATORS)
+            self.assertLessEqual(
+                len(query.terms) + GitHubQueryPlanner.RESERVED_QUALIFIER_LENGTH,
+                GitHubQueryPlanner.MAX_QUERY_LENGTH
+            )
+        self.assertEqual(sum(len(q.keywords) for q in plan.queries), len(keywords))
+        self.assertEqual(len(plan.queries), 9)
+
+    def test_leased_query_groups_are_not_split_further(self):
+        planner = GitHubQueryPlanner()
+        keywords = [f"topic-{i}" for i in range(40)]
+        groups = [query.key for query in planner.plan(keywords).queries]
+
+        # A process claiming any two groups searches them with at most two queries
+        for first, second in [(groups[0], groups[1]), (groups[0], groups[-1])]:
+            claimed = [keyword for unit in (first, second) for keyword in unit.split(',')]
+            self.assertLessEqual(len(planner.plan(claimed).queries), 2)
+
+    def test_topic_terms(self):
+        plan = GitHubQueryPlanner(use_topics=True).plan(["llm", "neural networks"])
+        self.assertEqual(plan.queries[0].terms, "topic:llm OR topic:neural-networks")
+
+    def test_planned_fetch_streams_pages_and_counts_requests(self):
+        repos = [TestGitHubFetcher._create_mock_repo(None, f"repo-{i}", 500 - i) for i in range(150)]
+        results = FakePaginatedList(repos, per_page=100)
+        client = Mock()
+        client.search_repositories.return_value = results
+        fetcher = GitHubFetcher(client, query_planner=GitHubQueryPlanner(results_per_keyword=20))
+
+        with patch('src.nodes.fetchers.time.sleep'):
+            fetched = fetcher.fetch_trending_repos([f"kw-{i}" for i in range(6)])
+
+        client.search_repositories.assert_called_once()
+        self.assertIn("kw-0 OR kw-1", client.search_repositories.call_args[1]['query'])
+        self.assertEqual(len(fetched), 120)
+        self.assertEqual(results.pages_requested, [0, 1])
+        self.assertEqual(fetcher.last_plan.requests_used, 2)
+
+    def test_failing_planned_query_keeps_the_other_queries_hits(self):
+        client = Mock()
+        client.search_repositories.side_effect = lambda query, sort, order: (
+            Mock(get_page=Mock(side_effect=RuntimeError("502 Bad Gateway"))) if query.startswith("kw-0 ")
+            else [TestGitHubFetcher._create_mock_repo(None, "kept", 50)]
+        )
+        fetcher = GitHubFetcher(client, query_planner=GitHubQueryPlanner())
+
+        with patch('src.nodes.fetchers.time.sleep'):
+            # Eight keywords make two OR-combined queries; the first one fails
+            fetched = fetcher.fetch_trending_repos([f"kw-{i}" for i in range(8)])
+
+        self.assertEqual(client.search_repositories.call_count, 2)
+        self.assertEqual([repo.full_name for repo in fetched], ["user/kept"])
+        self.assertEqual(fetcher.last_plan.estimated_requests, 2)
+
+
+class TestQuotaScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = QuotaScheduler()
+        self.resumed = threading.Event()
+        self.results = []
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def _on_resume(self, items, done=True):
+        self.results.append((items, done))
+        if done:
+            self.resumed.set()
+
+    def test_parked_source_resumes_without_blocking(self):
+        def exhausted():
+            raise SourceDeferred(
+                'github',
+                datetime.now(timezone.utc) + timedelta(seconds=0.2),
+                partial=['first'],
+                resume=lambda: ['rest']
+            )
+
+        result = self.scheduler.submit('github', exhausted, self._on_resume, default=[])
+        self.assertEqual(result, ['first'])
+        self.assertTrue(self.scheduler.is_parked('github'))
+
+        # Other sources keep running while github is parked
+        self.assertEqual(self.scheduler.submit('arxiv', lambda: ['paper'], self._on_resume), ['paper'])
+        skipped = Mock()
+        self.assertEqual(self.scheduler.submit('github', skipped, self._on_resume, default=[]), [])
+        skipped.assert_not_called()
+
+        self.assertTrue(self.resumed.wait(5))
+        self.assertEqual(self.results, [(['rest'], True)])
+        self.assertTrue(self._wait_unparked('github'))
+        self.assertGreater(self.scheduler.parked_seconds()['github'], 0)
+
+    def test_source_stays_parked_until_its_resumed_work_is_processed(self):
+        release = threading.Event()
+        submitted = []
+
+        def on_resume(items, done=True):
+            # A new cycle submitting the source meanwhile must not fetch it again
+            submitted.append(self.scheduler.submit('github', lambda: ['again'], self._on_resume, default=[]))
+            release.wait(5)
+
+        def exhausted():
+            raise SourceDeferred('github', datetime.now(timezone.utc), resume=lambda: ['rest'])
+
+        self.scheduler.submit('github', exhausted, on_resume, default=[])
+        for _ in range(500):
+            if submitted:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(submitted, [[]])
+        self.assertTrue(self.scheduler.is_parked('github'))
+        release.set()
+        self.assertTrue(self._wait_unparked('github'))
+
+    def test_partial_results_of_a_resumed_source_are_not_done(self):
+        calls = []
+
+        def resume():
+            if not calls:
+                calls.append('deferred again')
+                raise SourceDeferred('github', datetime.now(timezone.utc), partial=['some'], resume=resume)
+            return ['rest']
+
+        def exhausted():
+            raise SourceDeferred('github', datetime.now(timezone.utc), resume=resume)
+
+        self.scheduler.submit('github', exhausted, self._on_resume, default=[])
+
+        self.assertTrue(self.resumed.wait(5))
+        self.assertEqual(self.results, [(['some'], False), (['rest'], True)])
+
+    def _wait_unparked(self, source):
+        for _ in range(500):
+            if not self.scheduler.is_parked(source):
+                return True
+            time.sleep(0.01)
+        return False
+
+
+class TestFetchPhase(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = QuotaScheduler()
+        self.phase = FetchPhase(self.scheduler, default_timeout=5)
+
+    def tearDown(self):
+        self.phase.shutdown()
+        self.scheduler.shutdown()
+
+    @staticmethod
+    def _slow(items, seconds=0.2):
+        def work():
+            time.sleep(seconds)
+            return items
+        return work
+
+    def test_sources_fetch_in_parallel_and_failures_stay_isolated(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        started = time.monotonic()
+        results = self.phase.run([
+            FetchJob('github', self._slow(['repo']), Mock(), default=[]),
+            FetchJob('huggingface', self._slow(['model']), Mock(), default=[]),
+            FetchJob('arxiv', broken, Mock(), default=[]),
+        ])
+
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(results['github'].items, ['repo'])
+        self.assertEqual(results['huggingface'].status, 'ok')
+        self.assertEqual((results['arxiv'].status, results['arxiv'].items), ('error', []))
+        self.assertGreaterEqual(results['github'].seconds, 0.2)
+
+    def test_late_fetch_is_processed_when_ready_and_not_overlapped(self):
+        processed = threading.Event()
+        late_items = []
+
+        def on_resume(items, done=True):
+            late_items.append(items)
+            processed.set()
+
+        results = self.phase.run([FetchJob('arxiv', self._slow(['paper'], 0.3), on_resume, default=[], timeout=0.05)])
+        self.assertEqual((results['arxiv'].status, results['arxiv'].items), ('timeout', []))
+
+        again = Mock()
+        self.assertEqual(self.phase.run([FetchJob('arxiv', again, on_resume, default=[])])['arxiv'].status, 'busy')
+        again.assert_not_called()
+
+        self.assertTrue(processed.wait(5))
+        self.assertEqual(late_items, [['paper']])
+
+    def test_results_arrive_as_each_source_finishes(self):
+        order = [result.source for result in self.phase.iter_results([
+            FetchJob('arxiv', self._slow(['paper'], 0.3), Mock(), default=[]),
+            FetchJob('github', self._slow(['repo'], 0.05), Mock(), default=[]),
+        ])]
+        self.assertEqual(order, ['github', 'arxiv'])
+
+
+class TestPipeline(unittest.TestCase):
+    def test_items_flow_through_stages_and_failures_stay_isolated(self):
+        stored = []
+        lock = threading.Lock()
+
+        def double(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item * 2
+
+        def store(item):
+            with lock:
+                stored.append(item)
+
+        pipeline = Pipeline([
+            PipelineStage('double', double, workers=3, queue_size=2),
+            PipelineStage('increment', lambda item: item + 1, workers=2, queue_size=2),
+            PipelineStage('store', store, queue_size=2)
+        ]).start()
+        try:
+            self.assertEqual(pipeline.feed(range(10)), 10)
+            pipeline.drain()
+        finally:
+            pipeline.shutdown()
+
+        self.assertEqual(sorted(stored), [i * 2 + 1 for i in range(10) if i != 3])
+        stats = pipeline.stats()
+        self.assertEqual((stats['double']['processed'], stats['double']['errors']), (10, 1))
+        self.assertEqual(stats['store']['processed'], 9)
+        self.assertEqual(stats['store']['queue_depth'], 0)
+        self.assertGreater(stats['increment']['avg_latency'], 0)
+
+    def test_full_queue_blocks_the_producer(self):
+        release = threading.Event()
+        pipeline = Pipeline([PipelineStage('slow', lambda item: release.wait(5), queue_size=2)]).start()
+        fed = []
+
+        def produce():
+            for item in range(10):
+                pipeline.put(item)
+                fed.append(item)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        time.sleep(0.2)
+        # One item in the worker and two queued; the producer waits for room
+        self.assertEqual(len(fed), 3)
+        self.assertEqual(pipeline.stats()['slow']['max_queue_depth'], 2)
+
+        release.set()
+        producer.join(5)
+        pipeline.shutdown()
+        self.assertEqual(len(fed), 10)
+        self.assertEqual(pipeline.stats()['slow']['processed'], 10)
+
+
+class TestCadenceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.scheduler = CadenceScheduler([
+            SourceCadence('huggingface', 600),
+            SourceCadence('github', 3600, max_backoff=4),
+            SourceCadence('arxiv', 86400, anchor=5400, max_backoff=1)
+        ], clock=lambda: self.now)
+
+    def test_every_source_runs_at_startup_then_on_its_own_cadence(self):
+        self.assertEqual(sorted(self.scheduler.due()), ['arxiv', 'github', 'huggingface'])
+        for source in ('huggingface', 'github', 'arxiv'):
+            self.scheduler.record(source, 5, now=1030.0)
+
+        self.assertEqual(self.scheduler.due(now=1599.0), [])
+        self.assertEqual(self.scheduler.due(now=1600.0), ['huggingface'])
+        self.assertEqual(self.scheduler.due(now=4600.0), ['huggingface', 'github'])
+        # Anchored to the daily listing slot, not to when it last ran
+        self.assertEqual(self.scheduler.seconds_until_due(now=1030.0), 570.0)
+        self.assertEqual(self.scheduler._state['arxiv'].next_due, 5400.0)
+
+    def test_schedule_does_not_drift_and_skips_missed_slots(self):
+        # A slow cycle does not push the next run back
+        self.scheduler.record('huggingface', 3, now=1400.0)
+        self.assertEqual(self.scheduler._state['huggingface'].next_due, 1600.0)
+        # A cycle that overran two slots resumes on the next future slot
+        self.scheduler.record('huggingface', 3, now=3000.0)
+        self.assertEqual(self.scheduler._state['huggingface'].next_due, 3400.0)
+
+    def test_idle_source_backs_off_and_recovers(self):
+        self.scheduler.record('github', 0, now=1000.0)
+        self.assertEqual(self.scheduler._state['github'].next_due, 1000.0 + 2 * 3600)
+        self.scheduler.record('github', 0, now=8200.0)
+        self.scheduler.record('github', 0, now=22600.0)
+        self.assertEqual(self.scheduler._state['github'].multiplier, 4)
+        self.scheduler.record('github', 2, now=37000.0)
+        self.assertEqual(self.scheduler._state['github'].multiplier, 1)
+        # The daily listing never backs off
+        self.scheduler.record('arxiv', 0, now=1000.0)
+        self.assertEqual(self.scheduler._state['arxiv'].multiplier, 1)
+
+    def test_failed_source_retries_soon(self):
+        self.scheduler.record('github', None, now=1000.0)
+        self.assertEqual(self.scheduler._state['github'].next_due, 1300.0)
+
+    def test_cycles_never_overlap(self):
+        running = []
+        overlaps = []
+        calls = []
+
+        def cycle(sources):
+            overlaps.append(bool(running))
+            running.append(1)
+            calls.append(list(sources))
+            time.sleep(0.01)
+            running.pop()
+            if len(calls) == 3:
+                self.scheduler.stop()
+            return {source: None for source in sources}
+
+        scheduler = CadenceScheduler([SourceCadence('a', 0.02), SourceCadence('b', 0.03)], retry_delay=0.01)
+        self.scheduler = scheduler
+        worker = threading.Thread(target=scheduler.run, args=(cycle,), daemon=True)
+        worker.start()
+        worker.join(5)
+
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[0], ['a', 'b'])
+        self.assertFalse(any(overlaps))
+
+
+class TestStartup(unittest.TestCase):
+    def test_credential_checks_expire_and_follow_the_token(self):
+        now = [1000.0]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'startup.json')
+            cache = StartupCache(path, credential_ttl=60, clock=lambda: now[0])
+            self.assertFalse(cache.credentials_checked('github', 'ghp_secret'))
+            cache.record_credentials('github', 'ghp_secret')
+
+            reloaded = StartupCache(path, credential_ttl=60, clock=lambda: now[0])
+            self.assertTrue(reloaded.credentials_checked('github', 'ghp_secret'))
+            self.assertFalse(reloaded.credentials_checked('github', 'ghp_rotated'))
+            with open(path) as f:
+                self.assertNotIn('ghp_secret', f.read())
+
+            now[0] += 61
+            self.assertFalse(reloaded.credentials_checked('github', 'ghp_secret'))
+
+    def test_lazy_client_is_built_on_first_use(self):
+        factory = Mock(return_value=SimpleNamespace(whoami=lambda: 'me'))
+        client = LazyClient(factory)
+        factory.assert_not_called()
+        self.assertFalse(client.created)
+        self.assertEqual(client.whoami(), 'me')
+        client.whoami()
+        factory.assert_called_once_with()
+
+    def test_timer_reports_each_phase(self):
+        ticks = iter([0.0, 0.0, 0.5, 0.5, 2.0, 2.0])
+        timer = StartupTimer(clock=lambda: next(ticks))
+        with timer.phase('auth'):
+            pass
+        with timer.phase('database'):
+            pass
+        self.assertEqual(timer.report(), "Startup took 2.000s (auth 0.500s, database 1.500s)")
+
+    def test_database_follows_the_callers_fast_start_flag(self):
+        for fast_start, env in ((True, '0'), (False, '1')):
+            with patch.object(DatabaseConfig, '_instance', None), \
+                 patch.object(DatabaseConfig, '_client', None), \
+                 patch.dict(os.environ, {'FAST_START': env}), \
+                 patch('pymongo.MongoClient') as client_class:
+                config = get_db_config(fast_start=fast_start)
+                self.assertEqual(config.fast_start, fast_start)
+                # Only the eager start pings the server
+                self.assertEqual(client_class.return_value.server_info.called, not fast_start)
+
+
+class TestImportBudget(unittest.TestCase):
+    """Entry points must import quickly and leave heavy SDKs for first use."""
+
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    # Cumulative import time per entry point in microseconds, about 3x a warm local run;
+    # IMPORT_BUDGET_SCALE stretches them on slow machines
+    BUDGETS_US = {
+        'src.main': 350_000,
+        'src.scripts.backfill_arxiv': 350_000,
+        'src.scripts.generate_digests': 100_000,
+    }
+    HEAVY_SDKS = ('github', 'pymongo', 'bson', 'google.generativeai', 'transformers', 'torch')
+
+    def _import_times(self, module):
+        """Cumulative import time per module name from ``python -X importtime``."""
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+            cwd=self.PROJECT_ROOT, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        times = {}
+        for line in result.stderr.splitlines():
+            parts = line.split('|')
+            if line.startswith('import time:') and len(parts) == 3 and parts[1].strip().isdigit():
+                times[parts[2].strip()] = int(parts[1])
+        return times
+
+    def test_entry_points_stay_within_import_budget(self):
+        scale = float(os.getenv('IMPORT_BUDGET_SCALE', '1'))
+        for module, budget in self.BUDGETS_US.items():
+            with self.subTest(module=module):
+                times = self._import_times(module)
+                loaded = [sdk for sdk in self.HEAVY_SDKS if sdk in times]
+                self.assertEqual(loaded, [], f"{module} imports {loaded} at import time")
+                self.assertLessEqual(
+                    times[module], budget * scale,
+                    f"{module} took {times[module] / 1000:.0f} ms to import (budget {budget * scale / 1000:.0f} ms)"
+                )
+
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    repositories = {}
+    requests_seen = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        StubGraphQLHandler.requests_seen.append(body)
+        data = {}
+        for alias, owner, name in re.findall(r'(r\d+): repository\(owner: "(.*?)", name: "(.*?)"\)', body['query']):
+            data[alias] = self.repositories.get(f"{owner}/{name}")
+        payload = json.dumps({'data': data}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestGitHubGraphQLLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StubGraphQLHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}/graphql"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubGraphQLHandler.requests_seen = []
+        StubGraphQLHandler.repositories = {
+            f"user/repo-{i}": {
+                'nameWithOwner': f"user/repo-{i}",
+                'stargazerCount': i,
+                'primaryLanguage': {'name': 'Python'},
+                'repositoryTopics': {'nodes': [{'topic': {'name': 'llm'}}]},
+                'rootTree': {'entries': [
+                    {'name': 'LICENSE', 'oid': f"license-{i}", 'type': 'blob'},
+                    {'name': 'README.md', 'oid': f"sha-{i}", 'type': 'blob'},
+                ]},
+                'readme': {'oid': f"sha-{i}", 'text': f"# repo {i}"}
+            }
+            for i in range(150)
+        }
+
+    def test_load_batches_up_to_100_repos_per_request(self):
+        loader = GitHubGraphQLLoader("token", endpoint=self.endpoint)
+        names = [f"user/repo-{i}" for i in range(150)] + ["user/missing"]
+
+        metadata = loader.load(names)
+
+        self.assertEqual(len(StubGraphQLHandler.requests_seen), 2)
+        self.assertEqual(len(metadata), 150)
+        self.assertNotIn("user/missing", metadata)
+        self.assertEqual(metadata["user/repo-7"]['topics'], ['llm'])
+        self.assertEqual(metadata["user/repo-7"]['readme_sha'], 'sha-7')
+
+    def test_readme_sha_is_found_whatever_the_readme_is_called(self):
+        StubGraphQLHandler.repositories["user/repo-1"].update(
+            rootTree={'entries': [
+                {'name': 'docs', 'oid': 'tree-1', 'type': 'tree'},
+                {'name': 'Readme.rst', 'oid': 'rst-1', 'type': 'blob'},
+            ]},
+            readme=None
+        )
+        loader = GitHubGraphQLLoader("token", endpoint=self.endpoint)
+
+        metadata = loader.load(["user/repo-1", "user/repo-2"])
+
+        self.assertEqual(metadata["user/repo-1"]['readme_sha'], 'rst-1')
+        # Left for the enricher to download by SHA
+        self.assertEqual(metadata["user/repo-1"]['readme'], "")
+        self.assertEqual(metadata["user/repo-2"]['readme'], "# repo 2")
+
+    def test_readme_text_can_be_left_to_the_enricher(self):
+        loader = GitHubGraphQLLoader("token", endpoint=self.endpoint, fetch_readme_text=False)
+        loader.load(["user/repo-1"])
+
+        query = StubGraphQLHandler.requests_seen[0]['query']
+        self.assertIn("oid", query)
+        self.assertNotIn("text", query)
+
+    def test_unreachable_endpoint_raises_unavailable(self):
+        loader = GitHubGraphQLLoader("token", endpoint="http://127.0.0.1:1/graphql", timeout=1)
+        with self.assertRaises(GraphQLUnavailableError):
+            loader.load(["user/repo-1"])
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def _clock(self):
+        return self.now
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(rate=0.5, capacity=2, clock=self._clock, sleep=self._sleep)
+        self.assertTrue(bucket.acquire())
+        self.assertTrue(bucket.acquire())
+        self.assertTrue(bucket.acquire())
+        self.assertEqual(self.sleeps, [2.0])
+
+    def test_acquire_timeout(self):
+        bucket = TokenBucket(rate=0.1, capacity=1, clock=self._clock, sleep=self._sleep)
+        bucket.acquire()
+        self.assertFalse(bucket.acquire(timeout=1))
+
+    def test_sync_clamps_to_remaining_quota(self):
+        limiter = GitHubRateLimiter(clock=self._clock, sleep=self._sleep)
+        limiter.sync(SimpleNamespace(
+            core=SimpleNamespace(remaining=3),
+            search=SimpleNamespace(remaining=0)
+        ))
+        self.assertEqual(limiter.core.available, 3)
+        self.assertFalse(limiter.search.try_acquire())
+
 class TestHuggingFaceFetcher(unittest.TestCase):
     def setUp(self):
         self.mock_api_client = Mock()
@@ -82,8 +775,100 @@ class TestHuggingFaceFetcher(unittest.TestCase):
         self.assertEqual(models[0]['name'], 'Test Model')
         self.assertIn('model_card', models[0]['details'])
 
+    def test_bulk_mode_takes_details_from_expanded_listing(self):
+        self.mock_api_client.list_models.return_value = [
+            SimpleNamespace(modelId=f"org/model-{i}", tags=['nlp', 'license:mit'], pipeline_tag='text-generation',
+                            card_data={'language': 'en'}, lastModified=None, downloads=i)
+            for i in range(5)
+        ]
+
+        models = list(self.fetcher.fetch_latest_models(limit=5, bulk=True))
+
+        self.assertEqual(len(models), 5)
+        self.assertEqual(models[0]['details']['model_card']['license'], 'mit')
+        self.assertEqual(models[0]['details']['model_card']['pipeline_tag'], 'text-generation')
+        self.mock_api_client.model_info.assert_not_called()
+        self.assertTrue(self.mock_api_client.list_models.call_args.kwargs['cardData'])
+
+    def test_bulk_mode_looks_up_only_undescribed_models(self):
+        self.mock_api_client.list_models.return_value = [
+            SimpleNamespace(modelId="org/listed", tags=['nlp'], pipeline_tag=None, card_data=None),
+            SimpleNamespace(modelId="org/bare", tags=None)
+        ]
+        self.mock_api_client.model_info.return_value = SimpleNamespace(tags=['vision'])
+
+        models = {model['id']: model for model in self.fetcher.fetch_latest_models(limit=2, bulk=True)}
+
+        self.mock_api_client.model_info.assert_called_once_with("org/bare")
+        self.assertEqual(models["org/bare"]['details']['tags'], ['vision'])
+        self.assertEqual(models["org/listed"]['details']['tags'], ['nlp'])
+
+    def test_bulk_mode_yields_before_listing_ends(self):
+        listed = []
+
+        def listing(**kwargs):
+            for i in range(3):
+                listed.append(i)
+                yield SimpleNamespace(modelId=f"org/model-{i}", tags=[], card_data=None)
+
+        self.mock_api_client.list_models.side_effect = listing
+        models = self.fetcher.fetch_latest_models(limit=3, bulk=True)
+
+        self.assertEqual(next(models)['id'], "org/model-0")
+        self.assertEqual(listed, [0])
+
+class TestModelDetailCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.cache_dir.name, "models.json")
+        self.api_client = Mock()
+        self.api_client.model_info.return_value = SimpleNamespace(tags=['nlp'], pipeline_tag='fill-mask')
+        self.api_client.list_models.return_value = [SimpleNamespace(modelId="org/model", sha="abc")]
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_unchanged_model_skips_model_info_across_restarts(self):
+        cache = ModelDetailCache(self.path)
+        HuggingFaceFetcher(self.api_client, detail_cache=cache).fetch_latest_models(limit=1)
+
+        cache = ModelDetailCache(self.path)
+        models = HuggingFaceFetcher(self.api_client, detail_cache=cache).fetch_latest_models(limit=1)
+
+        self.assertEqual(self.api_client.model_info.call_count, 1)
+        self.assertEqual(models[0]['details']['model_card']['pipeline_tag'], 'fill-mask')
+        self.assertEqual(cache.stats()['hit_rate'], 1.0)
+
+    def test_new_revision_is_fetched_again(self):
+        fetcher = HuggingFaceFetcher(self.api_client, detail_cache=ModelDetailCache(self.path))
+        fetcher.fetch_latest_models(limit=1)
+        self.api_client.list_models.return_value = [SimpleNamespace(modelId="org/model", sha="def")]
+
+        fetcher.fetch_latest_models(limit=1)
+
+        self.assertEqual(self.api_client.model_info.call_count, 2)
+
+    def test_eviction_bounds_entries(self):
+        cache = ModelDetailCache(self.path, max_entries=2)
+        for i in range(3):
+            cache.put(f"org/model-{i}", "sha", {'tags': []})
+
+        self.assertIsNone(cache.get("org/model-0", "sha"))
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_failed_write_is_retried_on_the_next_flush(self):
+        cache = ModelDetailCache(self.path)
+        cache.put("org/model", "sha", {'tags': []})
+        with patch('src.utils.model_detail_cache.os.replace', side_effect=OSError("disk full")):
+            cache.flush()
+        cache.flush()
+
+        self.assertEqual(ModelDetailCache(self.path).get("org/model", "sha"), {'tags': []})
+
+
 class TestArxivFetcher(unittest.TestCase):
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_latest_papers(self, mock_get):
         mock_xml = """<?xml version="1.0" encoding="UTF-8"?>
         <feed xmlns="http://www.w3.org/2005/Atom">
@@ -102,6 +887,806 @@ class TestArxivFetcher(unittest.TestCase):
         self.assertEqual(len(papers), 1)
         self.assertEqual(papers[0]['title'], 'Test Paper')
 
+    @patch('src.nodes.fetchers.time.sleep')
+    def test_combined_pages_stream_and_category_pages_use_the_http_cache(self, mock_sleep):
+        watermarks = Mock()
+        watermarks.get.return_value = {'last_seen': datetime(2024, 1, 1, tzinfo=timezone.utc), 'last_ids': []}
+        fetcher = ArxivFetcher(watermarks=watermarks)
+        feed = make_atom_feed([('2401.1', '2024-01-02T00:00:00Z')])
+        fetcher._make_request = Mock(return_value=feed)
+
+        fetcher.fetch_latest_papers(['cs.AI'], combined=True, max_results=ArxivFetcher.COMBINED_PAGE_SIZE)
+        fetcher.fetch_latest_papers(['cs.AI'])
+
+        (combined, _), (category, _) = fetcher._make_request.call_args_list
+        self.assertIn(f"max_results={ArxivFetcher.COMBINED_PAGE_SIZE}", combined[0])
+        self.assertTrue(fetcher._make_request.call_args_list[0].kwargs['stream'])
+        self.assertIn(f"max_results={ArxivFetcher.PAGE_SIZE}", category[0])
+        self.assertFalse(fetcher._make_request.call_args_list[1].kwargs['stream'])
+
+    def test_streaming_parser_reads_chunked_feed(self):
+        feed = """<?xml version="1.0" encoding="UTF-8"?>
+        <feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+            <entry>
+                <id>http://arxiv.org/abs/2401.00001v1</id>
+                <published>2024-01-01T00:00:00Z</published>
+                <updated>2024-01-02T00:00:00Z</updated>
+                <title>First Paper</title>
+                <summary>First Summary</summary>
+                <author><name>Ada Lovelace</name></author>
+                <author><name>Alan Turing</name></author>
+                <link href="http://arxiv.org/abs/2401.00001v1" rel="alternate" type="text/html"/>
+                <arxiv:primary_category term="cs.AI"/>
+                <category term="cs.AI"/>
+                <category term="cs.LG"/>
+            </entry>
+            <entry>
+                <id>http://arxiv.org/abs/2401.00002v1</id>
+                <title>Second Paper</title>
+                <summary>Second Summary</summary>
+            </entry>
+        </feed>
+        """.encode()
+        chunks = [feed[i:i + 7] for i in range(0, len(feed), 7)]
+
+        papers = list(iter_atom_entries(chunks))
+
+        self.assertEqual([p['id'] for p in papers], ['2401.00001v1', '2401.00002v1'])
+        self.assertEqual(papers[0]['authors'], ['Ada Lovelace', 'Alan Turing'])
+        self.assertEqual(papers[0]['categories'], ['cs.AI', 'cs.LG'])
+        self.assertEqual(papers[0]['primary_category'], 'cs.AI')
+        self.assertEqual(papers[0]['updated'], '2024-01-02T00:00:00Z')
+        self.assertEqual(papers[1]['url'], 'https://arxiv.org/abs/2401.00002v1')
+
+    def test_streaming_parser_yields_entries_before_feed_ends(self):
+        def chunks():
+            yield make_atom_feed([('2401.1', '2024-01-01T00:00:00Z')]).replace('</feed>', '')
+            raise AssertionError("feed read past the first entry")
+
+        self.assertEqual(next(iter_atom_entries(chunks()))['id'], '2401.1')
+
+
+class StubConditionalHandler(BaseHTTPRequestHandler):
+    bodies = {}
+    full_responses = 0
+
+    def do_GET(self):
+        body = self.bodies.get(self.path, b'').encode()
+        etag = f'"{hash(body)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        StubConditionalHandler.full_responses += 1
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StubConditionalHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        StubConditionalHandler.full_responses = 0
+        StubConditionalHandler.bodies = {'/feed': 'x' * 100, '/other': 'y' * 100}
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_revalidated_response_is_served_from_cache(self):
+        session = transport_session(HttpCache(self.cache_dir.name))
+        first = session.get(f"{self.base_url}/feed")
+        second = session.get(f"{self.base_url}/feed")
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.text, first.text)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(StubConditionalHandler.full_responses, 1)
+
+    def test_changed_resource_is_downloaded_again(self):
+        cache = HttpCache(self.cache_dir.name)
+        session = transport_session(cache)
+        session.get(f"{self.base_url}/feed")
+        StubConditionalHandler.bodies['/feed'] = 'changed'
+
+        response = session.get(f"{self.base_url}/feed")
+
+        self.assertEqual(response.text, 'changed')
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_validators_persist_across_instances(self):
+        first = HttpCache(self.cache_dir.name)
+        transport_session(first).get(f"{self.base_url}/feed")
+        first.close()
+        cache = HttpCache(self.cache_dir.name)
+        transport_session(cache).get(f"{self.base_url}/feed")
+
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(StubConditionalHandler.full_responses, 1)
+
+    def test_index_is_written_on_flush_not_per_response(self):
+        cache = HttpCache(self.cache_dir.name)
+        session = transport_session(cache)
+        index_path = os.path.join(self.cache_dir.name, HttpCache.INDEX_FILE)
+        session.get(f"{self.base_url}/feed")
+        session.get(f"{self.base_url}/other")
+        self.assertFalse(os.path.exists(index_path))
+
+        cache.flush()
+        with open(index_path) as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_bodies_without_an_index_entry_are_removed(self):
+        # A crash before the flush leaves the body but not its index entry
+        transport_session(HttpCache(self.cache_dir.name)).get(f"{self.base_url}/feed")
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+
+        cache = HttpCache(self.cache_dir.name)
+
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_lru_eviction_bounds_size(self):
+        cache = HttpCache(self.cache_dir.name, max_bytes=150)
+        session = transport_session(cache)
+        session.get(f"{self.base_url}/feed")
+        session.get(f"{self.base_url}/other")
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], 150)
+
+
+class StubFlakyHandler(BaseHTTPRequestHandler):
+    # Number of 502 responses to send before succeeding
+    failures = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = StubFlakyHandler
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.01)
+        # Leave the in-flight count before replying so the client cannot start its next request first
+        with cls.lock:
+            cls.in_flight -= 1
+            failing = cls.failures > 0
+            cls.failures -= int(failing)
+        if failing:
+            self.send_response(502)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = gzip.compress(b'{"ok": true}' * 100)
+        self.send_response(200)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from socketserver import ThreadingMixIn
+
+        class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubFlakyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/data"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubFlakyHandler.failures = 0
+        StubFlakyHandler.max_in_flight = 0
+
+    def test_retries_and_bytes_are_counted_per_host(self):
+        StubFlakyHandler.failures = 1
+        transport = HttpTransport(backoff_factor=0)
+
+        response = transport.session.get(self.url)
+
+        self.assertTrue(response.text.startswith('{"ok": true}'))
+        stats = transport.stats()['127.0.0.1']
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['bytes'], 1200)
+        self.assertGreater(stats['avg_latency'], 0)
+
+    def test_connections_are_reused(self):
+        transport = HttpTransport()
+        for _ in range(3):
+            transport.session.get(self.url)
+
+        pools = transport.adapter.poolmanager.pools
+        self.assertEqual(len(pools), 1)
+        pool = pools[next(iter(pools.keys()))]
+        self.assertEqual((pool.num_connections, pool.num_requests), (1, 3))
+
+    def test_host_limit_caps_concurrent_requests(self):
+        transport = HttpTransport(host_limits={'127.0.0.1': 1})
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: transport.session.get(self.url), range(8)))
+
+        self.assertEqual(StubFlakyHandler.max_in_flight, 1)
+        self.assertEqual(transport.stats()['127.0.0.1']['requests'], 8)
+
+
+class StubReadmeHandler(BaseHTTPRequestHandler):
+    body = b''
+    requests_served = 0
+
+    def do_GET(self):
+        StubReadmeHandler.requests_served += 1
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestReadmeEnricher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StubReadmeHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubReadmeHandler.requests_served = 0
+        StubReadmeHandler.body = b"# Title\n\nA **fast** [library](https://x.y) &amp; `tool`.\n"
+
+    def test_markdown_to_text_strips_markup(self):
+        markdown = (
+            "# Title\n<p align=\"center\"><img src=\"badge.svg\"/></p>\n"
+            "Some **bold** and _it_ with [a link](http://x.y) and ![img](a.png).\n"
+            "```python\nprint(1)\n```\n- item_one\n> quote\n[ref]: http://x\n"
+        )
+        self.assertEqual(markdown_to_text(markdown),
+                         "Title Some bold and it with a link and . item_one quote")
+
+    def test_downloads_are_capped_and_cleaned(self):
+        StubReadmeHandler.body = b"word " * 10000
+        enricher = ReadmeEnricher(max_bytes=1024, api_url=self.base_url)
+        repo = SimpleNamespace(full_name="user/repo", readme="", readme_sha="")
+
+        enricher.enrich([repo])
+
+        self.assertLessEqual(len(repo.readme), 1024)
+        self.assertTrue(repo.readme.startswith("word word"))
+        self.assertEqual(len(repo.readme_sha), 40)
+
+    def test_unchanged_sha_skips_download(self):
+        enricher = ReadmeEnricher(api_url=self.base_url)
+        first = SimpleNamespace(full_name="user/repo", readme="", readme_sha="abc123")
+        second = SimpleNamespace(full_name="user/repo", readme="", readme_sha="abc123")
+
+        enricher.enrich([first])
+        enricher.enrich([second])
+
+        self.assertEqual(second.readme, "Title A fast library & tool .")
+        self.assertEqual(StubReadmeHandler.requests_served, 1)
+        self.assertEqual(enricher.stats()['hits'], 1)
+
+    def test_graphql_text_is_used_without_download(self):
+        enricher = ReadmeEnricher(api_url=self.base_url)
+        repo = SimpleNamespace(full_name="user/repo", readme="## Hello *world*", readme_sha="def456")
+
+        enricher.enrich([repo])
+
+        self.assertEqual(repo.readme, "Hello world")
+        self.assertEqual(StubReadmeHandler.requests_served, 0)
+
+    def test_cleaned_text_survives_a_restart(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            ReadmeEnricher(api_url=self.base_url, cache_dir=cache_dir).enrich(
+                [SimpleNamespace(full_name="user/repo", readme="", readme_sha="abc123")]
+            )
+            restarted = ReadmeEnricher(api_url=self.base_url, cache_dir=cache_dir, cache_size=1)
+            repo = SimpleNamespace(full_name="user/repo", readme="", readme_sha="abc123")
+            other = SimpleNamespace(full_name="user/other", readme="", readme_sha="def456")
+
+            restarted.enrich([repo])
+            self.assertEqual(repo.readme, "Title A fast library & tool .")
+            self.assertEqual(StubReadmeHandler.requests_served, 1)
+
+            # Beyond cache_size the least recently used file goes
+            os.utime(os.path.join(cache_dir, "abc123"), (0, 0))
+            restarted.enrich([other])
+            self.assertEqual(os.listdir(cache_dir), ["def456"])
+
+
+def make_atom_feed(entries):
+    body = "".join(
+        f"<entry><id>http://arxiv.org/abs/{paper_id}</id><title>Paper {paper_id}</title>"
+        f"<summary>Summary</summary><published>{published}</published>"
+        + "".join(f'<category term="{category}"/>' for category in categories)
+        + "</entry>"
+        for paper_id, published, *categories in entries
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{body}</feed>'
+
+
+def make_oai_page(records, token=None):
+    body = "".join(
+        f"<record><header><identifier>oai:arXiv.org:{paper_id}</identifier><datestamp>2024-01-0{day}</datestamp>"
+        f"</header><metadata><arXiv xmlns=\"http://arxiv.org/OAI/arXiv/\"><id>{paper_id}</id>"
+        f"<created>2024-01-0{day}</created><authors><author><keyname>Lovelace</keyname>"
+        f"<forenames>Ada</forenames></author></authors><title>Paper\n  {paper_id}</title>"
+        f"<categories>{categories}</categories><abstract> Abstract {paper_id} </abstract></arXiv></metadata></record>"
+        for paper_id, day, categories in records
+    )
+    token_element = f"<resumptionToken>{token}</resumptionToken>" if token else "<resumptionToken/>"
+    return (f'<?xml version="1.0"?><OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+            f"<ListRecords>{body}{token_element}</ListRecords></OAI-PMH>")
+
+
+class StubOAIHandler(BaseHTTPRequestHandler):
+    # Recorded pages keyed by set for the first request and by token afterwards
+    pages = {}
+    requests_seen = []
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        StubOAIHandler.requests_seen.append(params)
+        body = self.pages[params.get('resumptionToken') or params['set']].encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestArxivBackfill(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StubOAIHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}/oai2"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp.name, "checkpoint.json")
+        StubOAIHandler.requests_seen = []
+        StubOAIHandler.pages = {
+            'cs': make_oai_page([('2401.1', 1, 'cs.AI'), ('2401.2', 1, 'cs.LG stat.ML')], token='cs-2'),
+            'cs-2': make_oai_page([('2401.3', 2, 'cs.CL')]),
+            'stat': make_oai_page([('2401.2', 1, 'cs.LG stat.ML'), ('2401.4', 2, 'stat.ML'),
+                                   ('2401.5', 2, 'stat.ME')]),
+        }
+        self.batches = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _backfill(self, process_batch=None, batch_size=2):
+        return ArxivBackfill(
+            ArxivOAIHarvester(self.endpoint, request_interval=0),
+            BackfillCheckpoint(self.checkpoint_path),
+            process_batch or self.batches.append,
+            batch_size=batch_size
+        )
+
+    def test_follows_resumption_tokens_and_filters_sets(self):
+        processed = self._backfill().run('2024-01-01', '2024-01-02', ['cs', 'stat.ML'])
+
+        self.assertEqual(processed, {'cs': 3, 'stat.ML': 1})
+        ids = [[paper['id'] for paper in batch] for batch in self.batches]
+        self.assertEqual(ids, [['2401.1', '2401.2'], ['2401.3'], ['2401.4']])
+        self.assertEqual(self.batches[0][1]['title'], 'Paper 2401.2')
+        self.assertEqual(self.batches[0][0]['authors'], ['Ada Lovelace'])
+        self.assertEqual(StubOAIHandler.requests_seen[0]['from'], '2024-01-01')
+        self.assertEqual(StubOAIHandler.requests_seen[1], {'verb': 'ListRecords', 'resumptionToken': 'cs-2'})
+
+    def test_resumes_from_checkpoint_after_crash(self):
+        def crash_on_second_batch(papers):
+            if self.batches:
+                raise RuntimeError("crash")
+            self.batches.append(papers)
+
+        with self.assertRaises(RuntimeError):
+            self._backfill(crash_on_second_batch).run('2024-01-01', '2024-01-02', ['cs'])
+        StubOAIHandler.requests_seen = []
+
+        processed = self._backfill().run('2024-01-01', '2024-01-02', ['cs'])
+
+        self.assertEqual(processed, {'cs': 3})
+        self.assertEqual([paper['id'] for paper in self.batches[-1]], ['2401.3'])
+        self.assertEqual(StubOAIHandler.requests_seen, [{'verb': 'ListRecords', 'resumptionToken': 'cs-2'}])
+
+    def test_backfilled_paper_hashes_like_its_hourly_copy(self):
+        # The Atom API and OAI-PMH wrap the same title and abstract differently
+        hourly = next(iter_atom_entries("""<feed xmlns="http://www.w3.org/2005/Atom">
+            <entry>
+                <id>http://arxiv.org/abs/2401.00001v1</id>
+                <title>Paper
+    2401.00001</title>
+                <summary>
+  Abstract 2401.00001
+</summary>
+                <author><name>Ada Lovelace</name></author>
+            </entry>
+        </feed>"""))
+        StubOAIHandler.pages = {'cs': make_oai_page([('2401.00001', 1, 'cs.AI')])}
+        self._backfill().run('2024-01-01', '2024-01-02', ['cs'])
+        backfilled = self.batches[0][0]
+        summarizer = Mock()
+        summarizer.summarize_paper.return_value = SimpleNamespace(title='Paper', content='Summary')
+        tagger = Mock()
+        tagger.tag_content.return_value = TaggedContent(content_id='Paper', primary_category='research', tags=set(),
+                                                        relevance_scores={}, metadata={})
+
+        document = build_summary(backfilled, summarizer, tagger)
+
+        self.assertNotEqual(backfilled['summary'], hourly['summary'])
+        self.assertEqual(document['natural_key'], WorkItem('arxiv', hourly).key)
+        self.assertEqual(document['content_hash'], WorkItem('arxiv', hourly).content_hash)
+
+    def test_completed_job_is_not_harvested_again(self):
+        self._backfill().run('2024-01-01', '2024-01-02', ['cs'])
+        StubOAIHandler.requests_seen = []
+
+        self._backfill().run('2024-01-01', '2024-01-02', ['cs'])
+
+        self.assertEqual(StubOAIHandler.requests_seen, [])
+
+
+class TestWatermarks(unittest.TestCase):
+    def setUp(self):
+        self.mock_db = MagicMock()
+        self.store = WatermarkStore(self.mock_db)
+        self.collection = self.mock_db['fetch_watermarks']
+
+    def test_commit_keeps_newest_staged_mark(self):
+        older = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        newer = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        self.store.stage('arxiv', 'cs.AI', newer, ['2401.2'])
+        self.store.stage('arxiv', 'cs.AI', older, ['2401.1'])
+        self.store.stage('arxiv', 'cs.AI', newer, ['2401.3'])
+
+        self.assertEqual(self.store.commit(), 1)
+        update = self.collection.update_one.call_args
+        self.assertEqual(update[0][1]['$set']['last_seen'], newer)
+        self.assertEqual(update[0][1]['$set']['last_ids'], ['2401.2', '2401.3'])
+        self.assertTrue(update[1]['upsert'])
+
+    def test_discard_drops_staged_marks(self):
+        self.store.stage('arxiv', 'cs.AI', datetime.now(timezone.utc), ['1'])
+        self.store.discard()
+        self.assertEqual(self.store.commit(), 0)
+
+    def test_discard_can_drop_one_source(self):
+        self.store.stage('arxiv', 'cs.AI', datetime.now(timezone.utc), ['1'])
+        self.store.stage('github', 'llm', datetime.now(timezone.utc), ['user/repo'])
+        self.store.discard('arxiv')
+        self.assertEqual(self.store.commit(), 1)
+        self.assertEqual(self.collection.update_one.call_args[0][0]['source'], 'github')
+
+    @patch('src.nodes.fetchers.time.sleep')
+    def test_arxiv_pages_until_watermark(self, mock_sleep):
+        watermarks = Mock()
+        watermarks.get.return_value = {
+            'last_seen': datetime(2024, 1, 2, tzinfo=timezone.utc),
+            'last_ids': ['2401.3']
+        }
+        fetcher = ArxivFetcher(watermarks=watermarks)
+        fetcher.PAGE_SIZE = 2
+        pages = [
+            make_atom_feed([('2401.5', '2024-01-04T00:00:00Z'), ('2401.4', '2024-01-03T00:00:00Z')]),
+            make_atom_feed([('2401.3', '2024-01-02T00:00:00Z'), ('2401.2', '2024-01-01T00:00:00Z')]),
+        ]
+        fetcher._make_request = Mock(side_effect=pages)
+
+        papers = fetcher.fetch_latest_papers(['cs.AI'])
+
+        self.assertEqual([p['id'] for p in papers], ['2401.5', '2401.4'])
+        self.assertEqual(fetcher._make_request.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 3, places=1)
+        watermarks.stage.assert_called_once_with(
+            'arxiv', 'cs.AI', datetime(2024, 1, 4, tzinfo=timezone.utc), ['2401.5']
+        )
+
+    @patch('src.nodes.fetchers.time.sleep')
+    def test_arxiv_combined_query_pages_and_dedupes(self, mock_sleep):
+        fetcher = ArxivFetcher()
+        fetcher.COMBINED_PAGE_SIZE = 2
+        pages = [
+            make_atom_feed([('2401.5', '2024-01-04T00:00:00Z'), ('2401.4', '2024-01-03T00:00:00Z')]),
+            make_atom_feed([('2401.4', '2024-01-03T00:00:00Z'), ('2401.3', '2024-01-02T00:00:00Z')]),
+        ]
+        fetcher._make_request = Mock(side_effect=pages)
+
+        papers = fetcher.fetch_latest_papers(['cs.AI', 'cs.LG'], combined=True, max_results=4)
+
+        self.assertEqual([p['id'] for p in papers], ['2401.5', '2401.4', '2401.3'])
+        first_query = fetcher._make_request.call_args_list[0][0][0]
+        self.assertIn("search_query=cat:cs.AI+OR+cat:cs.LG", first_query)
+        self.assertIn("start=0&max_results=2", first_query)
+        self.assertIn("start=2&max_results=2", fetcher._make_request.call_args_list[1][0][0])
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 3, places=1)
+
+    def test_arxiv_combined_query_keeps_a_mark_per_category(self):
+        marks = {
+            'cs.AI': {'last_seen': datetime(2024, 1, 2, tzinfo=timezone.utc), 'last_ids': ['2401.3']},
+            'cs.LG': {'last_seen': datetime(2024, 1, 3, tzinfo=timezone.utc), 'last_ids': ['2401.4']},
+        }
+        watermarks = Mock()
+        watermarks.get.side_effect = lambda source, query: marks.get(query)
+        fetcher = ArxivFetcher(watermarks=watermarks)
+        fetcher.COMBINED_PAGE_SIZE = 10
+        fetcher._make_request = Mock(return_value=make_atom_feed([
+            ('2401.5', '2024-01-04T00:00:00Z', 'cs.AI', 'cs.LG'),
+            ('2401.4', '2024-01-03T00:00:00Z', 'cs.LG'),
+            ('2401.6', '2024-01-02T12:00:00Z', 'cs.AI'),
+            ('2401.3', '2024-01-02T00:00:00Z', 'cs.AI'),
+            ('2401.2', '2024-01-01T00:00:00Z', 'cs.AI'),
+        ]))
+
+        papers = fetcher.fetch_latest_papers(['cs.AI', 'cs.LG'], combined=True)
+
+        # Paging stops at cs.AI's older mark; cs.LG has already seen 2401.4
+        self.assertEqual([p['id'] for p in papers], ['2401.5', '2401.6'])
+        self.assertEqual({call[0][1] for call in watermarks.get.call_args_list}, {'cs.AI', 'cs.LG'})
+        newest = datetime(2024, 1, 4, tzinfo=timezone.utc)
+        watermarks.stage.assert_any_call('arxiv', 'cs.AI', newest, ['2401.5'])
+        watermarks.stage.assert_any_call('arxiv', 'cs.LG', newest, ['2401.5'])
+
+    @patch('src.nodes.fetchers.time.sleep')
+    def test_arxiv_spaces_requests_across_leased_batches(self, mock_sleep):
+        fetcher = ArxivFetcher()
+        fetcher._make_request = Mock(return_value=make_atom_feed([]))
+
+        fetcher.fetch_latest_papers(['cs.AI'], combined=True)
+        fetcher.fetch_latest_papers(['cs.LG'], combined=True)
+
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 3, places=1)
+        # A batch's categories do not replace the default ones
+        self.assertEqual(fetcher.categories, ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "stat.ML"])
+
+    def test_huggingface_stops_at_watermark(self):
+        watermarks = Mock()
+        watermarks.get.return_value = {
+            'last_seen': datetime(2024, 1, 2, tzinfo=timezone.utc),
+            'last_ids': ['org/seen']
+        }
+        listing = [
+            SimpleNamespace(modelId='org/new', lastModified='2024-01-03T00:00:00.000Z', downloads=1),
+            SimpleNamespace(modelId='org/seen', lastModified='2024-01-02T00:00:00.000Z', downloads=1),
+            SimpleNamespace(modelId='org/old', lastModified='2024-01-01T00:00:00.000Z', downloads=1),
+        ]
+        api_client = Mock()
+        api_client.list_models.return_value = iter(listing)
+        fetcher = HuggingFaceFetcher(api_client, watermarks=watermarks)
+
+        models = fetcher.fetch_latest_models(limit=10)
+
+        self.assertEqual([m['id'] for m in models], ['org/new'])
+        api_client.model_info.assert_called_once_with('org/new')
+
+
+class FakeLeaseCollection:
+    """Just enough of a MongoDB collection for lease contention, matching on _id/owner/status/expires_at."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def create_index(self, *args, **kwargs):
+        return None
+
+    def insert_one(self, doc):
+        if doc['_id'] in self.docs:
+            raise DuplicateKeyError("duplicate key")
+        self.docs[doc['_id']] = dict(doc)
+
+    def _matches(self, doc, query):
+        for field, expected in query.items():
+            if field == '_id' and isinstance(expected, dict):
+                if doc['_id'] not in expected['$in']:
+                    return False
+            elif field == 'expires_at':
+                if not doc['expires_at'] < expected['$lt']:
+                    return False
+            elif doc.get(field) != expected:
+                return False
+        return True
+
+    def find_one_and_update(self, query, update):
+        for doc in self.docs.values():
+            if self._matches(doc, query):
+                before = dict(doc)
+                doc.update(update.get('$set', {}))
+                for field, step in update.get('$inc', {}).items():
+                    doc[field] += step
+                return before
+        return None
+
+    def update_many(self, query, update):
+        matched = [doc for doc in self.docs.values() if self._matches(doc, query)]
+        for doc in matched:
+            doc.update(update['$set'])
+        return SimpleNamespace(matched_count=len(matched), modified_count=len(matched))
+
+
+class TestWorkLeases(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.collection = FakeLeaseCollection()
+        db = MagicMock()
+        db.__getitem__.return_value = self.collection
+        clock = lambda: self.now
+        # Heartbeats are driven by hand
+        self.worker_a = WorkLeases(db, owner='a', lease_seconds=60, heartbeat_seconds=3600, clock=clock)
+        self.worker_b = WorkLeases(db, owner='b', lease_seconds=60, heartbeat_seconds=3600, clock=clock)
+        self.units = ['cs.AI', 'cs.LG', 'cs.CL', 'cs.CV', 'stat.ML']
+
+    def tearDown(self):
+        self.worker_a.close()
+        self.worker_b.close()
+
+    def test_workers_split_the_units_of_a_window(self):
+        first = self.worker_a.claim('arxiv', 7, self.units, limit=2)
+        second = self.worker_b.claim('arxiv', 7, self.units)
+        self.assertEqual(first, ['cs.AI', 'cs.LG'])
+        self.assertEqual(second, ['cs.CL', 'cs.CV', 'stat.ML'])
+        self.assertEqual(self.worker_a.claim('arxiv', 7, self.units), [])
+        # A new window is claimable again
+        self.assertEqual(len(self.worker_a.claim('arxiv', 8, self.units)), 5)
+
+    def test_crashed_workers_units_are_taken_over_after_expiry(self):
+        self.worker_a.claim('github', 1, ['llm', 'transformers'])
+        self.now += timedelta(seconds=30)
+        self.assertEqual(self.worker_b.claim('github', 1, ['llm', 'transformers']), [])
+
+        # Worker a stops renewing; once the lease runs out b picks the units up
+        self.now += timedelta(seconds=31)
+        self.assertEqual(self.worker_b.claim('github', 1, ['llm', 'transformers']), ['llm', 'transformers'])
+        self.assertEqual(self.collection.docs['github:1:llm']['owner'], 'b')
+        self.assertEqual(self.collection.docs['github:1:llm']['attempts'], 2)
+        # a finds out on its next heartbeat and cannot complete b's leases
+        self.assertEqual(self.worker_a.heartbeat(), 0)
+        self.assertEqual(self.worker_a.complete('github'), 0)
+
+    def test_heartbeat_keeps_leases_alive(self):
+        self.worker_a.claim('github', 1, ['llm'])
+        for _ in range(3):
+            self.now += timedelta(seconds=40)
+            self.assertEqual(self.worker_a.heartbeat(), 1)
+        self.assertEqual(self.worker_b.claim('github', 1, ['llm']), [])
+
+    def test_completed_units_are_not_redone_and_released_units_are(self):
+        self.worker_a.claim('github', 1, ['llm'])
+        self.worker_a.claim('arxiv', 1, ['cs.AI'])
+        self.assertEqual(self.worker_a.complete('github'), 1)
+        self.assertEqual(self.worker_a.release('arxiv'), 1)
+        self.assertEqual(self.worker_a.held(), [])
+
+        self.now += timedelta(hours=1)
+        self.assertEqual(self.worker_b.claim('github', 1, ['llm']), [])
+        self.now += timedelta(seconds=1)
+        self.assertEqual(self.worker_b.claim('arxiv', 1, ['cs.AI']), ['cs.AI'])
+
+    def test_cadence_window_is_shared_across_processes(self):
+        cadence = SourceCadence('arxiv', 86400, anchor=5400)
+        self.assertEqual(cadence.window(5399), -1)
+        self.assertEqual(cadence.window(5400), 0)
+        self.assertEqual(cadence.window(5400 + 86399), 0)
+        self.assertEqual(SourceCadence('huggingface', 600).window(1200), 2)
+
+    def test_index_cache_skips_the_ttl_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = MagicMock()
+            db.name = 'aidigest'
+            WorkLeases(db, index_cache=StartupCache(os.path.join(tmp, 'startup.json'))).close()
+            db['work_leases'].create_index.assert_called_once_with("purge_at", expireAfterSeconds=0)
+
+            restarted = MagicMock()
+            restarted.name = 'aidigest'
+            WorkLeases(restarted, index_cache=StartupCache(os.path.join(tmp, 'startup.json'))).close()
+            restarted['work_leases'].create_index.assert_not_called()
+
+
+class TestCycleJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, 'journal')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _repo(self, name):
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return RepoMetadata(name=name, full_name=f"org/{name}", description="An LLM toolkit", stars=10,
+                            created_at=created, updated_at=created, topics=['llm'],
+                            url=f"https://github.com/org/{name}", language='Python')
+
+    def test_crashed_cycle_resumes_only_unfinished_items(self):
+        journal = CycleJournal(self.directory, sources=['github', 'arxiv'])
+        stored = journal.record_fetched('github', self._repo('done'))
+        skipped = journal.record_fetched('github', self._repo('same'))
+        tagged = journal.record_fetched('github', self._repo('half'))
+        fetched = journal.record_fetched('arxiv', {'id': '2401.1', 'title': 'Paper'})
+        for seq, stage in ((stored, 'summarized'), (stored, 'tagged'), (stored, 'stored'),
+                           (skipped, 'skipped'), (tagged, 'summarized'), (tagged, 'tagged')):
+            journal.mark(seq, stage)
+        journal.sync()
+        # The process dies here: the journal is never closed
+
+        journals = CycleJournal.incomplete(self.directory, payload_types={'RepoMetadata': RepoMetadata})
+        self.assertEqual([resumed.cycle_id for resumed in journals], [journal.cycle_id])
+        resumed = journals[0]
+        self.assertEqual(resumed.stage(tagged), 'tagged')
+        pending = resumed.unfinished()
+        self.assertEqual([(seq, source) for seq, source, _ in pending], [(tagged, 'github'), (fetched, 'arxiv')])
+        self.assertEqual(pending[0][2], self._repo('half'))
+        self.assertEqual(pending[1][2], {'id': '2401.1', 'title': 'Paper'})
+
+        # New items continue the sequence and finishing removes the journal
+        self.assertEqual(resumed.record_fetched('arxiv', {'id': '2401.2'}), fetched + 1)
+        resumed.close()
+        self.assertEqual(CycleJournal.incomplete(self.directory), [])
+
+    def test_finished_cycle_leaves_nothing_and_torn_line_is_ignored(self):
+        journal = CycleJournal(self.directory, sources=['huggingface'])
+        journal.record_fetched('huggingface', {'id': 'org/model'})
+        journal.close()
+        self.assertFalse(os.path.exists(journal.path))
+
+        journal = CycleJournal(self.directory, sources=['huggingface'])
+        seq = journal.record_fetched('huggingface', {'id': 'org/model'})
+        journal._file.write('{"seq": 0, "sta')
+        journal._file.flush()
+        resumed = CycleJournal.incomplete(self.directory)[0]
+        self.assertEqual(resumed.unfinished(), [(seq, 'huggingface', {'id': 'org/model'})])
+        resumed.close()
+        journal.close()
+
+
 class TestStorage(unittest.TestCase):
     def setUp(self):
         self.mock_db = Mock()
@@ -119,6 +1704,130 @@ class TestStorage(unittest.TestCase):
         result = self.storage.store_summary(test_summary)
         self.assertEqual(result, 'test_id')
 
+    def test_store_summary_upserts_by_natural_key(self):
+        self.mock_db.summaries.find_one_and_update.return_value = {'_id': 'stored_id'}
+        result = self.storage.store_summary({
+            'title': 'repo',
+            'content': 'A repo',
+            'source': 'github',
+            'category': 'research',
+            'natural_key': summary_key('github', 'owner/repo'),
+            'content_hash': content_hash({'description': 'A repo'}),
+            'metrics': {'stars': 10}
+        })
+
+        self.assertEqual(result, 'stored_id')
+        self.mock_db.summaries.insert_one.assert_not_called()
+        query, update = self.mock_db.summaries.find_one_and_update.call_args[0]
+        self.assertEqual(query, {'natural_key': 'github:owner/repo'})
+        self.assertIn('date_created', update['$setOnInsert'])
+        self.assertNotIn('date_created', update['$set'])
+        self.assertTrue(self.mock_db.summaries.find_one_and_update.call_args[1]['upsert'])
+
+    def test_find_by_keys_uses_one_in_query(self):
+        self.mock_db.summaries.find.return_value = [
+            {'natural_key': 'github:owner/a', 'content_hash': 'abc', 'metrics': {'stars': 1}}
+        ]
+
+        stored = self.storage.find_by_keys(['github:owner/a', 'github:owner/b', 'github:owner/a'])
+
+        self.assertEqual(list(stored), ['github:owner/a'])
+        self.mock_db.summaries.find.assert_called_once()
+        query = self.mock_db.summaries.find.call_args[0][0]
+        self.assertEqual(query, {'natural_key': {'$in': ['github:owner/a', 'github:owner/b']}})
+        self.assertEqual(self.storage.find_by_keys([]), {})
+        self.mock_db.summaries.find.assert_called_once()
+
+    def _keyed(self, name):
+        return {'title': name, 'content': 'c', 'source': 'github', 'category': 'research',
+                'natural_key': summary_key('github', f"owner/{name}")}
+
+    def test_store_summaries_many_chunks_and_reports_ids(self):
+        self.mock_db.summaries.bulk_write.side_effect = [
+            SimpleNamespace(upserted_ids={0: 'new_a'}),
+            SimpleNamespace(upserted_ids={}),
+        ]
+        self.mock_db.summaries.find.return_value = [{'_id': 'old_b'}]
+        plain = {'title': 'plain', 'content': 'c', 'source': 'arxiv', 'category': 'research'}
+
+        report = self.storage.store_summaries_many(
+            [self._keyed('a'), {'title': 'invalid'}, self._keyed('b'), plain], chunk_size=2
+        )
+
+        self.assertEqual(self.mock_db.summaries.bulk_write.call_count, 2)
+        operations, kwargs = self.mock_db.summaries.bulk_write.call_args_list[0]
+        self.assertFalse(kwargs['ordered'])
+        self.assertEqual([type(op).__name__ for op in operations[0]], ['UpdateOne', 'UpdateOne'])
+        self.assertEqual(report.inserted_ids, ['new_a', str(plain['_id'])])
+        self.assertEqual(report.updated_ids, ['old_b'])
+        self.assertEqual([(f['index'], f['key']) for f in report.failures], [(1, 'invalid')])
+
+    def test_store_summaries_many_reports_write_errors_without_aborting(self):
+        self.mock_db.summaries.bulk_write.side_effect = BulkWriteError({
+            'writeErrors': [{'index': 1, 'errmsg': 'E11000 duplicate key'}],
+            'upserted': [{'index': 0, '_id': 'new_a'}]
+        })
+        self.mock_db.summaries.find.return_value = [{'_id': 'old_c'}]
+
+        report = self.storage.store_summaries_many([self._keyed('a'), self._keyed('b'), self._keyed('c')])
+
+        self.assertEqual(report.inserted_ids, ['new_a'])
+        self.assertEqual(report.updated_ids, ['old_c'])
+        self.assertEqual(report.failures, [{'index': 1, 'key': 'github:owner/b', 'error': 'E11000 duplicate key'}])
+
+    def test_summary_writer_buffers_until_chunk_is_full(self):
+        self.mock_db.summaries.bulk_write.return_value = SimpleNamespace(upserted_ids={0: 'x', 1: 'y', 2: 'z'})
+        writer = SummaryWriter(self.storage, chunk_size=2)
+        writer.add(self._keyed('a'))
+        self.mock_db.summaries.bulk_write.assert_not_called()
+        writer.add(self._keyed('b'))
+        self.assertEqual(self.mock_db.summaries.bulk_write.call_count, 1)
+        writer.add(self._keyed('c'))
+        with self.assertRaises(ValueError):
+            writer.add({'title': 'invalid'})
+
+        report = writer.flush()
+        self.assertEqual(self.mock_db.summaries.bulk_write.call_count, 2)
+        self.assertEqual(len(report.inserted_ids), 3)
+
+    def test_summary_writer_writes_a_partial_chunk_after_max_delay(self):
+        written = threading.Event()
+
+        def bulk_write(operations, ordered):
+            written.set()
+            return SimpleNamespace(upserted_ids={0: 'x'})
+        self.mock_db.summaries.bulk_write.side_effect = bulk_write
+        writer = SummaryWriter(self.storage, chunk_size=100, max_delay=0.05)
+
+        writer.add(self._keyed('a'))
+
+        # Written while the cycle is still running, not at its final flush
+        self.assertTrue(written.wait(5))
+        report = writer.flush()
+        self.assertEqual(self.mock_db.summaries.bulk_write.call_count, 1)
+        self.assertEqual(report.inserted_ids, ['x'])
+
+    def test_index_cache_skips_known_indexes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = StartupCache(os.path.join(tmp, 'startup.json'))
+            db = Mock()
+            db.name = 'aidigest'
+            Storage(db, index_cache=cache)
+            self.assertEqual(db.summaries.create_index.call_count, len(Storage.INDEXES))
+            db.summaries.estimated_document_count.assert_called_once_with()
+            db.summaries.count_documents.assert_not_called()
+
+            restarted = Mock()
+            restarted.name = 'aidigest'
+            Storage(restarted, index_cache=StartupCache(os.path.join(tmp, 'startup.json')))
+            restarted.summaries.create_index.assert_not_called()
+
+    def test_natural_keys_and_content_hashes(self):
+        self.assertEqual(summary_key('arxiv', '2401.12345v2'), summary_key('arxiv', '2401.12345'))
+        self.assertIsNone(summary_key('arxiv', None))
+        self.assertEqual(content_hash({'a': 1, 'b': [1, 2]}), content_hash({'b': [1, 2], 'a': 1}))
+        self.assertNotEqual(content_hash({'a': 1}), content_hash({'a': 2}))
+
 class TestSummarizer(unittest.TestCase):
     def setUp(self):
         self.summarizer = Summarizer()
@@ -154,6 +1863,327 @@ class TestTagger(unittest.TestCase):
         self.assertEqual(tagged.primary_category, 'llm')
         self.assertTrue('transformers' in tagged.tags)
 
+    def test_keywords_match_whole_words_only(self):
+        matcher = KeywordMatcher(['rl', 'agent', 'gpt', 'language model', 'fine-tuning', 'deep learning'])
+        self.assertEqual(matcher.find("world-class management of the team"), set())
+        self.assertEqual(matcher.find("rl agents built on gpt4"), {'rl', 'agent', 'gpt'})
+        self.assertEqual(matcher.find("large language\nmodels, fine-tuning and deep learning"),
+                         {'language model', 'fine-tuning', 'deep learning'})
+        # Its words occur, but not as the phrase
+        self.assertEqual(matcher.find("a model of language; deep sea learning; fine tuning"), set())
+
+    def test_keywords_ending_in_y_match_their_ies_plural(self):
+        matcher = KeywordMatcher(['policy', 'study', 'day', 'privacy policy'])
+        self.assertEqual(matcher.find("two studies of reward policies"), {'policy', 'study'})
+        self.assertEqual(matcher.find("privacy policies and policys"), {'privacy policy', 'policy'})
+        self.assertEqual(matcher.find("rainy days"), {'day'})
+        self.assertEqual(matcher.find("daies of privacy policiesque"), set())
+
+    def test_tagging_ignores_keywords_inside_other_words(self):
+        tagged = self.tagger.tag_content({
+            'id': 'repo',
+            'title': 'World management toolkit',
+            'description': 'Monitoring and deployment pipelines for pytorch models',
+            'metadata': {}
+        })
+        self.assertEqual(tagged.primary_category, 'mlops')
+        self.assertEqual(tagged.tags, {'pytorch'})
+        self.assertEqual(tagged.relevance_scores['reinforcement_learning'], 0.0)
+        self.assertEqual(tagged.relevance_scores['mlops'], 0.6)
+
+    def test_matcher_follows_taxonomy_changes(self):
+        self.tagger.category_keywords['robotics'] = {'manipulation'}
+        tagged = self.tagger.tag_content({'id': 'r', 'title': 'Dexterous manipulation', 'metadata': {}})
+        self.assertEqual(tagged.primary_category, 'robotics')
+
+class TestTrendEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'trends.json')
+        self.now = 10 * 86400.0 + 12 * 3600
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _engine(self):
+        return TrendEngine(self.path, min_count=3, min_ratio=2.0, clock=lambda: self.now)
+
+    @staticmethod
+    def _tagged(category, *tags):
+        return TaggedContent(content_id='x', primary_category=category, tags=set(tags),
+                             relevance_scores={}, metadata={})
+
+    def test_space_saving_keeps_heavy_hitters_in_bounded_memory(self):
+        sketch = SpaceSaving(capacity=10)
+        for i in range(1000):
+            sketch.add('llm' if i % 4 == 0 else f"rare-{i}")
+        self.assertEqual(len(sketch.counts), 10)
+        self.assertEqual(sketch.top(1)[0][0], 'llm')
+        # Never underestimates
+        self.assertGreaterEqual(sketch.estimate('llm'), 250)
+        self.assertLessEqual(sketch.estimate('llm') - sketch.errors['llm'], 250)
+
+    def test_emerging_topics_beat_their_baseline(self):
+        engine = self._engine()
+        engine.started = self.now - 8 * 86400
+        # A week of steady pytorch items, agents only now and then
+        for day in range(2, 8):
+            at = self.now - day * 86400
+            engine.observe_many([self._tagged('llm', 'pytorch')] * 10, at=at)
+            engine.observe(self._tagged('research', 'agents'), at=at)
+        self.assertEqual(engine.analyze()['emerging_topics'], [])
+
+        # Today agents take off while pytorch holds steady
+        engine.observe_many([self._tagged('llm', 'pytorch')] * 10, at=self.now - 3600)
+        engine.observe_many([self._tagged('reinforcement_learning', 'agents')] * 5, at=self.now - 1800)
+        engine.observe_many([self._tagged('research', 'brand-new')] * 2, at=self.now)
+
+        analysis = engine.analyze()
+        self.assertEqual(analysis['emerging_topics'], ['agents'])
+        self.assertEqual(analysis['popular_categories'], {'llm': 10, 'reinforcement_learning': 5, 'research': 2})
+        self.assertEqual(analysis['trending_tags']['pytorch'], 10)
+        self.assertEqual(engine.emerging()[0]['baseline_count'], 6)
+
+    def test_no_emerging_topics_without_a_baseline(self):
+        engine = self._engine()
+        engine.observe_many([self._tagged('llm', 'agents')] * 5)
+        self.assertEqual(engine.analyze()['emerging_topics'], [])
+
+    def test_state_survives_a_restart_and_old_buckets_expire(self):
+        engine = self._engine()
+        engine.observe(self._tagged('llm', 'pytorch'), at=self.now - 40 * 86400)
+        engine.observe(self._tagged('llm', 'pytorch'), at=self.now - 3600)
+        engine.save()
+
+        restarted = self._engine()
+        self.assertEqual(restarted.started, engine.started)
+        self.assertEqual(restarted.analyze()['trending_tags'], {'pytorch': 1})
+        self.assertEqual(len(restarted._daily), 1)
+
+    def test_tagger_adds_to_running_trends(self):
+        tagger = Tagger(trends=self._engine())
+        tagger.analyze_trends([self._tagged('llm', 'pytorch')])
+        analysis = tagger.analyze_trends([self._tagged('llm', 'jax')])
+        self.assertEqual(analysis['popular_categories'], {'llm': 2})
+        self.assertEqual(analysis['trending_tags'], {'pytorch': 1, 'jax': 1})
+        # Without an engine each call only counts its own items
+        self.assertEqual(Tagger().analyze_trends([self._tagged('llm', 'jax')])['trending_tags'], {'jax': 1})
+
+
+class TestDiscoveryCycle(unittest.TestCase):
+    """AIDiscoveryAgent's cycle with its clients, fetchers and storage replaced by doubles."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        agent = AIDiscoveryAgent.__new__(AIDiscoveryAgent)
+        agent.journal_dir = self.tmp.name
+        agent.leases = None
+        agent._processing = threading.RLock()
+        agent.scheduler = QuotaScheduler()
+        agent.fetch_phase = FetchPhase(agent.scheduler, default_timeout=5)
+        agent.watermarks = Mock()
+        agent.storage = Mock()
+        agent.storage.find_by_keys.return_value = {}
+        agent.pipeline = Mock()
+        agent._finish_processing = Mock()
+        agent.http_cache = agent.transport = agent.model_detail_cache = Mock()
+        repo = self._repo("org/repo", stars=1)
+        agent._fetch_github = lambda keywords=None: [repo]
+        agent.hf_fetcher = Mock()
+        agent.arxiv_fetcher = Mock()
+        agent.arxiv_fetcher.fetch_latest_papers.return_value = [
+            {'id': '2401.1', 'title': 'Paper', 'summary': 'Abstract', 'authors': []}
+        ]
+        self.agent = agent
+
+    def tearDown(self):
+        self.agent.fetch_phase.shutdown()
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _repo(full_name, stars):
+        return RepoMetadata(name=full_name.split('/')[-1], full_name=full_name, description="", stars=stars,
+                            created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+                            topics=[], url=f"https://github.com/{full_name}", language="Python")
+
+    def _stored_item(self, repo, stored_stars, content_hash=None):
+        item = WorkItem('github', repo)
+        item.stored = {'content_hash': content_hash or item.content_hash, 'metrics': {'stars': stored_stars}}
+        return item
+
+    def test_failing_huggingface_listing_only_fails_its_own_source(self):
+        def listing(limit, bulk):
+            yield {'id': 'org/model'}
+            raise RuntimeError("listing broke")
+        self.agent.hf_fetcher.fetch_latest_models.side_effect = listing
+
+        new_items = self.agent.run_discovery_cycle()
+
+        self.assertEqual(new_items, {'github': 1, 'huggingface': None, 'arxiv': 1})
+        self.agent.watermarks.discard.assert_called_once_with('huggingface')
+        self.assertEqual(sorted(call.args[0] for call in self.agent.watermarks.commit.call_args_list),
+                         ['arxiv', 'github'])
+        # The listing broke before a batch of its models was complete, so none were queued
+        queued = [call.args[0].source for call in self.agent.pipeline.put.call_args_list]
+        self.assertEqual(sorted(queued), ['arxiv', 'github'])
+
+    def test_parked_source_has_no_result_until_it_resumes(self):
+        repo = self._repo("org/partial", stars=1)
+
+        def exhausted(keywords=None):
+            raise SourceDeferred('github', datetime.now(timezone.utc) + timedelta(hours=1), partial=[repo])
+        self.agent._fetch_github = exhausted
+        self.addCleanup(self.agent.scheduler.shutdown)
+
+        new_items = self.agent.run_discovery_cycle(['github', 'arxiv'])
+
+        # No count means no cadence backoff, and the watermark waits for the resumed fetch
+        self.assertEqual(new_items, {'github': None, 'arxiv': 1})
+        self.assertEqual([call.args[0] for call in self.agent.watermarks.commit.call_args_list], ['arxiv'])
+        queued = [call.args[0].key for call in self.agent.pipeline.put.call_args_list]
+        self.assertIn('github:org/partial', queued)
+
+    def test_fetched_items_are_queued_as_they_arrive(self):
+        events = []
+
+        def listing():
+            for i in range(3):
+                events.append(f"fetched {i}")
+                yield {'id': f"org/model-{i}"}
+
+        journal = CycleJournal(self.tmp.name, sources=['huggingface'])
+        feed = SourceFeed('huggingface', journal, self.agent._lookup_stored,
+                          lambda item: events.append(f"queued {item.payload['id'][-1]}"), batch_size=1)
+
+        self.assertEqual(feed.consume(listing), [])
+        journal.close()
+
+        # A blocking put holds the listing back instead of letting it run ahead
+        self.assertEqual(events, ['fetched 0', 'queued 0', 'fetched 1', 'queued 1', 'fetched 2', 'queued 2'])
+        self.assertEqual(feed.count, 3)
+
+    def test_detached_feed_hands_the_rest_back(self):
+        journal = CycleJournal(self.tmp.name, sources=['arxiv'])
+        queued = []
+        feed = SourceFeed('arxiv', journal, self.agent._lookup_stored, queued.append, batch_size=1)
+
+        def papers():
+            yield {'id': '2401.1', 'title': 'First'}
+            feed.detach()
+            yield {'id': '2401.2', 'title': 'Second'}
+
+        self.assertEqual(feed.consume(papers), [{'id': '2401.2', 'title': 'Second'}])
+        journal.close()
+        self.assertEqual([item.key for item in queued], ['arxiv:2401.1'])
+
+    def test_resumed_source_commits_only_once_its_work_is_done(self):
+        on_resume = self.agent._resumed('github')
+
+        on_resume([self._repo("org/first", stars=1)], done=False)
+        self.agent.watermarks.commit.assert_not_called()
+
+        on_resume([self._repo("org/rest", stars=1)], done=True)
+        self.agent.watermarks.commit.assert_called_once_with('github')
+
+    def test_leased_cadences_start_on_window_boundaries(self):
+        cadences = AIDiscoveryAgent._cadences(aligned=True)
+        scheduler = CadenceScheduler(list(cadences.values()), clock=lambda: 1000.0)
+        hf = cadences['huggingface']
+
+        scheduler.record('huggingface', 1, now=1000.0)
+
+        due = scheduler._state['huggingface'].next_due
+        self.assertEqual(due % hf.interval, 0)
+        self.assertEqual(hf.window(due), hf.window(1000.0) + 1)
+        self.assertEqual(cadences['arxiv'].anchor, AIDiscoveryAgent._cadences()['arxiv'].anchor)
+        self.assertIsNone(AIDiscoveryAgent._cadences()['huggingface'].anchor)
+
+    def test_feed_failure_stays_with_its_source(self):
+        def items():
+            yield {'id': 'org/model'}
+            raise RuntimeError("broken payload")
+        journal = CycleJournal(self.tmp.name, sources=['huggingface'])
+
+        self.assertIsNone(self.agent._feed('huggingface', items(), journal))
+        self.assertEqual(self.agent._feed('arxiv', [{'id': '2401.1', 'title': 'Paper'}], journal), 1)
+        journal.close()
+
+    def test_feed_looks_up_a_sources_stored_items_in_one_query(self):
+        repos = [self._repo(f"org/repo-{i}", stars=i) for i in range(3)]
+        self.agent.storage.find_by_keys.return_value = {
+            'github:org/repo-1': {'natural_key': 'github:org/repo-1', 'content_hash': 'abc', 'metrics': {}}
+        }
+        journal = CycleJournal(self.tmp.name, sources=['github'])
+
+        self.assertEqual(self.agent._feed('github', repos, journal), 3)
+        journal.close()
+
+        self.agent.storage.find_by_keys.assert_called_once()
+        self.assertEqual(list(self.agent.storage.find_by_keys.call_args.args[0]),
+                         ['github:org/repo-0', 'github:org/repo-1', 'github:org/repo-2'])
+        queued = [call.args[0] for call in self.agent.pipeline.put.call_args_list]
+        self.assertEqual([item.stored and item.stored['content_hash'] for item in queued], [None, 'abc', None])
+
+    def test_finishing_only_marks_its_own_journals_items_stored(self):
+        agent = self.agent
+        agent.pipeline = Mock()
+        agent.summary_writer = Mock()
+        agent.summary_writer.flush.return_value = SimpleNamespace(inserted_ids=['1'], updated_ids=[], failures=[])
+        agent.trends = Mock()
+        agent.trends.emerging.return_value = []
+        agent._unflushed_lock = threading.Lock()
+        ours = CycleJournal(self.tmp.name, sources=['github'])
+        theirs = CycleJournal(self.tmp.name, sources=['github'])
+        repo = self._repo("org/repo", stars=1)
+        mine = WorkItem('github', repo, journal=ours, seq=ours.record_fetched('github', repo))
+        other = WorkItem('github', repo, journal=theirs, seq=theirs.record_fetched('github', repo))
+        agent._unflushed = {ours: [mine], theirs: [other]}
+
+        AIDiscoveryAgent._finish_processing(agent, ours)
+
+        self.assertEqual(ours.unfinished(), [])
+        self.assertEqual(len(theirs.unfinished()), 1)
+        self.assertEqual(agent._unflushed, {theirs: [other]})
+        ours.close()
+        theirs.close()
+
+    def test_dedupe_skips_unchanged_item_and_only_updates_moved_metrics(self):
+        item = self._stored_item(self._repo("org/repo", stars=120), stored_stars=100)
+
+        self.assertIsNone(self.agent._dedupe_item(item))
+        self.agent.storage.update_by_key.assert_called_once_with(
+            'github:org/repo', {'metrics.stars': 120, 'metadata.stars': 120}
+        )
+
+        self.agent.storage.update_by_key.reset_mock()
+        self.assertIsNone(self.agent._dedupe_item(self._stored_item(self._repo("org/repo", stars=120), 120)))
+        self.agent.storage.update_by_key.assert_not_called()
+
+    def test_dedupe_passes_new_and_changed_items_on(self):
+        new_item = WorkItem('github', self._repo("org/new", stars=5))
+        changed = self._stored_item(self._repo("org/changed", stars=5), stored_stars=5, content_hash='old')
+
+        self.assertIs(self.agent._dedupe_item(new_item), new_item)
+        self.assertIs(self.agent._dedupe_item(changed), changed)
+        self.agent.storage.update_by_key.assert_not_called()
+
+    def test_unchanged_items_are_counted_as_dropped(self):
+        passed = []
+        pipeline = Pipeline([
+            PipelineStage('dedupe', self.agent._dedupe_item),
+            PipelineStage('store', passed.append)
+        ]).start()
+        try:
+            pipeline.put(self._stored_item(self._repo("org/same", stars=1), stored_stars=1))
+            pipeline.put(WorkItem('github', self._repo("org/new", stars=1)))
+            pipeline.drain()
+        finally:
+            pipeline.shutdown()
+
+        self.assertEqual([item.key for item in passed], ['github:org/new'])
+        self.assertEqual(pipeline.stats()['dedupe']['dropped'], 1)
+
+
 class TestIntegration(unittest.TestCase):
     def setUp(self):
         self.mock_github_client = Mock()